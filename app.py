@@ -67,31 +67,8 @@ def main():
     # Initialize session state
     SessionManager.initialize_session()
     
-    # Load reference images on first run
-    if "references_loaded" not in st.session_state:
-        with st.spinner("🐊 Loading ALF reference images..."):
-            num_alf_loaded = SessionManager.load_reference_images_from_folder()
-        with st.spinner("🐧 Loading Polly reference images..."):
-            num_polly_loaded = SessionManager.load_polly_reference_images_from_folder()
-        with st.spinner("🐧 Loading Abster reference images..."):
-            num_abster_loaded = SessionManager.load_abster_reference_images_from_folder()
-        with st.spinner("🐧 Loading GOONER reference images..."):
-            num_gooner_loaded = SessionManager.load_gooner_reference_images_from_folder()
-        with st.spinner("🐧 Loading Retsba reference images..."):
-            num_retsba_loaded = SessionManager.load_retsba_reference_images_from_folder()
-        with st.spinner("🐻 Loading Beary reference images..."):
-            num_beary_loaded = SessionManager.load_beary_reference_images_from_folder()
-        with st.spinner("🐕 Loading GOD reference images..."):
-            num_god_loaded = SessionManager.load_god_reference_images_from_folder()
-        with st.spinner("🐸 Loading Pepe reference images..."):
-            num_pepe_loaded = SessionManager.load_pepe_reference_images_from_folder()
-        with st.spinner("🐺 Loading Landwolf reference images..."):
-            num_landwolf_loaded = SessionManager.load_landwolf_reference_images_from_folder()
-        with st.spinner("🟡 Loading Andy reference images..."):
-            num_andy_loaded = SessionManager.load_andy_reference_images_from_folder()
-        with st.spinner("🔵 Loading Brett reference images..."):
-            num_brett_loaded = SessionManager.load_brett_reference_images_from_folder()
-        st.session_state["references_loaded"] = True
+    # Show how references loaded when a button loaded them right before a rerun
+    SessionManager.show_reference_load_reports()
     
     # Get current page from session
     current_page = SessionManager.get_current_page()
@@ -6,7 +6,9 @@ Where the summoned ALF and Abster the Green Penguin of Abstract adventure images
 import streamlit as st
 import time
 from components.styles import load_alf_css, create_title, create_quote
-from services.image_generator import ALFImageGenerator
+from components.generation_status import render_cache_notice
+from components.variant_grid import render_variant_grid
+from components.quality_tiers import render_draft_notice
 from utils.helpers import create_share_text
 from utils.session_manager import SessionManager
 from config import UI_TEXT
@@ -42,7 +44,12 @@ def render_abster_result_page():
         
         if image:
             # Display the generated image with mystical border
-            st.image(image, use_column_width=True)
+            st.image(image.data, use_column_width=True)
+            
+            # Let the user pick among the variants of this generation
+            render_variant_grid()
+            render_cache_notice()
+            render_draft_notice()
             
             # Display the prompt used with mystical quote styling
             if current_prompt:
@@ -69,7 +76,7 @@ def _render_abster_action_buttons(image, prompt: str):
     Render the action buttons for the Abster result page
     
     Args:
-        image: The generated PIL image
+        image (GeneratedImage): The generated image
         prompt (str): The prompt used for generation
     """
     col_a, col_b, col_c, col_d = st.columns(4)
@@ -77,14 +84,13 @@ def _render_abster_action_buttons(image, prompt: str):
     with col_a:
         # Download button
         if image:
-            image_bytes = ALFImageGenerator.image_to_bytes(image)
-            filename = f"alf_abster_adventure_{int(time.time())}.png"
+            filename = f"alf_abster_adventure_{int(time.time())}.{image.extension}"
             
             st.download_button(
                 label="📥 Download Adventure",
-                data=image_bytes,
+                data=image.data,  # As the API encoded it, no re-encoding per rerun
                 file_name=filename,
-                mime="image/png"
+                mime=image.mime_type
             )
     
     with col_b:
@@ -4,12 +4,16 @@ Where the mystical ALF and Brett the Blue Guy crypto meme image generation happe
 """
 
 import streamlit as st
-import time
 from components.styles import load_alf_css, create_title
-from services.image_generator import ALFImageGenerator, ImageGenerationError
+from services.image_generator import ALFImageGenerator, AsyncALFImageGenerator, ImageGenerationError
+from services.job_queue import GenerationJob, GenerationJobQueue
 from utils.helpers import get_random_loading_message, format_error_message
 from utils.session_manager import SessionManager
-from config import UI_TEXT
+from utils.reference_cache import ReferenceRenditionCache
+from components.generation_status import render_generation_status
+from components.variant_grid import render_fresh_toggle, render_variant_selector
+from components.quality_tiers import render_draft_button, render_final_render_button
+from config import PAGES, UI_TEXT
 
 def render_brett_generation_page():
     """Render the ALF and Brett image generation page"""
@@ -49,18 +53,26 @@ def render_brett_generation_page():
                 if alf_ref_images:
                     st.markdown("**🐊 ALF References:**")
                     for i, img in enumerate(alf_ref_images[-2:]):  # Show last 2 ALF
-                        st.image(img, caption=f"ALF Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"ALF Ref {i+1}", use_column_width=True)
             
             with col_gen_ref2:
                 if brett_ref_images:
                     st.markdown("**🔵 Brett References:**")
                     for i, img in enumerate(brett_ref_images[-2:]):  # Show last 2 Brett
-                        st.image(img, caption=f"Brett Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"Brett Ref {i+1}", use_column_width=True)
         
-        # Generation button
+        # Show this session's queued and running generations
+        render_generation_status()
+        
+        # Generation buttons (more adventures can be queued while others run)
         if api_key and current_prompt:
+            variants = render_variant_selector()
+            fresh = render_fresh_toggle()
             if st.button("Generate ALF & Brett Adventure"):
-                _generate_brett_image(api_key, current_prompt)
+                _generate_brett_image(api_key, current_prompt, variants, fresh)
+            if render_draft_button():
+                _generate_brett_image(api_key, current_prompt, variants, fresh, "draft")
+            render_final_render_button(api_key, "brett")
         
         # Navigation buttons
         col_nav1, col_nav2 = st.columns(2)
@@ -77,13 +89,17 @@ def render_brett_generation_page():
                     SessionManager.navigate_to_brett_result()
                     st.rerun()
 
-def _generate_brett_image(api_key: str, prompt: str):
+def _generate_brett_image(api_key: str, prompt: str, variants: int = 1, fresh: bool = False,
+                          tier: str = "final"):
     """
     Generate ALF and Brett image using the provided API key and prompt
     
     Args:
         api_key (str): OpenAI API key
         prompt (str): User prompt for generation
+        variants (int): Number of variants to request
+        fresh (bool): Never share the result of an identical request in flight
+        tier (str): Quality tier, "draft" for a quick preview or "final"
     """
     try:
         # Validate API key format
@@ -92,7 +108,7 @@ def _generate_brett_image(api_key: str, prompt: str):
             return
         
         # Initialize the image generator
-        generator = ALFImageGenerator(api_key)
+        generator = AsyncALFImageGenerator(api_key, tier)
         
         # Show mystical loading message
         loading_messages = [
@@ -107,42 +123,28 @@ def _generate_brett_image(api_key: str, prompt: str):
         import random
         loading_message = random.choice(loading_messages)
         
-        with st.spinner(loading_message):
-            # Add some mystical delay for effect
-            time.sleep(1)
-            
-            # Enhance prompt specifically for ALF and Brett
-            brett_enhanced_prompt = _enhance_brett_prompt(prompt)
-            
-            # Get both ALF and Brett reference images
-            alf_reference_images = SessionManager.get_reference_images()
-            brett_reference_images = SessionManager.get_brett_reference_images()
-            
-            # Combine both reference sets for generation
-            all_reference_images = []
-            if alf_reference_images:
-                all_reference_images.extend(alf_reference_images)
-            if brett_reference_images:
-                all_reference_images.extend(brett_reference_images)
-            
-            if all_reference_images:
-                # Use the edit endpoint with combined reference images for better fidelity
-                image, enhanced_prompt = generator.generate_image_with_reference_files(brett_enhanced_prompt, all_reference_images)
-            else:
-                # Use regular generation without references
-                image, enhanced_prompt = generator.generate_image(brett_enhanced_prompt, False)
-            
-            # Store in session state
-            SessionManager.set_generated_image(image)
-            SessionManager.add_to_history(prompt, image)
-            
-            # Store generation timestamp
-            st.session_state["generation_timestamp"] = time.time()
-            
-            # Navigate to result page
-            SessionManager.navigate_to_brett_result()
-            st.rerun()
-            
+        # Enhance prompt specifically for ALF and Brett
+        brett_enhanced_prompt = _enhance_brett_prompt(prompt)
+        
+        # Combine the ALF and Brett reference sets, sending each distinct image once
+        all_reference_images = SessionManager.get_combined_reference_images("alf", "brett")
+        
+        # Queue the generation; it runs in the background (through the edit endpoint
+        # when there are reference images) and the page polls for the result
+        job = GenerationJob(
+            character="brett",
+            prompt=prompt,
+            generation_prompt=brett_enhanced_prompt,
+            reference_images=all_reference_images,
+            result_page=PAGES["BRETT_RESULT"],
+            loading_message=loading_message,
+            variants=variants,
+            coalesce=not fresh,
+            tier=tier
+        )
+        SessionManager.add_generation_job(GenerationJobQueue.submit(generator, job))
+        st.rerun()
+        
     except ImageGenerationError as e:
         st.error(str(e))
     except Exception as e:
@@ -168,20 +170,20 @@ def _enhance_brett_prompt(user_prompt: str) -> str:
     "His appearance should exactly match the reference image provided, including his rounded head shape, big eyes, "
     "pink mouth, and vibrant blue coloring. "
     )
-
+    
     alf_context = (
     "ALF is a friendly cartoon crocodile with green scales, white tech goggles, and a green digital vest. "
     "He has a warm, adventurous expression and appears clever and fun-loving. "
     "His appearance should also match the reference image exactly. "
     )
-
+    
     combined_reference_instruction = (
     "Use both Brett and ALF's reference images to accurately represent their appearance, colors, and proportions. "
     "Ensure Brett and ALF appear together in the scene described below, with Brett showing his laid-back meme energy. "
     )
-
+    
     user_scene = user_prompt  # e.g., "analyzing crypto charts on giant floating blue candlesticks"
-
+    
     enhanced_prompt = (
     f"{brett_context}{alf_context}{combined_reference_instruction} "
     f"The scene shows Brett and ALF {user_scene}. "
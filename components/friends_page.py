@@ -129,6 +129,9 @@ def render_friends_page():
             with col_b:
                 friend_button_text = f"{friend_data['emoji']} {friend_data['name']} - {friend_data['description']}"
                 if st.button(friend_button_text, key=f"select_{friend_key}"):
+                    # Load only this friend's references (and ALF's) before the flow starts
+                    SessionManager.ensure_reference_images("alf", friend_key, defer_reports=True)
+                    
                     # Navigate directly to the friend's dedicated page flow
                     if friend_key == "polly":
                         SessionManager.navigate_to_polly_prompt()
@@ -175,6 +178,7 @@ def render_friends_page():
         
         with col_nav2:
             if st.button("🌀 Solo ALF Images", key="go_to_prompt"):
+                SessionManager.ensure_reference_images("alf", defer_reports=True)
                 SessionManager.navigate_to_prompt()
                 st.rerun()
         
@@ -4,12 +4,16 @@ Where the mystical image generation happens
 """
 
 import streamlit as st
-import time
 from components.styles import load_alf_css, create_title
-from services.image_generator import ALFImageGenerator, ImageGenerationError
+from services.image_generator import ALFImageGenerator, AsyncALFImageGenerator, ImageGenerationError
+from services.job_queue import GenerationJob, GenerationJobQueue
 from utils.helpers import get_random_loading_message, format_error_message
 from utils.session_manager import SessionManager
-from config import UI_TEXT
+from utils.reference_cache import ReferenceRenditionCache
+from components.generation_status import render_generation_status
+from components.variant_grid import render_fresh_toggle, render_variant_selector
+from components.quality_tiers import render_draft_button, render_final_render_button
+from config import PAGES, UI_TEXT
 
 def render_generation_page():
     """Render the image generation page"""
@@ -43,12 +47,20 @@ def render_generation_page():
             cols = st.columns(min(len(ref_images), 3))
             for i, img in enumerate(ref_images[-3:]):  # Show last 3
                 with cols[i % 3]:
-                    st.image(img, caption=f"Reference {i+1}", use_column_width=True)
+                    st.image(ReferenceRenditionCache.get_display_bytes(img, "small"), caption=f"Reference {i+1}", use_column_width=True)
         
-        # Generation button
+        # Show this session's queued and running generations
+        render_generation_status()
+        
+        # Generation buttons (more adventures can be queued while others run)
         if api_key and current_prompt:
+            variants = render_variant_selector()
+            fresh = render_fresh_toggle()
             if st.button(UI_TEXT["GENERATING"]["generate_button"]):
-                _generate_alf_image(api_key, current_prompt)
+                _generate_alf_image(api_key, current_prompt, variants, fresh)
+            if render_draft_button():
+                _generate_alf_image(api_key, current_prompt, variants, fresh, "draft")
+            render_final_render_button(api_key, "alf")
         
         # Navigation buttons
         col_nav1, col_nav2 = st.columns(2)
@@ -65,13 +77,17 @@ def render_generation_page():
                     SessionManager.navigate_to_result()
                     st.rerun()
 
-def _generate_alf_image(api_key: str, prompt: str):
+def _generate_alf_image(api_key: str, prompt: str, variants: int = 1, fresh: bool = False,
+                        tier: str = "final"):
     """
     Generate ALF image using the provided API key and prompt
     
     Args:
         api_key (str): OpenAI API key
         prompt (str): User prompt for generation
+        variants (int): Number of variants to request
+        fresh (bool): Never share the result of an identical request in flight
+        tier (str): Quality tier, "draft" for a quick preview or "final"
     """
     try:
         # Validate API key format
@@ -80,36 +96,30 @@ def _generate_alf_image(api_key: str, prompt: str):
             return
         
         # Initialize the image generator
-        generator = ALFImageGenerator(api_key)
+        generator = AsyncALFImageGenerator(api_key, tier)
         
         # Show mystical loading message
         loading_message = get_random_loading_message()
         
-        with st.spinner(loading_message):
-            # Add some mystical delay for effect
-            time.sleep(1)
-            
-            # Check if we have reference images and use appropriate method
-            reference_images = SessionManager.get_reference_images()
-            
-            if reference_images:
-                # Use the edit endpoint with reference images for better fidelity
-                image, enhanced_prompt = generator.generate_image_with_reference_files(prompt, reference_images)
-            else:
-                # Use regular generation without references
-                image, enhanced_prompt = generator.generate_image(prompt, False)
-            
-            # Store in session state
-            SessionManager.set_generated_image(image)
-            SessionManager.add_to_history(prompt, image)
-            
-            # Store generation timestamp
-            st.session_state["generation_timestamp"] = time.time()
-            
-            # Navigate to result page
-            SessionManager.navigate_to_result()
-            st.rerun()
-            
+        # Check if we have reference images and use appropriate method
+        reference_images = SessionManager.get_combined_reference_images("alf")
+        
+        # Queue the generation; it runs in the background (through the edit endpoint
+        # when there are reference images) and the page polls for the result
+        job = GenerationJob(
+            character="alf",
+            prompt=prompt,
+            generation_prompt=prompt,
+            reference_images=reference_images,
+            result_page=PAGES["RESULT"],
+            loading_message=loading_message,
+            variants=variants,
+            coalesce=not fresh,
+            tier=tier
+        )
+        SessionManager.add_generation_job(GenerationJobQueue.submit(generator, job))
+        st.rerun()
+        
     except ImageGenerationError as e:
         st.error(str(e))
     except Exception as e:
@@ -0,0 +1,150 @@
+"""
+Generation Status Component for ALF Abstractor
+Shows the generation jobs of a session and picks up their results
+"""
+
+import streamlit as st
+from typing import List, Set
+from services.circuit_breaker import APICircuitBreaker, EndpointCircuitBreaker
+from services.job_queue import GenerationJob, GenerationJobQueue
+from utils.session_manager import SessionManager
+from config import GENERATION_CONFIG
+
+def render_generation_status():
+    """
+    Show the state of every generation job queued by this session
+    
+    When the session's most recent job finishes while nothing else is
+    pending, its result is opened right away; other finished jobs get a
+    button to view them; pending jobs can be cancelled, and failed, cancelled
+    or timed out ones dismissed. A notice comes first while the image API's
+    circuit breaker is failing requests fast.
+    
+    While any job is queued or running, only this status list reruns every
+    GENERATION_CONFIG["status_poll_seconds"]; the whole page reruns once one
+    of those jobs finishes.
+    """
+    active_ids = {job.job_id for job in _get_session_jobs() if not job.is_finished}
+    run_every = GENERATION_CONFIG["status_poll_seconds"] if active_ids else None
+    st.fragment(_render_status_list, run_every=run_every)(active_ids)
+
+def _get_session_jobs() -> List[GenerationJob]:
+    """
+    Get the session's generation jobs, forgetting those that expired from the queue
+    
+    Returns:
+        List[GenerationJob]: Jobs in the order they were queued
+    """
+    job_ids = SessionManager.get_generation_job_ids()
+    if not job_ids:
+        return []
+    
+    jobs = GenerationJobQueue.get_jobs(job_ids)
+    known_ids = {job.job_id for job in jobs}
+    if len(known_ids) != len(job_ids):
+        SessionManager.remove_generation_jobs(job_id for job_id in job_ids if job_id not in known_ids)
+    return jobs
+
+def _render_status_list(active_ids: Set[str]):
+    """
+    Show the circuit notice and the session's jobs
+    
+    Args:
+        active_ids (Set[str]): Jobs that were pending when the page last ran
+    """
+    render_circuit_notice()
+    
+    jobs = _get_session_jobs()
+    active = [job for job in jobs if not job.is_finished]
+    if jobs and not active and jobs[-1].state == GenerationJob.DONE:
+        _open_job_result(jobs[-1])
+    if active_ids - {job.job_id for job in active}:
+        # A job finished since the page last ran: rerun it all to stop or keep polling
+        st.rerun()
+    
+    if len(jobs) > 1:
+        st.markdown(f"**🗂️ Your adventures ({len(active)} in progress):**")
+    
+    for job in jobs:
+        _render_job(job)
+
+def _render_job(job: GenerationJob):
+    """
+    Show one generation job
+    
+    Args:
+        job (GenerationJob): Job to show
+    """
+    short_prompt = job.prompt if len(job.prompt) <= 60 else f"{job.prompt[:57]}..."
+    if job.is_draft:
+        short_prompt = f"⚡ draft of {short_prompt}"
+    
+    if not job.is_finished:
+        col_text, col_button = st.columns([3, 1])
+        with col_text:
+            if job.state == GenerationJob.QUEUED:
+                st.info(f"⏳ Queued: {short_prompt} (waiting {job.queue_seconds:.0f}s for a free slot)")
+            elif job.rate_limit_wait_seconds > 0:
+                st.info(f"🚦 Waiting {job.rate_limit_wait_seconds:.0f}s for the shared API rate limit: {short_prompt}")
+            else:
+                st.info(f"{job.loading_message} {short_prompt} ({job.run_seconds:.0f}s)")
+        with col_button:
+            if st.button("🛑 Cancel", key=f"cancel_job_{job.job_id}"):
+                GenerationJobQueue.cancel(job.job_id)
+                st.rerun()
+        
+        preview = job.preview
+        if job.state == GenerationJob.RUNNING and preview is not None:
+            # Partial images streamed so far; the status list reruns to show each new one
+            st.image(preview, caption=f"✨ Preview {job.preview_index + 1} of the emerging adventure", width=320)
+    elif job.state == GenerationJob.DONE:
+        col_text, col_button = st.columns([3, 1])
+        with col_text:
+            retried = f", {len(job.attempts)} attempts" if len(job.attempts) > 1 else ""
+            shared = ", shared with an identical adventure" if job.coalesced else ""
+            shared = ", from the cache" if job.from_cache else shared
+            st.success(f"✅ Ready: {short_prompt} (took {job.run_seconds:.0f}s{retried}{shared})")
+        with col_button:
+            if st.button("🎭 View", key=f"view_job_{job.job_id}"):
+                _open_job_result(job)
+    else:
+        col_text, col_button = st.columns([3, 1])
+        with col_text:
+            if job.state in (GenerationJob.CANCELLED, GenerationJob.TIMED_OUT):
+                st.warning(f"{job.error} ({short_prompt})")
+            else:
+                st.error(job.error)
+        with col_button:
+            if st.button("✖️ Dismiss", key=f"dismiss_job_{job.job_id}"):
+                SessionManager.remove_generation_jobs([job.job_id])
+                st.rerun()
+
+def render_circuit_notice():
+    """Warn while an image API endpoint's circuit is open or being probed"""
+    for endpoint, stats in APICircuitBreaker.get_unhealthy().items():
+        if stats["state"] == EndpointCircuitBreaker.OPEN:
+            st.warning(
+                f"🚧 The portal to the ALF spirits ({endpoint}) is resting after repeated failures. "
+                f"New adventures fail right away for about {max(1, round(stats['retry_in_seconds']))}s."
+            )
+        else:
+            st.info(f"🩺 Checking whether the portal to the ALF spirits ({endpoint}) has recovered...")
+
+def _open_job_result(job: GenerationJob):
+    """
+    Store a finished job's variants in the session and show its result page
+    
+    A draft job is kept along, so its final version can be rendered later.
+    
+    Args:
+        job (GenerationJob): Finished job
+    """
+    SessionManager.remove_generation_jobs([job.job_id])
+    SessionManager.complete_generation(job.prompt, job.images, job.result_page, job.from_cache,
+                                       job if job.is_draft else None)
+    st.rerun()
+
+def render_cache_notice():
+    """Tell the user when the shown generation was served from the result cache"""
+    if SessionManager.is_generated_from_cache():
+        st.caption("♻️ Summoned from the cache of an identical earlier adventure (no new API call was made)")
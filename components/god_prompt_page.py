@@ -7,6 +7,7 @@ import streamlit as st
 from components.styles import load_alf_css, create_title, create_mystical_text
 from utils.helpers import validate_prompt_length
 from utils.session_manager import SessionManager
+from utils.reference_cache import ReferenceRenditionCache
 from config import UI_TEXT
 
 # GOD-specific prompt components (dyslexic/golden themes)
@@ -158,7 +159,7 @@ def render_god_prompt_page():
                 # Display ALF reference images
                 if ref_images:
                     for i, img in enumerate(ref_images[:2]):  # Show first 2 ALF images
-                        st.image(img, caption=f"ALF Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"ALF Ref {i+1}", use_column_width=True)
                     
                     if len(ref_images) > 2:
                         st.caption(f"+ {len(ref_images) - 2} more ALF images")
@@ -187,7 +188,7 @@ def render_god_prompt_page():
                 # Display GOD reference images
                 if god_ref_images:
                     for i, img in enumerate(god_ref_images[:2]):  # Show first 2 GOD images
-                        st.image(img, caption=f"GOD Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"GOD Ref {i+1}", use_column_width=True)
                     
                     if len(god_ref_images) > 2:
                         st.caption(f"+ {len(god_ref_images) - 2} more GOD images")
@@ -7,6 +7,7 @@ import streamlit as st
 from components.styles import load_alf_css, create_title, create_mystical_text
 from utils.helpers import validate_prompt_length
 from utils.session_manager import SessionManager
+from utils.reference_cache import ReferenceRenditionCache
 from config import UI_TEXT
 
 # GOONER-specific prompt components
@@ -158,7 +159,7 @@ def render_gooner_prompt_page():
                 # Display ALF reference images
                 if ref_images:
                     for i, img in enumerate(ref_images[:2]):  # Show first 2 ALF images
-                        st.image(img, caption=f"ALF Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"ALF Ref {i+1}", use_column_width=True)
                     
                     if len(ref_images) > 2:
                         st.caption(f"+ {len(ref_images) - 2} more ALF images")
@@ -187,7 +188,7 @@ def render_gooner_prompt_page():
                 # Display GOONER reference images
                 if gooner_ref_images:
                     for i, img in enumerate(gooner_ref_images[:2]):  # Show first 2 GOONER images
-                        st.image(img, caption=f"GOONER Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"GOONER Ref {i+1}", use_column_width=True)
                     
                     if len(gooner_ref_images) > 2:
                         st.caption(f"+ {len(gooner_ref_images) - 2} more GOONER images")
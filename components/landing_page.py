@@ -42,12 +42,14 @@ def render_landing_page():
         with col_a:
             # ALF and Friends button
             if st.button(UI_TEXT["LANDING"]["friends_button"], key="friends_btn"):
+                SessionManager.ensure_reference_images("alf", defer_reports=True)
                 SessionManager.navigate_to_friends()
                 st.rerun()
         
         with col_b:
             # Solo ALF Images button
             if st.button(UI_TEXT["LANDING"]["enter_button"], key="enter_btn"):
+                SessionManager.ensure_reference_images("alf", defer_reports=True)
                 SessionManager.navigate_to_prompt()
                 st.rerun()
         
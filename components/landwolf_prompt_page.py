@@ -7,6 +7,7 @@ import streamlit as st
 from components.styles import load_alf_css, create_title, create_mystical_text
 from utils.helpers import validate_prompt_length
 from utils.session_manager import SessionManager
+from utils.reference_cache import ReferenceRenditionCache
 from config import UI_TEXT
 
 # Landwolf-specific prompt components (crypto pack/wolf themes)
@@ -158,7 +159,7 @@ def render_landwolf_prompt_page():
                 # Display ALF reference images
                 if ref_images:
                     for i, img in enumerate(ref_images[:2]):  # Show first 2 ALF images
-                        st.image(img, caption=f"ALF Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"ALF Ref {i+1}", use_column_width=True)
                     
                     if len(ref_images) > 2:
                         st.caption(f"+ {len(ref_images) - 2} more ALF images")
@@ -187,7 +188,7 @@ def render_landwolf_prompt_page():
                 # Display Landwolf reference images
                 if landwolf_ref_images:
                     for i, img in enumerate(landwolf_ref_images[:2]):  # Show first 2 Landwolf images
-                        st.image(img, caption=f"Landwolf Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "medium"), caption=f"Landwolf Ref {i+1}", use_column_width=True)
                     
                     if len(landwolf_ref_images) > 2:
                         st.caption(f"+ {len(landwolf_ref_images) - 2} more Landwolf images")
@@ -7,6 +7,7 @@ import streamlit as st
 from components.styles import load_alf_css, create_title, create_mystical_text
 from utils.helpers import generate_random_prompt, mix_prompt_components, validate_prompt_length
 from utils.session_manager import SessionManager
+from utils.reference_cache import ReferenceRenditionCache
 from config import UI_TEXT
 
 def render_prompt_page():
@@ -84,7 +85,7 @@ def render_prompt_page():
                 cols = st.columns(min(len(ref_images), 4))
                 for i, img in enumerate(ref_images):
                     with cols[i % 4]:
-                        st.image(img, caption=f"ALF Ref {i+1}", use_column_width=True)
+                        st.image(ReferenceRenditionCache.get_display_bytes(img, "small"), caption=f"ALF Ref {i+1}", use_column_width=True)
                 
                 # Reload button
                 if st.button("🔄 Reload References"):
@@ -0,0 +1,68 @@
+"""
+Quality Tiers Component for ALF Abstractor
+Lets users try a prompt as a quick draft and render the final version on demand
+"""
+
+import streamlit as st
+from services.image_generator import ALFImageGenerator, AsyncALFImageGenerator
+from services.job_queue import GenerationJobQueue
+from utils.session_manager import SessionManager
+from config import PAGES
+
+def render_draft_button() -> bool:
+    """
+    Show the button that queues a quick, low-quality draft of the prompt
+    
+    Returns:
+        bool: True if the button was clicked
+    """
+    return st.button(
+        "⚡ Quick Draft",
+        key="quick_draft",
+        help="A fast, low-cost preview (with as many variants as picked). Render the final version once the idea works."
+    )
+
+def render_final_render_button(api_key: str, character: str):
+    """
+    Offer to render the latest draft of this page's character at the final quality
+    
+    The final reruns the draft's prompt and reference images as a single
+    high-quality image and is queued like any other generation.
+    
+    Args:
+        api_key (str): OpenAI API key entered on the page
+        character (str): Character key of the page, e.g. "alf" or "polly"
+    """
+    draft = SessionManager.get_generated_draft()
+    if draft is None or draft.character != character:
+        return
+    
+    short_prompt = draft.prompt if len(draft.prompt) <= 60 else f"{draft.prompt[:57]}..."
+    if st.button(f"💎 Render Final: {short_prompt}", key="render_final"):
+        if not ALFImageGenerator.validate_api_key(api_key):
+            st.error("Invalid API key format. Please check your OpenAI API key.")
+            return
+        
+        job = draft.make_final()
+        SessionManager.set_generated_draft(None)
+        SessionManager.add_generation_job(GenerationJobQueue.submit(AsyncALFImageGenerator(api_key, job.tier), job))
+        st.rerun()
+
+def render_draft_notice():
+    """Mark the shown result as a draft, with a way back to render its final version"""
+    draft = SessionManager.get_generated_draft()
+    if draft is None:
+        return
+    
+    st.caption("⚡ This is a quick draft. Happy with the idea? Render it in full quality.")
+    if st.button("💎 Render Final", key="render_final_from_result"):
+        # The API key is entered on the generation page, so the final is queued there
+        SessionManager.set_page(_get_generation_page(draft.result_page))
+        st.rerun()
+
+def _get_generation_page(result_page: str) -> str:
+    """Find the generation page belonging to a result page"""
+    for name, page in PAGES.items():
+        if page == result_page:
+            return PAGES[name.replace("RESULT", "GENERATING")]
+    return PAGES["GENERATING"]
@@ -6,6 +6,9 @@ Where the summoned ALF images are revealed and shared
 import streamlit as st
 import time
 from components.styles import load_alf_css, create_title, create_quote
+from components.generation_status import render_cache_notice
+from components.variant_grid import render_variant_grid
+from components.quality_tiers import render_draft_notice
 from services.image_generator import ALFImageGenerator
 from utils.helpers import create_share_text, get_random_alf_quote
 from utils.session_manager import SessionManager
@@ -28,7 +31,12 @@ def render_result_page():
         
         if image:
             # Display the generated image with mystical border
-            st.image(image, use_column_width=True)
+            st.image(image.data, use_column_width=True)
+            
+            # Let the user pick among the variants of this generation
+            render_variant_grid()
+            render_cache_notice()
+            render_draft_notice()
             
             # Display the prompt used with mystical quote styling
             if current_prompt:
@@ -54,7 +62,7 @@ def _render_action_buttons(image, prompt: str):
     Render the action buttons for the result page
     
     Args:
-        image: The generated PIL image
+        image (GeneratedImage): The generated image
         prompt (str): The prompt used for generation
     """
     col_a, col_b, col_c, col_d = st.columns(4)
@@ -62,14 +70,13 @@ def _render_action_buttons(image, prompt: str):
     with col_a:
         # Download button
         if image:
-            image_bytes = ALFImageGenerator.image_to_bytes(image)
-            filename = ALFImageGenerator.generate_filename(prompt)
+            filename = ALFImageGenerator.generate_filename(prompt, extension=image.extension)
             
             st.download_button(
                 label=UI_TEXT["RESULT"]["download_button"],
-                data=image_bytes,
+                data=image.data,  # As the API encoded it, no re-encoding per rerun
                 file_name=filename,
-                mime="image/png"
+                mime=image.mime_type
             )
     
     with col_b:
@@ -0,0 +1,66 @@
+"""
+Variant Grid Component for ALF Abstractor
+Lets users ask for several variants per generation and pick their favorite
+"""
+
+import streamlit as st
+from utils.session_manager import SessionManager
+from config import OPENAI_CONFIG
+
+def render_variant_selector() -> int:
+    """
+    Show a picker for how many variants one generation should return
+    
+    All variants come back from a single API call, so asking for more
+    costs one request (billed per image) and no extra waiting in the queue.
+    
+    Returns:
+        int: Number of variants to request
+    """
+    max_variants = OPENAI_CONFIG.get("max_variants", 1)
+    if max_variants <= 1:
+        return 1
+    
+    return st.select_slider(
+        "🖼️ Variants to summon",
+        options=list(range(1, max_variants + 1)),
+        value=min(OPENAI_CONFIG.get("n", 1), max_variants),
+        key="variant_count"
+    )
+
+def render_fresh_toggle() -> bool:
+    """
+    Show an opt-out from sharing results with identical requests in flight
+    
+    Returns:
+        bool: True if the generation must make its own API call
+    """
+    return st.checkbox(
+        "✨ Always summon fresh variations",
+        key="fresh_variations",
+        help="Identical adventures requested at the same moment normally share one result."
+    )
+
+def render_variant_grid():
+    """
+    Show all variants of the latest generation with a button to pick one
+    
+    Picking a variant makes it the generated image used for display,
+    download and history. Nothing is shown for single-image generations.
+    """
+    variants = SessionManager.get_generated_variants()
+    if len(variants) <= 1:
+        return
+    
+    current = SessionManager.get_generated_image()
+    
+    st.markdown(f"**🖼️ {len(variants)} variants summoned, pick your favorite:**")
+    columns = st.columns(len(variants))
+    for index, (column, variant) in enumerate(zip(columns, variants)):
+        with column:
+            st.image(variant.data, use_column_width=True)
+            if variant is current:
+                st.caption("✅ Picked")
+            elif st.button("Pick this one", key=f"pick_variant_{index}"):
+                SessionManager.pick_variant(index)
+                st.rerun()
@@ -79,14 +79,146 @@ PROMPT_SETTINGS = [
 
 # OpenAI Configuration
 OPENAI_CONFIG = {
+    "base_url": None,  # Images API root, e.g. "http://127.0.0.1:8765/v1" for the local stand-in (None: OPENAI_BASE_URL or OpenAI)
     "model": "gpt-image-1",
     "size": "1024x1024",
     "quality": "high",
-    "n": 1,
+    "output_format": "webp",  # "png", "jpeg" or "webp"; compressed formats make responses several times smaller
+    "output_compression": 90,  # 0-100 for jpeg and webp, lower is smaller (None: the API's default of 100); ignored for png
+    "n": 1,  # Variants per generation unless the user picks another count
+    "max_variants": 4,  # Upper bound of the variant picker (one API call returns all variants)
+    "stream_partial_images": 2,  # Previews streamed while a single image is generated (0-3, 0 disables streaming)
+    "max_connections": 20,  # Per pooled client (one client per API key)
+    "max_keepalive_connections": 10,  # Warm connections kept open between generations
+    "keepalive_expiry_seconds": 120,  # Idle connections are closed after this long
+    "client_idle_seconds": 900,  # Pooled clients unused for this long are closed (must exceed the request timeout)
+    "request_timeout_seconds": 120,  # Per HTTP attempt; a stuck call is aborted (and maybe retried) after this
+    "generation_deadline_seconds": 300,  # Whole generation once it runs: rate limit waits, retries and attempts
+    "images_per_minute": 20,  # Shared by all sessions using the same API key (0 disables the rate, not max_concurrent_requests)
+    "images_burst": 5,  # Images that may be requested at once after a quiet period
+    "max_concurrent_requests": 8,  # Image API requests in flight per API key
     "base_prompt_prefix": "A friendly cartoon crocodile character named ALF wearing white tech goggles and a green digital vest with a white abstract logo, sitting or interacting in different settings. Whimsical, consistent personality, same facial features and outfit as the reference image.",
     "base_prompt_suffix": "Maintains ALF’s signature cartoon proportions, tech-themed clothing, and gentle smile. Always includes high-quality digital illustration, soft shading, and a consistent style. Preserve detailed crocodile scales, green color palette, and stylized background with mild lighting."
 }
 
+# Quality tiers: a quick, cheap draft to try a prompt out, then the final render of it
+# (settings a tier leaves out come from OPENAI_CONFIG)
+QUALITY_TIERS = {
+    "draft": {
+        "quality": "low",
+        "size": "1024x1024",
+        "output_compression": 70,  # Drafts are only looked at, not kept
+        "stream_partial_images": 0  # Drafts arrive quickly enough without previews
+    },
+    "final": {
+        "quality": "high"
+    }
+}
+
+# On-disk cache of generation results (opt-in: identical requests then return the same images)
+RESULT_CACHE_CONFIG = {
+    "enabled": False,
+    "folder": ".cache/results",  # Relative to the project folder
+    "max_bytes": 512 * 1024 * 1024,  # Least recently used results are removed above this
+    "ttl_seconds": 7 * 24 * 3600  # Older results are never served
+}
+
+# Retry Policy for image API calls (the OpenAI client's own retries are disabled)
+RETRY_CONFIG = {
+    "max_attempts": 4,  # Including the first attempt
+    "base_delay_seconds": 1.0,  # Shortest backoff between attempts
+    "max_delay_seconds": 20.0,  # Longest backoff between attempts
+    "retry_after_cap_seconds": 60.0,  # Longer Retry-After hints give up instead of waiting
+    "retryable_status_codes": [408, 409, 429, 500, 502, 503, 504],
+    "non_retryable_error_codes": ["insufficient_quota", "billing_hard_limit_reached"]  # 429s that won't clear by waiting
+}
+
+# Circuit breaker per images API endpoint (fails fast during upstream incidents)
+CIRCUIT_BREAKER_CONFIG = {
+    "enabled": True,
+    "window_seconds": 120,  # Rolling window of call outcomes while closed
+    "min_calls": 5,  # Calls in the window before the rates below are judged
+    "failure_rate_threshold": 0.5,  # Connection errors, timeouts and 5xx
+    "slow_call_seconds": 90,  # Successful calls slower than this count as slow
+    "slow_call_rate_threshold": 0.8,
+    "open_seconds": 30,  # Calls fail fast this long before probing again
+    "half_open_max_calls": 1  # Probe calls let through at once while half-open
+}
+
+# Local stand-in for the images API (python -m services.fake_image_api), used for offline load and latency tests
+FAKE_IMAGE_API_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "latency_distribution": "lognormal",  # "fixed", "uniform" or "lognormal"
+    "latency_min_seconds": 2.0,  # Fixed latency, or lower bound of the uniform distribution
+    "latency_median_seconds": 8.0,  # Median of the lognormal distribution
+    "latency_sigma": 0.5,  # Spread of the lognormal distribution (log scale)
+    "latency_max_seconds": 40.0,  # Upper bound of the uniform distribution; cap of the lognormal one
+    "latency_per_extra_image_seconds": 2.0,  # Added for every variant after the first
+    "error_rate": 0.02,  # Share of requests answered with one of error_status_codes
+    "error_status_codes": [500, 502, 503],
+    "rate_limit_every_seconds": 120,  # A 429 burst ends each period of this length (0 disables bursts)
+    "rate_limit_burst_seconds": 10,  # Every request inside a burst gets a 429
+    "rate_limit_retry_after_seconds": 5,  # Retry-After hint sent with those 429s
+    "image_scale": 1.0,  # Returned images are the requested size times this
+    "image_noise": 0.3  # 0-1, noisier images compress worse and make larger payloads
+}
+
+# Background Generation Configuration
+GENERATION_CONFIG = {
+    "status_poll_seconds": 1.0,  # How often a page waiting for a background generation checks on it
+    "max_concurrent_jobs": 4,  # Generations calling the API at the same time across all sessions
+    "max_retained_jobs": 100,  # Finished jobs kept for their sessions to pick up
+    "job_ttl_seconds": 3600  # Finished jobs are dropped after this long
+}
+
+# Reference image folders per character, relative to the references folder
+REFERENCE_CHARACTERS = {
+    "alf": {"name": "ALF", "folder": "", "emoji": "🐊", "session_key": "REFERENCE_IMAGES"},
+    "polly": {"name": "Polly", "folder": "polly", "emoji": "🐧", "session_key": "POLLY_REFERENCE_IMAGES"},
+    "abster": {"name": "Abster", "folder": "abster", "emoji": "🐧", "session_key": "ABSTER_REFERENCE_IMAGES"},
+    "gooner": {"name": "GOONER", "folder": "gooner", "emoji": "🐧", "session_key": "GOONER_REFERENCE_IMAGES"},
+    "retsba": {"name": "Retsba", "folder": "retsba", "emoji": "🐧", "session_key": "RETSBA_REFERENCE_IMAGES"},
+    "beary": {"name": "Beary", "folder": "beary", "emoji": "🐻", "session_key": "BEARY_REFERENCE_IMAGES"},
+    "god": {"name": "GOD", "folder": "god", "emoji": "🐕", "session_key": "GOD_REFERENCE_IMAGES"},
+    "pepe": {"name": "Pepe", "folder": "pepe", "emoji": "🐸", "session_key": "PEPE_REFERENCE_IMAGES"},
+    "landwolf": {"name": "Landwolf", "folder": "landwolf", "emoji": "🐺", "session_key": "LANDWOLF_REFERENCE_IMAGES"},
+    "andy": {"name": "Andy", "folder": "andy", "emoji": "🟡", "session_key": "ANDY_REFERENCE_IMAGES"},
+    "brett": {"name": "Brett", "folder": "brett", "emoji": "🔵", "session_key": "BRETT_REFERENCE_IMAGES"}
+}
+
+# Reference Loading Configuration
+REFERENCE_LOADER_CONFIG = {
+    "max_workers": 8,  # Upper bound on threads decoding reference images concurrently
+    "max_cached_payloads": 256,  # Encoded upload payloads kept in memory (least recently used dropped first)
+    "max_cached_renditions": 512,  # Encoded display renditions kept in memory (least recently used dropped first)
+    "poll_interval_seconds": 5,  # How often reference folders are checked for added, changed or deleted files
+    "decoded_budget_bytes": 64 * 1024 * 1024  # Decoded reference pixels kept in memory; the rest stays compressed
+}
+
+# Reference Preprocessing Configuration (run offline with: python -m utils.reference_preprocessor)
+REFERENCE_PREPROCESS_CONFIG = {
+    "enabled": True,
+    "folder": ".processed",  # Subfolder next to the originals holding the processed PNGs
+    "max_side": 2048,  # Longest side kept; the model scales references to fit 2048x2048
+    "max_short_side": 768,  # ...and then their shortest side down to 768, so larger references add nothing
+    "crop_threshold": 16,  # Per-channel difference from the border color that still counts as background
+    "background": [255, 255, 255]  # Color transparent areas are flattened onto
+}
+
+# Reference Bundle Configuration (build with: python -m utils.reference_bundle)
+REFERENCE_BUNDLE_CONFIG = {
+    "enabled": True,
+    "path": "references.bundle"  # Relative to the project folder; files changed since the build are decoded as usual
+}
+
+# Reference Display Configuration (renditions shown in the UI; API uploads use full size)
+REFERENCE_DISPLAY_CONFIG = {
+    "sizes": {"small": 256, "medium": 512},  # Longest side in pixels per rendition
+    "format": "WEBP",  # Falls back to JPEG when Pillow lacks WebP support
+    "quality": 80
+}
+
 # Page Navigation States
 PAGES = {
     "LANDING": "landing",
@@ -130,6 +262,9 @@ PAGES = {
 SESSION_KEYS = {
     "PAGE": "page",
     "GENERATED_IMAGE": "generated_image",
+    "GENERATED_VARIANTS": "generated_variants",
+    "GENERATED_FROM_CACHE": "generated_from_cache",
+    "GENERATED_DRAFT": "generated_draft",
     "CURRENT_PROMPT": "current_prompt",
     "API_KEY": "api_key",
     "IMAGE_HISTORY": "image_history",
@@ -143,7 +278,10 @@ SESSION_KEYS = {
     "PEPE_REFERENCE_IMAGES": "pepe_reference_images",
     "LANDWOLF_REFERENCE_IMAGES": "landwolf_reference_images",
     "ANDY_REFERENCE_IMAGES": "andy_reference_images",
-    "BRETT_REFERENCE_IMAGES": "brett_reference_images"
+    "BRETT_REFERENCE_IMAGES": "brett_reference_images",
+    "LOADED_REFERENCE_VERSIONS": "loaded_reference_versions",
+    "REFERENCE_LOAD_REPORTS": "reference_load_reports",
+    "GENERATION_JOBS": "generation_jobs"
 }
 
 # UI Text Constants
@@ -287,5 +425,8 @@ ERROR_MESSAGES = {
     "API_ERROR": "The ALF spirits encountered an error:",
     "SWAMP_RESTLESS": "The swamp spirits are restless:",
     "NO_IMAGE": "No ALF manifested in the digital realm...",
-    "INVALID_API_KEY": "The API key seems corrupted by digital interference..."
+    "INVALID_API_KEY": "The API key seems corrupted by digital interference...",
+    "TIMED_OUT": "The ALF spirits did not answer in time:",
+    "CANCELLED": "Adventure cancelled before it emerged.",
+    "CIRCUIT_OPEN": "The portal to the ALF spirits is resting:"
 }
\ No newline at end of file
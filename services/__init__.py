@@ -3,9 +3,33 @@ ALF Abstractor Services Package
 Contains business logic and external service integrations
 """
 
-from .image_generator import ALFImageGenerator, ImageGenerationError
+from .image_generator import ALFImageGenerator, AsyncALFImageGenerator, ImageGenerationError
+from .client_pool import OpenAIClientPool
+from .generation_engine import GenerationEventLoop
+from .job_queue import GenerationJob, GenerationJobQueue
+from .retry_policy import RetryMetrics, RetryPolicy
+from .rate_limiter import APIRateLimiter, KeyRateLimit
+from .single_flight import GenerationSingleFlight
+from .result_cache import GenerationResultCache
+from .circuit_breaker import APICircuitBreaker, CircuitOpenError, EndpointCircuitBreaker
+from .fake_image_api import FakeImageAPI
 
 __all__ = [
     'ALFImageGenerator',
-    'ImageGenerationError'
+    'AsyncALFImageGenerator',
+    'ImageGenerationError',
+    'OpenAIClientPool',
+    'GenerationEventLoop',
+    'GenerationJob',
+    'GenerationJobQueue',
+    'RetryMetrics',
+    'RetryPolicy',
+    'APIRateLimiter',
+    'KeyRateLimit',
+    'GenerationSingleFlight',
+    'GenerationResultCache',
+    'APICircuitBreaker',
+    'CircuitOpenError',
+    'EndpointCircuitBreaker',
+    'FakeImageAPI'
 ]
\ No newline at end of file
@@ -0,0 +1,306 @@
+"""
+Circuit Breaker for ALF Abstractor
+Fails image API calls fast while an endpoint keeps failing or hanging
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import openai
+
+from config import CIRCUIT_BREAKER_CONFIG
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open"""
+    
+    def __init__(self, endpoint: str, retry_in: float):
+        """
+        Create the error
+        
+        Args:
+            endpoint (str): Endpoint that is not called, e.g. "images.generate"
+            retry_in (float): Seconds until the endpoint is tried again
+        """
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        super().__init__(
+            f"{endpoint} failed too often recently, so it is not called for now "
+            f"(next try in about {max(1, round(retry_in))}s)"
+        )
+
+class EndpointCircuitBreaker:
+    """Closed, open and half-open state of one API endpoint
+    
+    While closed, calls go through and their outcomes are kept for a rolling
+    window. Once the window holds at least min_calls and either the share
+    of failures (connection errors, timeouts, 5xx) or of slow calls reaches
+    its threshold, the circuit opens: calls fail right away with
+    CircuitOpenError for open_seconds. Then it is half-open and lets
+    half_open_max_calls probe calls through; a successful probe closes it,
+    a failed or slow one opens it again. Client errors (4xx, including 429
+    rate limits) and cancelled calls say nothing about the endpoint's health
+    and are not counted.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, endpoint: str, config: Optional[dict] = None):
+        """
+        Create a closed breaker
+        
+        Args:
+            endpoint (str): Endpoint name, e.g. "images.generate"
+            config (dict, optional): Settings like CIRCUIT_BREAKER_CONFIG. Defaults to it.
+        """
+        self.endpoint = endpoint
+        self.config = config or CIRCUIT_BREAKER_CONFIG
+        
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._calls = deque()  # (finished_at, failed, slow) of calls made while closed
+        self.stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0, "closed": 0}
+    
+    @staticmethod
+    def is_failure(error: BaseException) -> Optional[bool]:
+        """
+        Classify how a call's error reflects on the endpoint
+        
+        Args:
+            error (BaseException): Error raised by the call
+            
+        Returns:
+            Optional[bool]: True for endpoint trouble, False for an answer that shows
+                the endpoint works, None for errors that say nothing about it
+        """
+        if isinstance(error, openai.APIConnectionError):
+            # Includes APITimeoutError
+            return True
+        if isinstance(error, openai.APIStatusError):
+            if error.status_code == 429:
+                return None
+            return error.status_code >= 500
+        return None
+    
+    def _update(self, now: float):
+        """Move from open to half-open once open_seconds passed; callers hold the lock"""
+        if self._state == self.OPEN and now - self._opened_at >= self.config["open_seconds"]:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+    
+    def _open(self, now: float):
+        """Open the circuit; callers hold the lock"""
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self.stats["opened"] += 1
+    
+    def _acquire(self) -> bool:
+        """
+        Let a call through or reject it
+        
+        Returns:
+            bool: True if the call is a half-open probe
+            
+        Raises:
+            CircuitOpenError: If the circuit is open or its probes are taken
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._update(now)
+            if self._state == self.CLOSED:
+                return False
+            if self._state == self.HALF_OPEN and self._probes < self.config["half_open_max_calls"]:
+                self._probes += 1
+                return True
+            self.stats["rejected"] += 1
+            retry_in = max(0.0, self._opened_at + self.config["open_seconds"] - now)
+        raise CircuitOpenError(self.endpoint, retry_in)
+    
+    def _finish(self, probe: bool, started: Optional[float], error: Optional[BaseException]):
+        """Count a finished call and open or close the circuit accordingly"""
+        now = time.monotonic()
+        failed = self.is_failure(error) if error is not None else False
+        if started is None:
+            # Never sent (e.g. cancelled while waiting for the rate limit)
+            failed = None
+        slow = failed is False and now - started > self.config["slow_call_seconds"]
+        
+        with self._lock:
+            if probe:
+                self._probes -= 1
+                if self._state != self.HALF_OPEN or failed is None:
+                    return
+                self.stats["calls"] += 1
+                if failed or slow:
+                    self.stats["failures" if failed else "slow_calls"] += 1
+                    self._open(now)
+                else:
+                    self._state = self.CLOSED
+                    self.stats["closed"] += 1
+                return
+            
+            if self._state != self.CLOSED or failed is None:
+                return
+            self.stats["calls"] += 1
+            self.stats["failures"] += int(failed)
+            self.stats["slow_calls"] += int(slow)
+            
+            calls = self._calls
+            calls.append((now, failed, slow))
+            while calls and now - calls[0][0] > self.config["window_seconds"]:
+                calls.popleft()
+            if len(calls) < self.config["min_calls"]:
+                return
+            failures = sum(1 for _, call_failed, _ in calls if call_failed)
+            slow_calls = sum(1 for _, _, call_slow in calls if call_slow)
+            if (failures / len(calls) >= self.config["failure_rate_threshold"]
+                    or slow_calls / len(calls) >= self.config["slow_call_rate_threshold"]):
+                self._open(now)
+    
+    @contextlib.contextmanager
+    def guard(self):
+        """
+        Run one call through the breaker
+        
+        Yields a function to call right before the request is sent, so time
+        spent waiting (e.g. for the rate limit) is not counted as latency.
+        Works around awaits as well, since nothing in here blocks.
+        
+        Raises:
+            CircuitOpenError: If the call is not let through
+        """
+        probe = self._acquire()
+        call = {"started": None}
+        
+        def mark_sent():
+            call["started"] = time.monotonic()
+        
+        try:
+            yield mark_sent
+        except BaseException as e:
+            self._finish(probe, call["started"], e)
+            raise
+        self._finish(probe, call["started"], None)
+    
+    def get_state(self) -> str:
+        """
+        Get the current state
+        
+        Returns:
+            str: CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            self._update(time.monotonic())
+            return self._state
+    
+    def get_stats(self) -> dict:
+        """
+        Get the state and counters of this breaker
+        
+        Returns:
+            dict: state, retry_in_seconds (while open), window counts and call, failure,
+                slow call, rejection and transition counters
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._update(now)
+            stats = dict(self.stats)
+            stats.update({
+                "state": self._state,
+                "retry_in_seconds": max(0.0, self._opened_at + self.config["open_seconds"] - now)
+                if self._state == self.OPEN else 0.0,
+                "window_calls": len(self._calls),
+                "window_failures": sum(1 for _, failed, _ in self._calls if failed),
+                "window_slow_calls": sum(1 for _, _, slow in self._calls if slow)
+            })
+        return stats
+
+class APICircuitBreaker:
+    """Process-wide circuit breakers, one per images API endpoint
+    
+    Every API attempt of ALFImageGenerator runs inside guard(), so during an
+    upstream incident users get a clear error right away instead of waiting
+    for timeouts, and retries stop piling onto the failing service.
+    Configured by CIRCUIT_BREAKER_CONFIG.
+    """
+    
+    _lock = threading.Lock()
+    _breakers: Dict[str, EndpointCircuitBreaker] = {}
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check whether calls go through circuit breakers
+        
+        Returns:
+            bool: True if circuit breaking is switched on
+        """
+        return CIRCUIT_BREAKER_CONFIG["enabled"]
+    
+    @classmethod
+    def get_breaker(cls, endpoint: str) -> EndpointCircuitBreaker:
+        """
+        Get the breaker of an endpoint, creating it on first use
+        
+        Args:
+            endpoint (str): Endpoint name, e.g. "images.generate"
+            
+        Returns:
+            EndpointCircuitBreaker: Breaker shared by every caller of the endpoint
+        """
+        with cls._lock:
+            breaker = cls._breakers.get(endpoint)
+            if breaker is None:
+                breaker = EndpointCircuitBreaker(endpoint)
+                cls._breakers[endpoint] = breaker
+            return breaker
+    
+    @classmethod
+    @contextlib.contextmanager
+    def guard(cls, endpoint: str):
+        """
+        Run one call to an endpoint through its breaker
+        
+        Args:
+            endpoint (str): Endpoint name, e.g. "images.generate"
+        
+        Yields a function to call right before the request is sent.
+        
+        Raises:
+            CircuitOpenError: If the endpoint's circuit does not let the call through
+        """
+        if not cls.is_enabled():
+            yield lambda: None
+            return
+        with cls.get_breaker(endpoint).guard() as mark_sent:
+            yield mark_sent
+    
+    @classmethod
+    def get_unhealthy(cls) -> Dict[str, dict]:
+        """
+        Get the endpoints whose circuit is not closed
+        
+        Returns:
+            Dict[str, dict]: EndpointCircuitBreaker.get_stats() per open or half-open endpoint
+        """
+        return {endpoint: stats for endpoint, stats in cls.get_stats().items()
+                if stats["state"] != EndpointCircuitBreaker.CLOSED}
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, dict]:
+        """
+        Get the state of every endpoint's breaker
+        
+        Returns:
+            Dict[str, dict]: EndpointCircuitBreaker.get_stats() per endpoint
+        """
+        with cls._lock:
+            breakers = dict(cls._breakers)
+        return {endpoint: breaker.get_stats() for endpoint, breaker in breakers.items()}
@@ -0,0 +1,185 @@
+"""
+OpenAI Client Pool for ALF Abstractor
+Shares long-lived, keep-alive OpenAI clients across sessions and generations
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import openai
+
+from config import OPENAI_CONFIG
+
+class OpenAIClientPool:
+    """Process-wide pool of OpenAI clients keyed by a hash of the API key
+    
+    Every generation with the same API key reuses one client and therefore its
+    warm HTTP connections, instead of paying for a new connection pool and TLS
+    handshake per click. Clients that nobody is using and that were not
+    borrowed for OPENAI_CONFIG["client_idle_seconds"] are closed and dropped.
+    
+    The clients are async and only ever used on the GenerationEventLoop, since
+    their connections belong to the event loop they were opened on.
+    """
+    
+    _lock = threading.Lock()
+    _clients: "OrderedDict[str, dict]" = OrderedDict()
+    
+    @staticmethod
+    def get_key_hash(api_key: str) -> str:
+        """
+        Get the pool key for an API key so the key itself is never stored as a key
+        
+        Args:
+            api_key (str): OpenAI API key
+        
+        Returns:
+            str: SHA-256 hex digest of the API key
+        """
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def get_limits():
+        """
+        Get the connection limits of pooled clients
+        
+        Built with the Limits class of the SDK's own HTTP library (the type of
+        openai.DEFAULT_CONNECTION_LIMITS), so it always matches the installed openai.
+        
+        Returns:
+            Limits: Limits built from OPENAI_CONFIG
+        """
+        return type(openai.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=OPENAI_CONFIG["max_connections"],
+            max_keepalive_connections=OPENAI_CONFIG["max_keepalive_connections"],
+            keepalive_expiry=OPENAI_CONFIG["keepalive_expiry_seconds"]
+        )
+    
+    @staticmethod
+    def create_async_client(api_key: str) -> openai.AsyncOpenAI:
+        """
+        Create an async OpenAI client with the configured base URL, connection limits and keep-alive
+        
+        The client does not retry on its own; RetryPolicy decides that.
+        
+        Args:
+            api_key (str): OpenAI API key
+        
+        Returns:
+            openai.AsyncOpenAI: New client
+        """
+        http_client = openai.DefaultAsyncHttpxClient(limits=OpenAIClientPool.get_limits())
+        return openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=OPENAI_CONFIG.get("base_url"),
+            http_client=http_client,
+            max_retries=0,
+            timeout=OPENAI_CONFIG["request_timeout_seconds"]
+        )
+    
+    @staticmethod
+    def _close_entry(entry: dict):
+        """Close the client of a pool entry on the loop its connections belong to"""
+        from services.generation_engine import GenerationEventLoop
+        GenerationEventLoop.submit(entry["client"].close())
+    
+    @classmethod
+    def _evict_idle(cls, now: float):
+        """Close clients that are not leased and have not been borrowed recently; callers hold the lock"""
+        idle_seconds = OPENAI_CONFIG["client_idle_seconds"]
+        idle = [key_hash for key_hash, entry in cls._clients.items()
+                if not entry["users"] and now - entry["last_used"] >= idle_seconds]
+        for key_hash in idle:
+            cls._close_entry(cls._clients.pop(key_hash))
+    
+    @classmethod
+    def _borrow(cls, api_key: str, users: int = 0) -> openai.AsyncOpenAI:
+        """Get or create the client for an API key, adding users to its lease count"""
+        key_hash = cls.get_key_hash(api_key)
+        now = time.monotonic()
+        
+        with cls._lock:
+            cls._evict_idle(now)
+            
+            entry = cls._clients.get(key_hash)
+            if entry is None:
+                entry = {"client": cls.create_async_client(api_key), "created_at": now, "users": 0}
+                cls._clients[key_hash] = entry
+            
+            # Most recently borrowed clients are kept at the end
+            entry["last_used"] = now
+            entry["users"] += users
+            cls._clients.move_to_end(key_hash)
+            return entry["client"]
+    
+    @classmethod
+    def _release(cls, api_key: str, client: openai.AsyncOpenAI):
+        """End a lease, counting the client as used until now"""
+        with cls._lock:
+            entry = cls._clients.get(cls.get_key_hash(api_key))
+            if entry is not None and entry["client"] is client:
+                entry["users"] -= 1
+                entry["last_used"] = time.monotonic()
+    
+    @classmethod
+    def get_async_client(cls, api_key: str) -> openai.AsyncOpenAI:
+        """
+        Borrow the pooled async client for an API key, creating it on first use
+        
+        Args:
+            api_key (str): OpenAI API key
+        
+        Returns:
+            openai.AsyncOpenAI: Shared client, only to be used on the GenerationEventLoop
+        """
+        return cls._borrow(api_key)
+    
+    @classmethod
+    @contextmanager
+    def lease(cls, api_key: str):
+        """
+        Borrow the pooled async client for an API key for the duration of a with block
+        
+        A leased client is never closed as idle, however long the block takes
+        (e.g. while its request waits for the rate limit or between retries).
+        
+        Args:
+            api_key (str): OpenAI API key
+        
+        Yields:
+            openai.AsyncOpenAI: Shared client, only to be used on the GenerationEventLoop
+        """
+        client = cls._borrow(api_key, users=1)
+        try:
+            yield client
+        finally:
+            cls._release(api_key, client)
+    
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Get the number of pooled clients
+        
+        Returns:
+            dict: "clients" (open clients), "leased" (clients in use) and "oldest_idle_seconds"
+        """
+        now = time.monotonic()
+        with cls._lock:
+            oldest = next(iter(cls._clients.values()), None)
+            return {
+                "clients": len(cls._clients),
+                "leased": sum(1 for entry in cls._clients.values() if entry["users"]),
+                "oldest_idle_seconds": now - oldest["last_used"] if oldest else 0.0
+            }
+    
+    @classmethod
+    def close_all(cls):
+        """Close and drop every pooled client"""
+        with cls._lock:
+            entries = list(cls._clients.values())
+            cls._clients.clear()
+        for entry in entries:
+            cls._close_entry(entry)
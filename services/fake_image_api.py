@@ -0,0 +1,380 @@
+"""
+Fake Images API for ALF Abstractor
+Local stand-in for the OpenAI images endpoints, for offline load and latency tests
+"""
+
+import base64
+import email.parser
+import email.policy
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from PIL import Image, ImageOps
+
+from config import FAKE_IMAGE_API_CONFIG
+
+class _FakeImageAPIHandler(BaseHTTPRequestHandler):
+    """Routes requests of the OpenAI client to the FakeImageAPI serving them"""
+    
+    # Keep-alive, so the client pool's warm connections are exercised like against the real API
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        """Stay quiet; load tests send far too many requests to log each one"""
+    
+    def do_GET(self):
+        """Serve the request counters at /stats"""
+        if urlsplit(self.path).path.rstrip("/").endswith("/stats"):
+            self.send_json(200, self.server.api.get_stats())
+        else:
+            self.send_api_error(404, "Unknown endpoint", "invalid_request_error")
+    
+    def do_POST(self):
+        """Serve images.generate and images.edit"""
+        path = urlsplit(self.path).path.rstrip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            if path.endswith("/images/generations"):
+                self.server.api.handle(self, "image_generation", json.loads(body or b"{}"))
+            elif path.endswith("/images/edits"):
+                self.server.api.handle(self, "image_edit", self._parse_form(body))
+            else:
+                self.send_api_error(404, "Unknown endpoint", "invalid_request_error")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (timeout or cancelled generation)
+            self.close_connection = True
+    
+    def _parse_form(self, body: bytes) -> dict:
+        """Read the text fields of a multipart/form-data body; uploaded images are only counted"""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode('utf-8')
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(header + body)
+        fields = {"images": 0}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename():
+                fields["images"] += 1
+            elif name:
+                fields[name] = part.get_content()
+        return fields
+    
+    def send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        """Send a complete JSON response"""
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def send_api_error(self, status: int, message: str, error_type: str, headers: Optional[dict] = None):
+        """Send an error shaped like the OpenAI API's"""
+        self.send_json(status, {"error": {"message": message, "type": error_type, "param": None, "code": None}}, headers)
+    
+    def start_event_stream(self):
+        """Start a chunked server-sent events response"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+    
+    def send_event(self, event: str, payload: dict):
+        """Send one server-sent event as its own chunk"""
+        data = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode('utf-8')
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+    
+    def end_event_stream(self):
+        """Send the last chunk of the event stream"""
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+class FakeImageAPI:
+    """Local HTTP server answering images.generate and images.edit like the OpenAI API
+    
+    Images are procedurally drawn (seeded by the prompt, so equal prompts
+    give equal images), encoded in the requested output_format, and returned
+    as b64_json or streamed as server-sent events with partial previews.
+    Latency, error rate, 429 bursts and image size come from
+    FAKE_IMAGE_API_CONFIG. Point OPENAI_CONFIG["base_url"] (or the
+    OPENAI_BASE_URL environment variable) at get_base_url() and any API key
+    is accepted.
+    """
+    
+    def __init__(self, config: Optional[dict] = None):
+        """
+        Create a server (not yet listening)
+        
+        Args:
+            config (dict, optional): Settings overriding FAKE_IMAGE_API_CONFIG
+        """
+        self.config = dict(FAKE_IMAGE_API_CONFIG, **(config or {}))
+        self.started_at = time.monotonic()
+        
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"requests": 0, "succeeded": 0, "errors": 0, "rate_limited": 0,
+                       "disconnected": 0, "images": 0, "bytes": 0, "latency_seconds": 0.0}
+    
+    def get_latency(self, images: int = 1) -> float:
+        """
+        Draw how long a request takes from the configured distribution
+        
+        Args:
+            images (int): Images the request asks for
+            
+        Returns:
+            float: Seconds until the response is complete
+        """
+        config = self.config
+        distribution = config["latency_distribution"]
+        if distribution == "fixed":
+            latency = config["latency_min_seconds"]
+        elif distribution == "uniform":
+            latency = random.uniform(config["latency_min_seconds"], config["latency_max_seconds"])
+        else:
+            latency = min(config["latency_max_seconds"],
+                          random.lognormvariate(math.log(config["latency_median_seconds"]), config["latency_sigma"]))
+        return latency + config["latency_per_extra_image_seconds"] * max(0, images - 1)
+    
+    def is_rate_limited(self) -> bool:
+        """
+        Check whether a 429 burst is going on
+        
+        Returns:
+            bool: True if requests arriving now are rejected with 429
+        """
+        every = self.config["rate_limit_every_seconds"]
+        if not every:
+            return False
+        # Bursts close each period, so a freshly started server answers normally first
+        return (time.monotonic() - self.started_at) % every >= every - self.config["rate_limit_burst_seconds"]
+    
+    def get_image_size(self, size: Optional[str]) -> Tuple[int, int]:
+        """
+        Get the pixel size of returned images
+        
+        Args:
+            size (str, optional): Requested size such as "1024x1024" ("auto" or None for square)
+            
+        Returns:
+            Tuple[int, int]: Width and height after applying image_scale
+        """
+        try:
+            width, height = (int(side) for side in str(size).split("x"))
+        except ValueError:
+            width, height = 1024, 1024
+        scale = self.config["image_scale"]
+        return max(1, int(width * scale)), max(1, int(height * scale))
+    
+    def render_image(self, seed: str, size: Tuple[int, int], detail: float = 1.0,
+                     output_format: str = "png", compression: Optional[int] = None) -> bytes:
+        """
+        Draw an image
+        
+        Args:
+            seed (str): Picks the colors and shapes, so equal seeds give equal images
+            size (Tuple[int, int]): Width and height
+            detail (float): Below 1 the image is drawn coarser, like a partial preview
+            output_format (str): "png", "jpeg" or "webp"
+            compression (int, optional): 0-100 for jpeg and webp, lower is smaller (None: 100)
+            
+        Returns:
+            bytes: Encoded file contents
+        """
+        rng = random.Random(seed)
+        colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(4)]
+        
+        sweep = Image.linear_gradient("L").rotate(rng.uniform(0, 360), fillcolor=rng.randrange(256))
+        glow = Image.radial_gradient("L").transform(
+            (256, 256), Image.Transform.AFFINE,
+            (1, 0, rng.uniform(-96, 96), 0, 1, rng.uniform(-96, 96)), fillcolor=255
+        )
+        image = Image.blend(ImageOps.colorize(sweep, colors[0], colors[1]),
+                            ImageOps.colorize(glow, colors[2], colors[3]), 0.5).resize(size)
+        
+        noise = self.config["image_noise"]
+        if noise > 0:
+            image = Image.blend(image, Image.effect_noise(size, 96).convert("RGB"), noise)
+        if detail < 1:
+            coarse = (max(1, int(size[0] * detail)), max(1, int(size[1] * detail)))
+            image = image.resize(coarse).resize(size, Image.Resampling.NEAREST)
+        
+        buffer = io.BytesIO()
+        if output_format in ("jpeg", "webp"):
+            quality = compression if compression is not None else 100
+            image.save(buffer, format=output_format.upper(), quality=max(1, quality))
+        else:
+            # Fast compression: the server should not be the bottleneck of a load test
+            image.save(buffer, format="PNG", compress_level=1)
+        return buffer.getvalue()
+    
+    def _count(self, **increments):
+        """Add to the request counters"""
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+    
+    def handle(self, handler: _FakeImageAPIHandler, kind: str, fields: dict):
+        """
+        Answer one images request
+        
+        Args:
+            handler (_FakeImageAPIHandler): Request handler to respond through
+            kind (str): "image_generation" or "image_edit", the prefix of streamed event types
+            fields (dict): JSON body or form fields of the request
+        """
+        started = time.monotonic()
+        self._count(requests=1)
+        
+        if self.is_rate_limited():
+            self._count(rate_limited=1)
+            handler.send_api_error(
+                429, "Rate limit reached for images per minute (fake images API burst)", "requests",
+                {"Retry-After": str(self.config["rate_limit_retry_after_seconds"])}
+            )
+            return
+        
+        prompt = str(fields.get("prompt", ""))
+        n = int(fields.get("n") or 1)
+        stream = str(fields.get("stream", "")).lower() == "true"
+        partial_images = int(fields.get("partial_images") or 0) if stream else 0
+        size = self.get_image_size(fields.get("size"))
+        output_format = str(fields.get("output_format") or "png")
+        compression = int(fields["output_compression"]) if fields.get("output_compression") is not None else None
+        if output_format not in ("png", "jpeg", "webp"):
+            self._count(errors=1)
+            handler.send_api_error(400, f"Invalid value: '{output_format}'. Supported values are: 'png', 'jpeg' and 'webp'.",
+                                   "invalid_request_error")
+            return
+        encoding = {"output_format": output_format, "compression": compression}
+        latency = self.get_latency(n)
+        
+        if random.random() < self.config["error_rate"]:
+            time.sleep(random.uniform(0, latency))
+            self._count(errors=1)
+            status = random.choice(self.config["error_status_codes"])
+            handler.send_api_error(status, f"Simulated {status} from the fake images API", "server_error")
+            return
+        
+        created = int(time.time())
+        description = {
+            "size": f"{size[0]}x{size[1]}",
+            "quality": fields.get("quality", "auto"),
+            "background": "opaque",
+            "output_format": output_format
+        }
+        usage = {
+            "input_tokens": len(prompt.split()) + 256 * fields.get("images", 0),
+            "input_tokens_details": {"text_tokens": len(prompt.split()), "image_tokens": 256 * fields.get("images", 0)},
+            "output_tokens": 1056 * n,
+            "total_tokens": len(prompt.split()) + 256 * fields.get("images", 0) + 1056 * n
+        }
+        
+        try:
+            if stream:
+                handler.start_event_stream()
+                for index in range(partial_images):
+                    time.sleep(latency / (partial_images + 1))
+                    preview = self.render_image(prompt, size, detail=(index + 1) / (partial_images + 2), **encoding)
+                    handler.send_event(f"{kind}.partial_image", dict(
+                        description, type=f"{kind}.partial_image", created_at=created,
+                        partial_image_index=index, b64_json=base64.b64encode(preview).decode('ascii')
+                    ))
+                time.sleep(max(0.0, started + latency - time.monotonic()))
+                images = [self.render_image(f"{prompt}#{index}", size, **encoding) for index in range(n)]
+                for image in images:
+                    handler.send_event(f"{kind}.completed", dict(
+                        description, type=f"{kind}.completed", created_at=created,
+                        b64_json=base64.b64encode(image).decode('ascii'), usage=usage
+                    ))
+                handler.end_event_stream()
+            else:
+                images = [self.render_image(f"{prompt}#{index}", size, **encoding) for index in range(n)]
+                time.sleep(max(0.0, started + latency - time.monotonic()))
+                handler.send_json(200, dict(
+                    description, created=created, usage=usage,
+                    data=[{"b64_json": base64.b64encode(image).decode('ascii')} for image in images]
+                ))
+        except (BrokenPipeError, ConnectionResetError):
+            self._count(disconnected=1)
+            raise
+        
+        self._count(succeeded=1, images=n, bytes=sum(len(image) for image in images),
+                    latency_seconds=time.monotonic() - started)
+    
+    def _bind(self) -> ThreadingHTTPServer:
+        """Open the listening socket"""
+        server = ThreadingHTTPServer((self.config["host"], self.config["port"]), _FakeImageAPIHandler)
+        server.daemon_threads = True
+        server.api = self
+        self._server = server
+        return server
+    
+    def get_base_url(self) -> str:
+        """
+        Get the URL to use as the OpenAI client's base_url
+        
+        Returns:
+            str: e.g. "http://127.0.0.1:8765/v1" (with the actual port once listening)
+        """
+        host, port = self._server.server_address[:2] if self._server else (self.config["host"], self.config["port"])
+        return f"http://{host}:{port}/v1"
+    
+    def start(self) -> str:
+        """
+        Serve on a background daemon thread
+        
+        Returns:
+            str: Base URL of the server
+        """
+        server = self._bind()
+        self._thread = threading.Thread(target=server.serve_forever, name="alf-fake-image-api", daemon=True)
+        self._thread.start()
+        return self.get_base_url()
+    
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted"""
+        server = self._bind()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    
+    def stop(self):
+        """Stop a server started with start()"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+    
+    def get_stats(self) -> dict:
+        """
+        Get the request counters
+        
+        Returns:
+            dict: requests, succeeded, errors, rate_limited, disconnected, images, bytes,
+                latency_seconds (sum over successful requests) and uptime_seconds
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["uptime_seconds"] = time.monotonic() - self.started_at
+        return stats
+
+if __name__ == "__main__":
+    fake_api = FakeImageAPI({"port": int(sys.argv[1])} if len(sys.argv) > 1 else None)
+    print(f"Fake images API on {fake_api.get_base_url()} - set OPENAI_CONFIG['base_url'] or OPENAI_BASE_URL to it")
+    fake_api.serve_forever()
@@ -0,0 +1,65 @@
+"""
+Generation Engine for ALF Abstractor
+Runs asynchronous image generations on one background event loop shared by all sessions
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+class GenerationEventLoop:
+    """Process-wide asyncio event loop running on a dedicated daemon thread
+    
+    Streamlit script runs hand coroutines to this loop and get back a
+    concurrent.futures.Future, so they can return immediately and poll for
+    the result on later reruns instead of blocking for the whole render.
+    """
+    
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        """
+        Get the shared event loop, starting its thread on first use
+        
+        Returns:
+            asyncio.AbstractEventLoop: Running event loop
+        """
+        if cls._loop is not None:
+            return cls._loop
+        
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="alf-generation-loop", daemon=True)
+                thread.start()
+                cls._thread = thread
+                cls._loop = loop
+        
+        return cls._loop
+    
+    @classmethod
+    def submit(cls, coroutine: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the shared event loop
+        
+        Args:
+            coroutine (Coroutine): Coroutine to run
+        
+        Returns:
+            Future: Thread-safe future resolved with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, cls.get_loop())
+    
+    @classmethod
+    def is_running(cls) -> bool:
+        """
+        Check whether the shared event loop has been started
+        
+        Returns:
+            bool: True if the loop thread is alive
+        """
+        return cls._thread is not None and cls._thread.is_alive()
@@ -4,30 +4,79 @@ Handles OpenAI gpt-image-1 integration and image processing
 """
 
 import openai
+import asyncio
 import base64
+import hashlib
 import io
+import json
 from PIL import Image
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 import time
 
-from config import OPENAI_CONFIG, ERROR_MESSAGES
+from config import OPENAI_CONFIG, ERROR_MESSAGES, QUALITY_TIERS
+from services.circuit_breaker import APICircuitBreaker, CircuitOpenError
+from services.client_pool import OpenAIClientPool
+from services.generation_engine import GenerationEventLoop
+from services.rate_limiter import APIRateLimiter
+from services.result_cache import GenerationResultCache
+from services.retry_policy import RetryPolicy
+from services.single_flight import GenerationSingleFlight
+from utils.generated_image import GeneratedImage
+from utils.reference_cache import ReferencePayloadCache
+from utils.reference_loader import ReferenceImageLoader
 
 class ImageGenerationError(Exception):
     """Custom exception for image generation errors"""
     pass
 
 class ALFImageGenerator:
-    """Service class for generating ALF images using OpenAI gpt-image-1"""
+    """Service class for generating ALF images using OpenAI gpt-image-1
     
-    def __init__(self, api_key: str):
+    Generation is implemented once, as coroutines on openai.AsyncOpenAI that
+    run on the shared GenerationEventLoop. The methods of this class block
+    until that finishes (so they must not be called on the loop itself);
+    AsyncALFImageGenerator offers the same methods as coroutines.
+    """
+    
+    def __init__(self, api_key: str, tier: Optional[str] = None):
         """
         Initialize the image generator with OpenAI API key
         
+        The async client is leased from OpenAIClientPool for each API call, so
+        generators created for the same API key share warm connections and a
+        generator queued for a long time never holds a client closed as idle.
+        
         Args:
             api_key (str): OpenAI API key
+            tier (str, optional): Key of QUALITY_TIERS whose settings override OPENAI_CONFIG
+        """
+        self.api_key = api_key
+        self.config = self.get_tier_config(tier)
+        self.retry_policy = RetryPolicy()
+        self.attempts: List[dict] = []  # Attempt records of the latest API call
+        self.rate_limited_until: Optional[float] = None  # Set while waiting for the shared rate limit
+        self.coalesced = False  # Whether the latest call joined an identical one already in flight
+        self.from_cache = False  # Whether the latest result came from GenerationResultCache
+    
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """Pooled async client of the API key, borrowed afresh on every access"""
+        return OpenAIClientPool.get_async_client(self.api_key)
+    
+    @staticmethod
+    def get_tier_config(tier: Optional[str] = None) -> dict:
+        """
+        Get the generation settings of a quality tier
+        
+        Args:
+            tier (str, optional): Key of QUALITY_TIERS, e.g. "draft" or "final"
+            
+        Returns:
+            dict: OPENAI_CONFIG with the tier's settings applied (OPENAI_CONFIG itself for no tier)
         """
-        self.client = openai.OpenAI(api_key=api_key)
-        self.config = OPENAI_CONFIG
+        if tier is None:
+            return OPENAI_CONFIG
+        return dict(OPENAI_CONFIG, **QUALITY_TIERS[tier])
     
     def enhance_prompt(self, user_prompt: str, has_reference_images: bool = False) -> str:
         """
@@ -51,151 +100,432 @@ class ALFImageGenerator:
         )
         return enhanced_prompt
     
-    def generate_image(self, prompt: str, has_reference_images: bool = False) -> Tuple[Image.Image, str]:
+    def _get_variant_count(self, n: Optional[int]) -> int:
+        """Clamp a requested number of variants to what is configured as allowed"""
+        if n is None:
+            n = self.config.get("n", 1)
+        return max(1, min(n, self.config.get("max_variants", 1)))
+    
+    def _get_output_params(self) -> dict:
+        """Build the output format arguments shared by images.generate and images.edit"""
+        output_format = self.config.get("output_format", "png")
+        params = {"output_format": output_format}
+        compression = self.config.get("output_compression")
+        # The API only compresses jpeg and webp
+        if output_format != "png" and compression is not None:
+            params["output_compression"] = compression
+        return params
+    
+    def _get_generate_params(self, enhanced_prompt: str, n: Optional[int] = None) -> dict:
+        """Build the images.generate arguments for an enhanced prompt"""
+        return {
+            "model": self.config["model"],
+            "prompt": enhanced_prompt,
+            "size": self.config.get("size", "1024x1024"),
+            "quality": self.config.get("quality", "high"),
+            "n": self._get_variant_count(n),
+            **self._get_output_params()
+        }
+    
+    def _get_edit_params(self, enhanced_prompt: str, image_files: list, n: Optional[int] = None) -> dict:
+        """Build the images.edit arguments for an enhanced prompt and encoded reference files"""
+        return {
+            "model": self.config["model"],
+            "image": image_files,
+            "prompt": enhanced_prompt,
+            "size": self.config.get("size", "1024x1024"),
+            "quality": self.config.get("quality", "high"),
+            "n": self._get_variant_count(n),
+            "input_fidelity": "high",  # Use high fidelity to preserve reference details
+            **self._get_output_params()
+        }
+    
+    @staticmethod
+    def _get_response_bytes(response) -> List[bytes]:
         """
-        Generate an image using OpenAI's gpt-image-1 model
+        Validate an images API response and get the encoded bytes of all of its images
         
         Args:
-            prompt (str): The prompt to generate image from
-            has_reference_images (bool): Whether reference images are available
+            response: Response of images.generate or images.edit
             
         Returns:
-            Tuple[Image.Image, str]: Generated image and the enhanced prompt used
+            List[bytes]: Encoded images in response order
             
         Raises:
-            ImageGenerationError: If generation fails
+            ImageGenerationError: If the response holds no image
         """
-        try:
-            enhanced_prompt = self.enhance_prompt(prompt, has_reference_images)
-            
-            # Use the correct gpt-image-1 API call structure
-            response = self.client.images.generate(
-                model=self.config["model"],
-                prompt=enhanced_prompt,
-                size=self.config.get("size", "1024x1024"),
-                quality=self.config.get("quality", "high"),
-                n=self.config.get("n", 1)
-            )
-            
-            # Validate response structure
-            if not response or not hasattr(response, 'data') or not response.data:
-                raise ImageGenerationError("Invalid response from OpenAI API - no data returned")
-            
-            if len(response.data) == 0:
-                raise ImageGenerationError("No images generated in API response")
-            
-            # Get the image data - gpt-image-1 returns b64_json format
-            image_data = response.data[0]
-            
+        # Validate response structure
+        if not response or not hasattr(response, 'data') or not response.data:
+            raise ImageGenerationError("Invalid response from OpenAI API - no data returned")
+        
+        if len(response.data) == 0:
+            raise ImageGenerationError("No images generated in API response")
+        
+        image_bytes = []
+        for image_data in response.data:
+            # gpt-image-1 returns b64_json format
             if not hasattr(image_data, 'b64_json') or not image_data.b64_json:
                 raise ImageGenerationError("No base64 image data found in API response")
             
-            # Decode the base64 image
-            image_bytes = base64.b64decode(image_data.b64_json)
-            image = Image.open(io.BytesIO(image_bytes))
+            image_bytes.append(base64.b64decode(image_data.b64_json))
+        
+        return image_bytes
+    
+    @staticmethod
+    def _wrap_images(image_bytes: List[bytes]) -> List[GeneratedImage]:
+        """
+        Wrap encoded images in handles without decoding them
+        
+        Args:
+            image_bytes (List[bytes]): Encoded images
             
-            return image, enhanced_prompt
+        Returns:
+            List[GeneratedImage]: Handles in the same order
+        """
+        return [GeneratedImage(data) for data in image_bytes]
+    
+    def _on_rate_limit_wait(self, seconds: float):
+        """Remember until when the current call waits for the shared rate limit"""
+        self.rate_limited_until = time.time() + seconds if seconds > 0 else None
+    
+    def _get_stream_params(self, params: dict, on_partial: Optional[Callable[[int, bytes], None]]) -> dict:
+        """
+        Switch a request to streaming mode when someone wants partial previews
+        
+        Only single-image requests are streamed; variants arrive all at once.
+        
+        Args:
+            params (dict): Arguments of images.generate or images.edit
+            on_partial (Callable[[int, bytes], None], optional): Receiver of partial previews
             
-        except openai.OpenAIError as e:
-            raise ImageGenerationError(f"{ERROR_MESSAGES['API_ERROR']} {str(e)}")
-        except Exception as e:
-            raise ImageGenerationError(f"{ERROR_MESSAGES['SWAMP_RESTLESS']} {str(e)}")
+        Returns:
+            dict: The arguments, with stream and partial_images set if streaming
+        """
+        partial_images = self.config.get("stream_partial_images", 0)
+        if on_partial is None or not partial_images or params.get("n", 1) != 1:
+            return params
+        return dict(params, stream=True, partial_images=partial_images)
     
-    def generate_image_with_reference_files(self, prompt: str, reference_images: list = None) -> Tuple[Image.Image, str]:
+    @staticmethod
+    def _handle_stream_event(event, on_partial: Optional[Callable[[int, bytes], None]], completed: list):
         """
-        Generate an image using reference images via the edit endpoint
+        Pass a partial preview on or collect a completed image of a streamed response
         
         Args:
-            prompt (str): The prompt to generate image from
-            reference_images (list): List of PIL Image objects to use as references
+            event: Image generation or edit stream event
+            on_partial (Callable[[int, bytes], None], optional): Receiver of partial previews
+            completed (list): Collects the completed images as openai.types.Image
+        """
+        if event.type.endswith(".partial_image"):
+            if on_partial is not None:
+                on_partial(event.partial_image_index, base64.b64decode(event.b64_json))
+        elif event.type.endswith(".completed"):
+            completed.append(openai.types.Image(b64_json=event.b64_json))
+    
+    async def _call_limited(self, func, on_partial: Optional[Callable[[int, bytes], None]] = None, **kwargs):
+        """
+        Make one API call inside the API key's shared rate limit
+        
+        The endpoint's circuit breaker is checked first, so an open circuit fails
+        right away without taking a rate limit slot. Streamed responses are read
+        to the end inside the limit, passing partial previews to on_partial, and
+        returned like a regular response.
+        
+        Args:
+            func: Async client method such as client.images.generate
+            on_partial (Callable[[int, bytes], None], optional): Receiver of partial previews
+            **kwargs: Arguments for func; "n" is the number of images reserved
             
         Returns:
-            Tuple[Image.Image, str]: Generated image and the enhanced prompt used
+            The API response
             
         Raises:
-            ImageGenerationError: If generation fails
+            CircuitOpenError: If the endpoint's circuit is open
+        """
+        with APICircuitBreaker.guard(self._get_endpoint(func)) as mark_sent:
+            async with APIRateLimiter.limit_async(self.api_key, kwargs.get("n", 1), self._on_rate_limit_wait):
+                self.rate_limited_until = None
+                mark_sent()
+                response = await func(**kwargs)
+                if not kwargs.get("stream"):
+                    return response
+                
+                completed = []
+                async with response as stream:
+                    async for event in stream:
+                        self._handle_stream_event(event, on_partial, completed)
+                return openai.types.ImagesResponse(created=int(time.time()), data=completed)
+    
+    @staticmethod
+    def _get_endpoint(func) -> str:
+        """Name the endpoint a client method calls, e.g. "images.generate", for its circuit breaker"""
+        return f"images.{getattr(func, '__name__', 'call')}"
+    
+    def _get_request_key(self, params: dict, reference_images: list) -> str:
+        """
+        Hash everything that determines the result of an images API call
+        
+        The key scopes both single-flight coalescing and the result cache: only
+        requests made with the same API key share a call or a cached result, so
+        nobody is served images generated and billed under someone else's key.
+        
+        Args:
+            params (dict): Arguments of images.generate or images.edit
+            reference_images (list): Reference images or ReferenceImage handles sent along
+            
+        Returns:
+            str: SHA-256 hex digest of the enhanced prompt, reference content hashes,
+                generation parameters, API base URL and API key
+        """
+        request = {key: value for key, value in params.items() if key != "image"}
+        request["references"] = [ReferenceImageLoader.get_content_hash(image) for image in reference_images]
+        # Results of a local stand-in (FakeImageAPI) must never be served as real ones
+        request["base_url"] = str(self.client.base_url)
+        request["api_key"] = OpenAIClientPool.get_key_hash(self.api_key)
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _get_cache_meta(params: dict) -> dict:
+        """Describe a request for its result cache entry"""
+        return {key: value for key, value in params.items() if key != "image"}
+    
+    async def _send(self, func, params: dict, request_key: str, coalesce: bool,
+                    on_partial: Optional[Callable[[int, bytes], None]] = None, store: bool = False) -> List[bytes]:
+        """
+        Make an images API call with retries and rate limiting
+        
+        The shared call runs on even if the request that started it is
+        cancelled while others wait for it, and stores its result then too.
+        
+        Args:
+            func: Async client method such as client.images.generate
+            params (dict): Arguments for func
+            request_key (str): Key shared by identical requests
+            coalesce (bool): Share the call with identical requests in flight
+            on_partial (Callable[[int, bytes], None], optional): Receiver of partial previews
+            store (bool): Put the images into GenerationResultCache as part of the call
+            
+        Returns:
+            List[bytes]: Encoded images in response order
+        """
+        async def make_call():
+            self.coalesced = False
+            response = await self.retry_policy.call_async(
+                self._call_limited, func, on_partial, attempts=self.attempts,
+                **self._get_stream_params(params, on_partial)
+            )
+            image_bytes = self._get_response_bytes(response)
+            if store:
+                # Cache files are written off the event loop
+                await asyncio.to_thread(GenerationResultCache.put, request_key, image_bytes, self._get_cache_meta(params))
+            return image_bytes
+        
+        self.coalesced = coalesce
+        if not coalesce:
+            return await make_call()
+        return await GenerationSingleFlight.call_async(request_key, make_call)
+    
+    async def _fetch(self, func, params: dict, reference_images: list, coalesce: bool,
+                     on_partial: Optional[Callable[[int, bytes], None]] = None) -> List[bytes]:
+        """
+        Get the images of a request from the result cache or the API
+        
+        Args:
+            func: Async client method such as client.images.generate
+            params (dict): Arguments for func
+            reference_images (list): Reference images sent along (for the request key)
+            coalesce (bool): Reuse cached results and share identical calls in flight
+            on_partial (Callable[[int, bytes], None], optional): Receiver of partial previews
+            
+        Returns:
+            List[bytes]: Encoded images in response order
         """
+        self.from_cache = False
+        request_key = self._get_request_key(params, reference_images)
+        store = GenerationResultCache.is_enabled()
+        if store and coalesce:
+            # Cache files are read and written off the event loop
+            cached = await asyncio.to_thread(GenerationResultCache.get, request_key)
+            if cached:
+                self.from_cache = True
+                self.coalesced = False
+                return cached
+        
+        image_bytes = await self._send(func, params, request_key, coalesce, on_partial, store)
+        
+        # A request that joined a call whose store did not happen stores the result itself
+        if store and self.coalesced and not await asyncio.to_thread(GenerationResultCache.contains, request_key):
+            await asyncio.to_thread(GenerationResultCache.put, request_key, image_bytes, self._get_cache_meta(params))
+        return image_bytes
+    
+    def _to_generation_error(self, error: Exception) -> ImageGenerationError:
+        """Wrap an error raised while generating with the user-facing message prefix"""
+        retried = f" (gave up after {len(self.attempts)} attempts)" if len(self.attempts) > 1 else ""
+        if isinstance(error, CircuitOpenError):
+            return ImageGenerationError(f"{ERROR_MESSAGES['CIRCUIT_OPEN']} {str(error)}")
+        if isinstance(error, openai.OpenAIError):
+            return ImageGenerationError(f"{ERROR_MESSAGES['API_ERROR']} {str(error)}{retried}")
+        return ImageGenerationError(f"{ERROR_MESSAGES['SWAMP_RESTLESS']} {str(error)}{retried}")
+    
+    async def _generate_images(self, prompt: str, has_reference_images: bool = False,
+                               n: Optional[int] = None, coalesce: bool = True,
+                               on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """Generate variants without reference images; see generate_images()"""
+        try:
+            self.attempts = []
+            enhanced_prompt = self.enhance_prompt(prompt, has_reference_images)
+            params = self._get_generate_params(enhanced_prompt, n)
+            with OpenAIClientPool.lease(self.api_key) as client:
+                image_bytes = await self._fetch(client.images.generate, params, [], coalesce, on_partial)
+            return self._wrap_images(image_bytes), enhanced_prompt
+            
+        except Exception as e:
+            raise self._to_generation_error(e)
+    
+    async def _generate_images_with_reference_files(self, prompt: str, reference_images: list = None,
+                                                    n: Optional[int] = None,
+                                                    coalesce: bool = True,
+                                                    on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """Generate variants from reference images; see generate_images_with_reference_files()"""
         try:
+            self.attempts = []
             if not reference_images:
                 # If no reference images, fall back to regular generation
-                return self.generate_image(prompt, False)
+                return await self._generate_images(prompt, False, n, coalesce, on_partial)
             
             enhanced_prompt = self.enhance_prompt(prompt, True)
             
-            # Convert PIL images to proper BytesIO objects with correct content type
-            image_files = []
+            # Encoding a reference that is not cached yet is CPU work, keep it off the event loop
+            image_files = await asyncio.to_thread(ReferencePayloadCache.get_upload_files, reference_images)
             
-            for i, img in enumerate(reference_images):
-                # Create BytesIO object
-                img_byte_arr = io.BytesIO()
-                
-                # Save as PNG format
-                img.save(img_byte_arr, format='PNG')
-                img_byte_arr.seek(0)
-                
-                # Set the name attribute to indicate PNG format
-                img_byte_arr.name = f"reference_{i}.png"
-                
-                image_files.append(img_byte_arr)
-            
-            # Use the edit endpoint with reference images
-            response = self.client.images.edit(
-                model=self.config["model"],
-                image=image_files,
-                prompt=enhanced_prompt,
-                size=self.config.get("size", "1024x1024"),
-                quality=self.config.get("quality", "high"),
-                input_fidelity="high"  # Use high fidelity to preserve reference details
-            )
+            params = self._get_edit_params(enhanced_prompt, image_files, n)
+            with OpenAIClientPool.lease(self.api_key) as client:
+                image_bytes = await self._fetch(client.images.edit, params, reference_images, coalesce, on_partial)
+            return self._wrap_images(image_bytes), enhanced_prompt
             
-            # Validate response structure
-            if not response or not hasattr(response, 'data') or not response.data:
-                raise ImageGenerationError("Invalid response from OpenAI API - no data returned")
+        except Exception as e:
+            raise self._to_generation_error(e)
+    
+    def generate_images(self, prompt: str, has_reference_images: bool = False,
+                        n: Optional[int] = None, coalesce: bool = True,
+                        on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """
+        Generate one or more variants using OpenAI's gpt-image-1 model in a single call
+        
+        Args:
+            prompt (str): The prompt to generate images from
+            has_reference_images (bool): Whether reference images are available
+            n (int, optional): Number of variants. Defaults to OPENAI_CONFIG["n"].
+            coalesce (bool): Reuse a cached result or share one API call with identical
+                requests already in flight; False always makes a fresh call
+            on_partial (Callable[[int, bytes], None], optional): Called with the index and
+                encoded bytes of each partial preview while a single image is streamed
+                (on the GenerationEventLoop thread)
             
-            if len(response.data) == 0:
-                raise ImageGenerationError("No images generated in API response")
+        Returns:
+            Tuple[List[GeneratedImage], str]: Generated images and the enhanced prompt used
             
-            # Get the image data
-            image_data = response.data[0]
+        Raises:
+            ImageGenerationError: If generation fails
+        """
+        return GenerationEventLoop.submit(
+            self._generate_images(prompt, has_reference_images, n, coalesce, on_partial)
+        ).result()
+    
+    def generate_images_with_reference_files(self, prompt: str, reference_images: list = None,
+                                             n: Optional[int] = None,
+                                             coalesce: bool = True,
+                                             on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """
+        Generate one or more variants using reference images via the edit endpoint
+        
+        Args:
+            prompt (str): The prompt to generate images from
+            reference_images (list): Reference images or ReferenceImage handles
+            n (int, optional): Number of variants. Defaults to OPENAI_CONFIG["n"].
+            coalesce (bool): Reuse a cached result or share one API call with identical
+                requests already in flight; False always makes a fresh call
+            on_partial (Callable[[int, bytes], None], optional): Called with the index and
+                encoded bytes of each partial preview while a single image is streamed
+                (on the GenerationEventLoop thread)
             
-            if not hasattr(image_data, 'b64_json') or not image_data.b64_json:
-                raise ImageGenerationError("No base64 image data found in API response")
+        Returns:
+            Tuple[List[GeneratedImage], str]: Generated images and the enhanced prompt used
             
-            # Decode the base64 image
-            image_bytes = base64.b64decode(image_data.b64_json)
-            image = Image.open(io.BytesIO(image_bytes))
+        Raises:
+            ImageGenerationError: If generation fails
+        """
+        return GenerationEventLoop.submit(
+            self._generate_images_with_reference_files(prompt, reference_images, n, coalesce, on_partial)
+        ).result()
+    
+    def generate_image(self, prompt: str, has_reference_images: bool = False) -> Tuple[Image.Image, str]:
+        """
+        Generate an image using OpenAI's gpt-image-1 model
+        
+        Args:
+            prompt (str): The prompt to generate image from
+            has_reference_images (bool): Whether reference images are available
             
-            return image, enhanced_prompt
+        Returns:
+            Tuple[Image.Image, str]: Generated image and the enhanced prompt used
             
-        except openai.OpenAIError as e:
-            raise ImageGenerationError(f"{ERROR_MESSAGES['API_ERROR']} {str(e)}")
-        except Exception as e:
-            raise ImageGenerationError(f"{ERROR_MESSAGES['SWAMP_RESTLESS']} {str(e)}")
+        Raises:
+            ImageGenerationError: If generation fails
+        """
+        images, enhanced_prompt = self.generate_images(prompt, has_reference_images, 1)
+        return images[0].image, enhanced_prompt
+    
+    def generate_image_with_reference_files(self, prompt: str, reference_images: list = None) -> Tuple[Image.Image, str]:
+        """
+        Generate an image using reference images via the edit endpoint
+        
+        Args:
+            prompt (str): The prompt to generate image from
+            reference_images (list): List of PIL Image objects to use as references
+            
+        Returns:
+            Tuple[Image.Image, str]: Generated image and the enhanced prompt used
+            
+        Raises:
+            ImageGenerationError: If generation fails
+        """
+        images, enhanced_prompt = self.generate_images_with_reference_files(prompt, reference_images, 1)
+        return images[0].image, enhanced_prompt
     
     @staticmethod
-    def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
+    def image_to_bytes(image, format: str = "PNG") -> bytes:
         """
-        Convert PIL Image to bytes for download
+        Convert an image to bytes for download
+        
+        A GeneratedImage already in the requested format is returned as the API
+        encoded it, without decoding and re-encoding.
         
         Args:
-            image (Image.Image): PIL Image object
+            image: GeneratedImage or PIL Image object
             format (str): Image format (PNG, JPEG, etc.)
             
         Returns:
             bytes: Image data as bytes
         """
+        if isinstance(image, GeneratedImage):
+            if image.mime_type == GeneratedImage.MIME_TYPES.get(format.upper()):
+                return image.data
+            image = image.image
+        
         buf = io.BytesIO()
         image.save(buf, format=format)
         return buf.getvalue()
     
     @staticmethod
-    def generate_filename(prompt: str, timestamp: Optional[float] = None) -> str:
+    def generate_filename(prompt: str, timestamp: Optional[float] = None, extension: str = "png") -> str:
         """
         Generate a filename for the image based on prompt and timestamp
         
         Args:
             prompt (str): The prompt used to generate the image
             timestamp (float, optional): Timestamp to use. Defaults to current time.
+            extension (str): File extension without the dot, e.g. GeneratedImage.extension
             
         Returns:
             str: Generated filename
@@ -207,7 +537,7 @@ class ALFImageGenerator:
         clean_prompt = "".join(c for c in prompt[:30] if c.isalnum() or c in (' ', '-', '_')).rstrip()
         clean_prompt = clean_prompt.replace(' ', '_').lower()
         
-        return f"alf_{clean_prompt}_{int(timestamp)}.png"
+        return f"alf_{clean_prompt}_{int(timestamp)}.{extension}"
     
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
@@ -224,4 +554,34 @@ class ALFImageGenerator:
             return False
         
         # Basic OpenAI API key format check (starts with sk-)
-        return api_key.startswith('sk-') and len(api_key) > 20
\ No newline at end of file
+        return api_key.startswith('sk-') and len(api_key) > 20
+
+class AsyncALFImageGenerator(ALFImageGenerator):
+    """ALFImageGenerator whose generation methods are coroutines
+    
+    For code already running on the shared GenerationEventLoop, such as
+    GenerationJobQueue.
+    """
+    
+    async def generate_images(self, prompt: str, has_reference_images: bool = False,
+                              n: Optional[int] = None, coalesce: bool = True,
+                              on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """Coroutine version of ALFImageGenerator.generate_images()"""
+        return await self._generate_images(prompt, has_reference_images, n, coalesce, on_partial)
+    
+    async def generate_images_with_reference_files(self, prompt: str, reference_images: list = None,
+                                                   n: Optional[int] = None,
+                                                   coalesce: bool = True,
+                                                   on_partial: Optional[Callable[[int, bytes], None]] = None) -> Tuple[List[GeneratedImage], str]:
+        """Coroutine version of ALFImageGenerator.generate_images_with_reference_files()"""
+        return await self._generate_images_with_reference_files(prompt, reference_images, n, coalesce, on_partial)
+    
+    async def generate_image(self, prompt: str, has_reference_images: bool = False) -> Tuple[Image.Image, str]:
+        """Coroutine version of ALFImageGenerator.generate_image()"""
+        images, enhanced_prompt = await self._generate_images(prompt, has_reference_images, 1)
+        return images[0].image, enhanced_prompt
+    
+    async def generate_image_with_reference_files(self, prompt: str, reference_images: list = None) -> Tuple[Image.Image, str]:
+        """Coroutine version of ALFImageGenerator.generate_image_with_reference_files()"""
+        images, enhanced_prompt = await self._generate_images_with_reference_files(prompt, reference_images, 1)
+        return images[0].image, enhanced_prompt
@@ -0,0 +1,333 @@
+"""
+Generation Job Queue for ALF Abstractor
+Queues image generations and runs them on a bounded number of concurrent API calls
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from config import ERROR_MESSAGES, GENERATION_CONFIG, OPENAI_CONFIG
+from services.generation_engine import GenerationEventLoop
+from services.image_generator import AsyncALFImageGenerator, ImageGenerationError
+from utils.generated_image import GeneratedImage
+from utils.reference_loader import ReferenceImageLoader
+
+class GenerationJob:
+    """One queued image generation and its outcome
+    
+    Jobs live in GenerationJobQueue, outside of any session, so a session only
+    keeps their IDs and can leave the page while they run.
+    """
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+    
+    def __init__(self, character: str, prompt: str, generation_prompt: str, reference_images: list,
+                 result_page: str, loading_message: str, variants: int = 1, coalesce: bool = True,
+                 tier: str = "final"):
+        """
+        Create a queued job
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS the generation is for
+            prompt (str): The user's prompt
+            generation_prompt (str): Character-enhanced prompt sent to the generator
+            reference_images (list): Reference images or ReferenceImage handles (may be empty)
+            result_page (str): Page that shows the result
+            loading_message (str): Message shown while the job is pending
+            variants (int): Number of variants to request in the one API call
+            coalesce (bool): Share the API call with an identical request already in flight
+            tier (str): Key of QUALITY_TIERS the generation is made with
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.character = character
+        self.prompt = prompt
+        self.generation_prompt = generation_prompt
+        self.reference_ids = [ReferenceImageLoader.get_content_hash(image) for image in reference_images]
+        self.tier = tier
+        tier_config = AsyncALFImageGenerator.get_tier_config(tier)
+        self.config = {key: tier_config.get(key) for key in ("model", "size", "quality")}
+        self.config["n"] = variants
+        self.coalesce = coalesce
+        self.result_page = result_page
+        self.loading_message = loading_message
+        
+        self.state = self.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.images: List[GeneratedImage] = []
+        self.enhanced_prompt: Optional[str] = None
+        self.error: Optional[str] = None
+        self.attempts: List[dict] = []  # RetryPolicy records of the API call
+        self.coalesced = False  # Whether the result came from an identical request's API call
+        self.from_cache = False  # Whether the result came from GenerationResultCache
+        self.preview: Optional[bytes] = None  # Latest streamed partial image while running
+        self.preview_index: Optional[int] = None
+        
+        # Only needed until the job ran (or, for drafts, until the final is rendered)
+        self._reference_images = list(reference_images)
+        self._generator: Optional[AsyncALFImageGenerator] = None
+        self._future: Optional[Future] = None
+    
+    @property
+    def is_draft(self) -> bool:
+        """Whether the job makes a quick draft that can be rendered final later"""
+        return self.tier == "draft"
+    
+    def make_final(self, loading_message: Optional[str] = None) -> "GenerationJob":
+        """
+        Create the job rendering this draft's prompt and references at the final tier
+        
+        Args:
+            loading_message (str, optional): Message shown while pending. Defaults to this job's.
+            
+        Returns:
+            GenerationJob: New queued single-image job for the "final" tier
+        """
+        return GenerationJob(
+            character=self.character,
+            prompt=self.prompt,
+            generation_prompt=self.generation_prompt,
+            reference_images=self._reference_images or [],
+            result_page=self.result_page,
+            loading_message=loading_message or self.loading_message,
+            coalesce=self.coalesce,
+            tier="final"
+        )
+    
+    @property
+    def image(self) -> Optional[GeneratedImage]:
+        """First generated variant, or None until the job is done"""
+        return self.images[0] if self.images else None
+    
+    def set_preview(self, index: int, data: bytes):
+        """
+        Keep the latest partial image streamed while the job runs
+        
+        Args:
+            index (int): Zero-based index of the partial image
+            data (bytes): Encoded partial image
+        """
+        self.preview_index = index
+        self.preview = data
+    
+    @property
+    def rate_limit_wait_seconds(self) -> float:
+        """Seconds the running job still waits for the API key's shared rate limit"""
+        generator = self._generator
+        until = generator.rate_limited_until if generator is not None else None
+        return max(0.0, until - time.time()) if until else 0.0
+    
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job is done, failed, cancelled or timed out"""
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED, self.TIMED_OUT)
+    
+    @property
+    def queue_seconds(self) -> float:
+        """Seconds the job waited for a free slot (so far, if still queued)"""
+        return (self.started_at or time.time()) - self.created_at
+    
+    @property
+    def run_seconds(self) -> float:
+        """Seconds the generation took (so far, if still running)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the job was queued until it finished or now"""
+        return (self.finished_at or time.time()) - self.created_at
+
+class GenerationJobQueue:
+    """Process-wide queue running generation jobs on the shared event loop
+    
+    At most GENERATION_CONFIG["max_concurrent_jobs"] jobs call the API at the
+    same time across all sessions; the others wait in submission order.
+    Finished jobs are kept for GENERATION_CONFIG["job_ttl_seconds"], up to
+    GENERATION_CONFIG["max_retained_jobs"] of them.
+    """
+    
+    _lock = threading.Lock()
+    _jobs: "OrderedDict[str, GenerationJob]" = OrderedDict()
+    _semaphore: Optional[asyncio.Semaphore] = None
+    
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """Get the semaphore capping concurrent jobs; only called on the event loop"""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(GENERATION_CONFIG["max_concurrent_jobs"])
+        return cls._semaphore
+    
+    @staticmethod
+    async def _generate(job: GenerationJob, generator: AsyncALFImageGenerator):
+        """Call the generator for a running job; returns (images, enhanced prompt)"""
+        if job._reference_images:
+            # Use the edit endpoint with the reference images for better fidelity
+            return await generator.generate_images_with_reference_files(
+                job.generation_prompt, job._reference_images, job.config["n"], job.coalesce,
+                job.set_preview
+            )
+        return await generator.generate_images(
+            job.generation_prompt, False, job.config["n"], job.coalesce, job.set_preview
+        )
+    
+    @classmethod
+    async def _run(cls, job: GenerationJob, generator: AsyncALFImageGenerator):
+        """Wait for a free slot, then run the job within its deadline and record its outcome"""
+        deadline = OPENAI_CONFIG["generation_deadline_seconds"]
+        try:
+            async with cls._get_semaphore():
+                job.started_at = time.time()
+                job.state = GenerationJob.RUNNING
+                job._generator = generator
+                try:
+                    images, enhanced_prompt = await asyncio.wait_for(cls._generate(job, generator), deadline)
+                    job.images = images
+                    job.enhanced_prompt = enhanced_prompt
+                    job.state = GenerationJob.DONE
+                except asyncio.TimeoutError:
+                    job.error = f"{ERROR_MESSAGES['TIMED_OUT']} no image after {deadline:.0f} seconds"
+                    job.state = GenerationJob.TIMED_OUT
+                except ImageGenerationError as e:
+                    job.error = str(e)
+                    job.state = GenerationJob.FAILED
+                except Exception as e:
+                    job.error = f"Unexpected error: {str(e)}"
+                    job.state = GenerationJob.FAILED
+                finally:
+                    job.finished_at = time.time()
+                    job.attempts = list(generator.attempts)
+                    job.coalesced = generator.coalesced
+                    job.from_cache = generator.from_cache
+                    if not (job.is_draft and job.state == GenerationJob.DONE):
+                        job._reference_images = None
+                    job._generator = None
+                    job.preview = None
+        except asyncio.CancelledError:
+            # Cancelled while queued or running; leaving the semaphore and rate limit freed their slots
+            cls._mark_cancelled(job)
+    
+    @staticmethod
+    def _mark_cancelled(job: GenerationJob):
+        """Record that a job was cancelled"""
+        job.error = ERROR_MESSAGES["CANCELLED"]
+        job.state = GenerationJob.CANCELLED
+        job.finished_at = job.finished_at or time.time()
+        job._reference_images = None
+        job._generator = None
+        job.preview = None
+    
+    @classmethod
+    def _prune(cls, now: float):
+        """Drop expired finished jobs and the oldest ones over the limit; callers hold the lock"""
+        finished = [job_id for job_id, job in cls._jobs.items() if job.is_finished]
+        excess = len(finished) - GENERATION_CONFIG["max_retained_jobs"]
+        for job_id in finished:
+            job = cls._jobs[job_id]
+            if excess > 0 or now - job.finished_at > GENERATION_CONFIG["job_ttl_seconds"]:
+                del cls._jobs[job_id]
+                excess -= 1
+    
+    @classmethod
+    def submit(cls, generator: AsyncALFImageGenerator, job: GenerationJob) -> str:
+        """
+        Queue a job for execution
+        
+        Args:
+            generator (AsyncALFImageGenerator): Generator bound to the user's API key
+            job (GenerationJob): Job to run
+            
+        Returns:
+            str: Job ID
+        """
+        with cls._lock:
+            cls._prune(time.time())
+            cls._jobs[job.job_id] = job
+        
+        job._future = GenerationEventLoop.submit(cls._run(job, generator))
+        
+        def on_done(future: Future):
+            # A job cancelled before it ever ran never reaches _run's handler
+            if future.cancelled() and job.state == GenerationJob.QUEUED:
+                cls._mark_cancelled(job)
+        
+        job._future.add_done_callback(on_done)
+        return job.job_id
+    
+    @classmethod
+    def cancel(cls, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+        
+        A running job's API request is aborted and its worker and rate limit
+        slots are freed (a call shared with identical requests keeps running
+        for them).
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            bool: True if the job was still pending and is being cancelled
+        """
+        job = cls.get(job_id)
+        if job is None or job.is_finished or job._future is None:
+            return False
+        return job._future.cancel()
+    
+    @classmethod
+    def get(cls, job_id: str) -> Optional[GenerationJob]:
+        """
+        Look up a job
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            Optional[GenerationJob]: The job, or None if unknown or expired
+        """
+        with cls._lock:
+            return cls._jobs.get(job_id)
+    
+    @classmethod
+    def get_jobs(cls, job_ids: List[str]) -> List[GenerationJob]:
+        """
+        Look up several jobs, skipping unknown or expired ones
+        
+        Args:
+            job_ids (List[str]): Job IDs
+            
+        Returns:
+            List[GenerationJob]: Jobs in the given order
+        """
+        with cls._lock:
+            return [cls._jobs[job_id] for job_id in job_ids if job_id in cls._jobs]
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        """
+        Count jobs per state
+        
+        Returns:
+            Dict[str, int]: Job count per state plus "max_concurrent"
+        """
+        with cls._lock:
+            stats = {state: 0 for state in (
+                GenerationJob.QUEUED, GenerationJob.RUNNING, GenerationJob.DONE,
+                GenerationJob.FAILED, GenerationJob.CANCELLED, GenerationJob.TIMED_OUT
+            )}
+            for job in cls._jobs.values():
+                stats[job.state] += 1
+        stats["max_concurrent"] = GENERATION_CONFIG["max_concurrent_jobs"]
+        return stats
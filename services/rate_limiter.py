@@ -0,0 +1,274 @@
+"""
+API Rate Limiter for ALF Abstractor
+Shares image-per-minute and concurrency limits per API key across all sessions
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from config import OPENAI_CONFIG
+from services.client_pool import OpenAIClientPool
+
+class KeyRateLimit:
+    """Token bucket plus concurrency cap for one API key
+    
+    Every request reserves one token per image it asks for. Reservations are
+    handed out in arrival order and may drive the bucket negative, so a later
+    caller always waits at least as long as an earlier one. A caller with its
+    tokens then waits for one of the concurrent request slots, which are also
+    granted first come, first served.
+    """
+    
+    def __init__(self, images_per_minute: float, burst: float, max_concurrent: int):
+        """
+        Create the limit for one API key
+        
+        Args:
+            images_per_minute (float): Sustained image rate
+            burst (float): Images that may be requested at once after a quiet period
+            max_concurrent (int): Requests allowed in flight at the same time
+        """
+        self.rate = images_per_minute / 60.0
+        self.burst = max(1.0, burst)
+        self.max_concurrent = max(1, max_concurrent)
+        
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._active = 0
+        self._waiters = deque()
+        self.stats = {"requests": 0, "images": 0, "delayed": 0, "waited_seconds": 0.0}
+    
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update; callers hold the lock"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def reserve(self, images: int) -> float:
+        """
+        Take the tokens for a request
+        
+        Args:
+            images (int): Images the request asks for
+            
+        Returns:
+            float: Seconds to wait before the request may be sent
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._refill(now)
+            self._tokens -= images
+            self.stats["requests"] += 1
+            self.stats["images"] += images
+            wait = max(0.0, -self._tokens / self.rate) if self.rate > 0 else 0.0
+            if wait > 0:
+                self.stats["delayed"] += 1
+                self.stats["waited_seconds"] += wait
+            return wait
+    
+    def refund(self, images: int):
+        """
+        Give back the tokens of a request that was never sent
+        
+        Args:
+            images (int): Images the request asked for
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.burst, self._tokens + images)
+    
+    def get_wait_estimate(self, images: int = 1) -> float:
+        """
+        Estimate how long a request made now would wait for tokens
+        
+        Args:
+            images (int): Images the request would ask for
+            
+        Returns:
+            float: Seconds (0 if it could be sent right away)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.rate <= 0:
+                return 0.0
+            return max(0.0, (images - self._tokens) / self.rate)
+    
+    def _try_acquire_slot(self, waiter) -> bool:
+        """Take a free slot, or queue the waiter behind earlier ones"""
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+    
+    def release_slot(self):
+        """Hand a finished request's slot to the longest waiting caller, or free it"""
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            waiter = self._waiters.popleft()
+        
+        # The slot moves to the waiter without ever becoming free, so nobody can jump the queue
+        loop, future = waiter
+        loop.call_soon_threadsafe(self._grant_future, future)
+    
+    def _grant_future(self, future: asyncio.Future):
+        """Wake an async waiter on its loop, passing the slot on if it gave up meanwhile"""
+        if future.cancelled():
+            self.release_slot()
+        else:
+            future.set_result(None)
+    
+    def _forget_waiter(self, waiter) -> bool:
+        """Remove a waiter that gave up; False if it was already granted a slot"""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return True
+            except ValueError:
+                return False
+    
+    async def acquire_slot_async(self):
+        """Wait on the running event loop until a concurrent request slot is free"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        if self._try_acquire_slot(waiter):
+            return
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Already granted but cancelled before running on: pass the slot on
+            if not self._forget_waiter(waiter) and future.done() and not future.cancelled():
+                self.release_slot()
+            raise
+    
+    def get_stats(self) -> dict:
+        """
+        Get the current state and counters of this limit
+        
+        Returns:
+            dict: Tokens left, active and queued requests plus request, image and wait counters
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            stats = dict(self.stats)
+            stats.update({
+                "tokens": self._tokens,
+                "active": self._active,
+                "waiting_for_slot": len(self._waiters)
+            })
+        return stats
+
+class APIRateLimiter:
+    """Process-wide rate limits keyed by a hash of the API key
+    
+    Sessions that share an API key share one KeyRateLimit, configured by
+    OPENAI_CONFIG["images_per_minute"], ["images_burst"] and
+    ["max_concurrent_requests"]. Every API call of ALFImageGenerator runs inside
+    limit_async(), so a burst of clicks queues up here instead of
+    stampeding the API into 429s.
+    """
+    
+    _lock = threading.Lock()
+    _limits: Dict[str, KeyRateLimit] = {}
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check whether calls are limited to an image rate
+        
+        The concurrency cap applies either way.
+        
+        Returns:
+            bool: True if an image rate is configured
+        """
+        return bool(OPENAI_CONFIG.get("images_per_minute"))
+    
+    @classmethod
+    def get_limit(cls, api_key: str) -> KeyRateLimit:
+        """
+        Get the shared limit for an API key, creating it on first use
+        
+        Args:
+            api_key (str): OpenAI API key
+            
+        Returns:
+            KeyRateLimit: Limit shared by every caller using this key
+        """
+        key_hash = OpenAIClientPool.get_key_hash(api_key)
+        with cls._lock:
+            limit = cls._limits.get(key_hash)
+            if limit is None:
+                limit = KeyRateLimit(
+                    OPENAI_CONFIG.get("images_per_minute") or 0,
+                    OPENAI_CONFIG.get("images_burst", 1),
+                    OPENAI_CONFIG["max_concurrent_requests"]
+                )
+                cls._limits[key_hash] = limit
+            return limit
+    
+    @classmethod
+    def get_wait_estimate(cls, api_key: str, images: int = 1) -> float:
+        """
+        Estimate how long a request made now would wait for the image rate
+        
+        Args:
+            api_key (str): OpenAI API key
+            images (int): Images the request would ask for
+            
+        Returns:
+            float: Seconds (0 if it could be sent right away or limiting is off)
+        """
+        if not cls.is_enabled():
+            return 0.0
+        return cls.get_limit(api_key).get_wait_estimate(images)
+    
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def limit_async(cls, api_key: str, images: int, on_wait: Optional[Callable[[float], None]] = None):
+        """
+        Hold a rate-limited request slot for an async API call
+        
+        Tokens are only reserved while an image rate is configured; the
+        concurrent request slots are always taken.
+        
+        Args:
+            api_key (str): OpenAI API key the call is made with
+            images (int): Images the call asks for
+            on_wait (Callable[[float], None], optional): Told the seconds to wait for the image rate
+        """
+        limit = cls.get_limit(api_key)
+        reserved = images if cls.is_enabled() else 0
+        wait = limit.reserve(reserved) if reserved else 0.0
+        if on_wait is not None:
+            on_wait(wait)
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await limit.acquire_slot_async()
+        except asyncio.CancelledError:
+            limit.refund(reserved)
+            raise
+        try:
+            yield
+        finally:
+            limit.release_slot()
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, dict]:
+        """
+        Get the state of every key's limit
+        
+        Returns:
+            Dict[str, dict]: KeyRateLimit.get_stats() per API key hash prefix
+        """
+        with cls._lock:
+            limits = dict(cls._limits)
+        return {key_hash[:12]: limit.get_stats() for key_hash, limit in limits.items()}
@@ -0,0 +1,245 @@
+"""
+Generation Result Cache for ALF Abstractor
+Keeps generated images on disk so identical requests skip the paid API call
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from config import RESULT_CACHE_CONFIG
+
+class GenerationResultCache:
+    """Process-wide, size-bounded cache of generated images on disk
+    
+    Each entry is a metadata file "<key>.json" plus the returned image bytes as
+    "<key>.<index>.<format>" (png, jpeg or webp, as requested from the API),
+    keyed by the generator's request key. Entries older than
+    RESULT_CACHE_CONFIG["ttl_seconds"] are never served, and the least
+    recently used entries are removed once the folder holds more than
+    RESULT_CACHE_CONFIG["max_bytes"]. Expired entries are deleted whenever
+    the cache is trimmed. The index is rebuilt from the folder on first use,
+    using the metadata file's mtime as the last access time.
+    
+    Request keys include the API key, so a result is only ever served to
+    callers using the key it was generated with.
+    """
+    
+    _lock = threading.Lock()
+    _index: Optional["OrderedDict[str, dict]"] = None
+    _total_bytes = 0
+    _stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check whether generation results are cached
+        
+        Returns:
+            bool: True if the cache is switched on
+        """
+        return RESULT_CACHE_CONFIG["enabled"]
+    
+    @staticmethod
+    def get_folder() -> str:
+        """
+        Get the cache folder
+        
+        Returns:
+            str: Absolute path of the configured folder
+        """
+        folder = RESULT_CACHE_CONFIG["folder"]
+        if os.path.isabs(folder):
+            return folder
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(project_dir, folder)
+    
+    @classmethod
+    def _get_paths(cls, key: str, count: int, output_format: str = "png") -> List[str]:
+        """Get the metadata path followed by the image paths of an entry"""
+        folder = cls.get_folder()
+        return [os.path.join(folder, f"{key}.json")] + [
+            os.path.join(folder, f"{key}.{index}.{output_format}") for index in range(count)
+        ]
+    
+    @classmethod
+    def _load_index(cls) -> "OrderedDict[str, dict]":
+        """Build the index from the cache folder on first use; callers hold the lock"""
+        if cls._index is not None:
+            return cls._index
+        
+        entries = []
+        folder = cls.get_folder()
+        if os.path.isdir(folder):
+            for filename in os.listdir(folder):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(folder, filename), 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                    last_used = os.path.getmtime(os.path.join(folder, filename))
+                except (OSError, ValueError):
+                    continue
+                entries.append((last_used, filename[:-len(".json")], meta))
+        
+        cls._index = OrderedDict()
+        cls._total_bytes = 0
+        for last_used, key, meta in sorted(entries, key=lambda entry: entry[0]):
+            cls._index[key] = {"created_at": meta["created_at"], "count": meta["count"], "bytes": meta["bytes"],
+                               "output_format": meta.get("output_format", "png")}
+            cls._total_bytes += meta["bytes"]
+        cls._evict()
+        return cls._index
+    
+    @classmethod
+    def _remove(cls, key: str):
+        """Delete an entry's files and forget it; callers hold the lock"""
+        entry = cls._index.pop(key, None)
+        if entry is None:
+            return
+        cls._total_bytes -= entry["bytes"]
+        for path in cls._get_paths(key, entry["count"], entry["output_format"]):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _is_expired(entry: dict, now: float) -> bool:
+        """Check whether an entry is too old to be served"""
+        return now - entry["created_at"] > RESULT_CACHE_CONFIG["ttl_seconds"]
+    
+    @classmethod
+    def _evict(cls):
+        """Remove expired entries, then least recently used ones until the folder fits; callers hold the lock"""
+        now = time.time()
+        for key in [key for key, entry in cls._index.items() if cls._is_expired(entry, now)]:
+            cls._remove(key)
+            cls._stats["expired"] += 1
+        while cls._index and cls._total_bytes > RESULT_CACHE_CONFIG["max_bytes"]:
+            cls._remove(next(iter(cls._index)))
+            cls._stats["evictions"] += 1
+    
+    @classmethod
+    def get(cls, key: str) -> Optional[List[bytes]]:
+        """
+        Look up the images of an earlier identical request
+        
+        Args:
+            key (str): Request key
+            
+        Returns:
+            Optional[List[bytes]]: Encoded images in response order, or None on a miss
+        """
+        with cls._lock:
+            index = cls._load_index()
+            entry = index.get(key)
+            if entry is not None and cls._is_expired(entry, time.time()):
+                cls._remove(key)
+                cls._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                cls._stats["misses"] += 1
+                return None
+            
+            paths = cls._get_paths(key, entry["count"], entry["output_format"])
+            try:
+                images = []
+                for path in paths[1:]:
+                    with open(path, 'rb') as f:
+                        images.append(f.read())
+                os.utime(paths[0])
+            except OSError:
+                # Removed behind our back (or by another process): treat as a miss
+                cls._remove(key)
+                cls._stats["misses"] += 1
+                return None
+            
+            index.move_to_end(key)
+            cls._stats["hits"] += 1
+            return images
+    
+    @classmethod
+    def contains(cls, key: str) -> bool:
+        """
+        Check whether an unexpired entry is stored, without counting a lookup
+        
+        Args:
+            key (str): Request key
+            
+        Returns:
+            bool: True if get() would find the entry
+        """
+        with cls._lock:
+            entry = cls._load_index().get(key)
+            return entry is not None and not cls._is_expired(entry, time.time())
+    
+    @classmethod
+    def put(cls, key: str, images: List[bytes], meta: Optional[dict] = None):
+        """
+        Store the images of a request
+        
+        Failing to write (e.g. read-only or full disk) only means the result is
+        not cached.
+        
+        Args:
+            key (str): Request key
+            images (List[bytes]): Encoded images in response order
+            meta (dict, optional): Extra details stored with the entry (prompt, parameters)
+        """
+        if not images:
+            return
+        
+        size = sum(len(data) for data in images)
+        record = dict(meta or {})
+        record.update({"created_at": time.time(), "count": len(images), "bytes": size})
+        record.setdefault("output_format", "png")
+        paths = cls._get_paths(key, len(images), record["output_format"])
+        
+        with cls._lock:
+            cls._load_index()
+            cls._remove(key)
+            try:
+                os.makedirs(cls.get_folder(), exist_ok=True)
+                # Images first and metadata last, so a half-written entry is never indexed on restart
+                for path, data in zip(paths[1:] + paths[:1], images + [json.dumps(record).encode('utf-8')]):
+                    temp_path = f"{path}.tmp"
+                    with open(temp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(temp_path, path)
+            except OSError:
+                return
+            
+            cls._index[key] = {"created_at": record["created_at"], "count": record["count"], "bytes": size,
+                               "output_format": record["output_format"]}
+            cls._total_bytes += size
+            cls._stats["stores"] += 1
+            cls._evict()
+    
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Get hit and miss counters and the current size
+        
+        Returns:
+            dict: hits, misses, stores, evictions, expired, entries, bytes and hit_rate
+        """
+        with cls._lock:
+            index = cls._load_index()
+            stats = dict(cls._stats)
+            stats["entries"] = len(index)
+            stats["bytes"] = cls._total_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    @classmethod
+    def clear(cls):
+        """Delete every cached entry"""
+        with cls._lock:
+            cls._load_index()
+            for key in list(cls._index):
+                cls._remove(key)
@@ -0,0 +1,260 @@
+"""
+Retry Policy for ALF Abstractor
+Retries transient image API failures with decorrelated-jitter backoff
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+import openai
+from typing import Any, Callable, Dict, List, Optional
+
+from config import OPENAI_CONFIG, RETRY_CONFIG
+
+class RetryMetrics:
+    """Process-wide counters of image API attempts and their outcomes"""
+    
+    _lock = threading.Lock()
+    _stats = {"calls": 0, "attempts": 0, "retries": 0, "succeeded": 0, "gave_up": 0, "not_retryable": 0}
+    _outcomes: Dict[str, int] = {}
+    _attempt_seconds = 0.0
+    _backoff_seconds = 0.0
+    
+    @classmethod
+    def record_attempt(cls, attempt: dict):
+        """
+        Count one finished attempt
+        
+        Args:
+            attempt (dict): Attempt record built by RetryPolicy
+        """
+        with cls._lock:
+            cls._stats["attempts"] += 1
+            if attempt["attempt"] == 1:
+                cls._stats["calls"] += 1
+            else:
+                cls._stats["retries"] += 1
+            cls._outcomes[attempt["outcome"]] = cls._outcomes.get(attempt["outcome"], 0) + 1
+            cls._attempt_seconds += attempt["duration_seconds"]
+            cls._backoff_seconds += attempt["delay_seconds"]
+    
+    @classmethod
+    def record_result(cls, result: str):
+        """
+        Count how a call ended
+        
+        Args:
+            result (str): "succeeded", "gave_up" or "not_retryable"
+        """
+        with cls._lock:
+            cls._stats[result] += 1
+    
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Get the attempt and outcome counters
+        
+        Returns:
+            dict: Call and attempt counts, attempts per outcome and total attempt and backoff seconds
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats["outcomes"] = dict(cls._outcomes)
+            stats["attempt_seconds"] = cls._attempt_seconds
+            stats["backoff_seconds"] = cls._backoff_seconds
+        return stats
+    
+    @classmethod
+    def reset(cls):
+        """Reset all counters"""
+        with cls._lock:
+            cls._stats = {key: 0 for key in cls._stats}
+            cls._outcomes = {}
+            cls._attempt_seconds = 0.0
+            cls._backoff_seconds = 0.0
+
+class RetryPolicy:
+    """Decides whether and when a failed image API call is attempted again
+    
+    Connection errors, timeouts and the status codes in
+    RETRY_CONFIG["retryable_status_codes"] are retried; everything else
+    (bad requests, auth, content policy, exhausted quota) fails right away.
+    Backoff is decorrelated jitter between base_delay_seconds and three times
+    the previous delay, but never shorter than the server's Retry-After hint.
+    No attempt is started or waited for past the overall deadline
+    (OPENAI_CONFIG["generation_deadline_seconds"] unless given), and each
+    attempt times out after OPENAI_CONFIG["request_timeout_seconds"] at most.
+    """
+    
+    def __init__(self, config: Optional[dict] = None, deadline_seconds: Optional[float] = None):
+        """
+        Create a policy
+        
+        Args:
+            config (dict, optional): Settings like RETRY_CONFIG. Defaults to RETRY_CONFIG.
+            deadline_seconds (float, optional): Overall deadline per call. Defaults to
+                OPENAI_CONFIG["generation_deadline_seconds"].
+        """
+        self.config = config or RETRY_CONFIG
+        self.deadline_seconds = deadline_seconds or OPENAI_CONFIG["generation_deadline_seconds"]
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether an error is transient
+        
+        Args:
+            error (Exception): Error raised by the API call
+            
+        Returns:
+            bool: True if the same request may succeed when sent again
+        """
+        if isinstance(error, openai.APIConnectionError):
+            # Includes APITimeoutError
+            return True
+        if isinstance(error, openai.APIStatusError):
+            if getattr(error, "code", None) in self.config["non_retryable_error_codes"]:
+                return False
+            return error.status_code in self.config["retryable_status_codes"]
+        return False
+    
+    @staticmethod
+    def get_retry_after(error: Exception) -> Optional[float]:
+        """
+        Read the server's Retry-After hint from an API error
+        
+        Args:
+            error (Exception): Error raised by the API call
+            
+        Returns:
+            Optional[float]: Seconds to wait, or None if the response carries no hint
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        headers = response.headers
+        
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return max(0.0, float(retry_after_ms) / 1000)
+            except ValueError:
+                pass
+        
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+    
+    def get_backoff(self, previous_delay: float) -> float:
+        """
+        Pick the next decorrelated-jitter delay
+        
+        Args:
+            previous_delay (float): Delay before the previous attempt (0 for the first retry)
+            
+        Returns:
+            float: Seconds to wait
+        """
+        base = self.config["base_delay_seconds"]
+        upper = max(base, previous_delay * 3)
+        return min(self.config["max_delay_seconds"], random.uniform(base, upper))
+    
+    @staticmethod
+    def _describe(error: Optional[Exception]) -> str:
+        """Name the outcome of an attempt for metrics"""
+        if error is None:
+            return "ok"
+        if isinstance(error, openai.APIStatusError):
+            return str(error.status_code)
+        return type(error).__name__
+    
+    def _next_delay(self, error: Exception, attempt: int, previous_delay: float,
+                    started: float) -> Optional[float]:
+        """
+        Decide how long to wait before the next attempt
+        
+        Returns:
+            Optional[float]: Seconds to wait, or None to give up
+        """
+        if not self.is_retryable(error) or attempt >= self.config["max_attempts"]:
+            return None
+        
+        delay = self.get_backoff(previous_delay)
+        retry_after = self.get_retry_after(error)
+        if retry_after is not None:
+            if retry_after > self.config["retry_after_cap_seconds"]:
+                return None
+            delay = max(delay, retry_after)
+        
+        if time.monotonic() - started + delay >= self.deadline_seconds:
+            return None
+        return delay
+    
+    def _finish_attempt(self, attempts: List[dict], attempt: int, attempt_started: float,
+                        error: Optional[Exception], delay: Optional[float]) -> dict:
+        """Record one attempt in the call's list and the process-wide metrics"""
+        record = {
+            "attempt": attempt,
+            "duration_seconds": time.monotonic() - attempt_started,
+            "outcome": self._describe(error),
+            "retryable": error is not None and self.is_retryable(error),
+            "delay_seconds": delay or 0.0
+        }
+        attempts.append(record)
+        RetryMetrics.record_attempt(record)
+        
+        if error is None:
+            RetryMetrics.record_result("succeeded")
+        elif delay is None:
+            RetryMetrics.record_result("gave_up" if record["retryable"] else "not_retryable")
+        return record
+    
+    def _get_timeout(self, started: float) -> float:
+        """Timeout of an attempt: the request timeout, cut short by the deadline"""
+        remaining = self.deadline_seconds - (time.monotonic() - started)
+        return max(1.0, min(OPENAI_CONFIG["request_timeout_seconds"], remaining))
+    
+    async def call_async(self, func: Callable, *args, attempts: Optional[List[dict]] = None, **kwargs) -> Any:
+        """
+        Await an async API method, retrying transient failures
+        
+        Args:
+            func (Callable): Async client method such as client.images.generate
+            *args: Positional arguments for func
+            attempts (List[dict], optional): List that receives one record per attempt
+            **kwargs: Keyword arguments for func (a per-attempt timeout is added)
+            
+        Returns:
+            Any: What func returned
+            
+        Raises:
+            Exception: The last error if it was not retryable or retries ran out
+        """
+        attempts = attempts if attempts is not None else []
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started = time.monotonic()
+            try:
+                result = await func(*args, timeout=self._get_timeout(started), **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, attempt, delay, started)
+                self._finish_attempt(attempts, attempt, attempt_started, e, delay)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._finish_attempt(attempts, attempt, attempt_started, None, None)
+            return result
@@ -0,0 +1,98 @@
+"""
+Single-Flight Request Coalescing for ALF Abstractor
+Lets identical image requests that run at the same time share one API call
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+class GenerationSingleFlight:
+    """Process-wide registry of image API calls currently in flight
+    
+    The first caller with a given request key makes the call; callers with the
+    same key arriving before it finishes wait for and share its outcome,
+    including its error. The key is removed as soon as the call finishes, so
+    later requests always make a fresh call.
+    
+    Calls run as tasks on the calling event loop. Waiters can be
+    cancelled on their own; the shared call is only cancelled once nobody is
+    waiting for it anymore.
+    """
+    
+    _lock = threading.Lock()
+    _tasks: Dict[str, dict] = {}
+    _stats = {"calls": 0, "coalesced": 0}
+    
+    @classmethod
+    def is_in_flight(cls, key: str) -> bool:
+        """
+        Check whether a call with this key is running
+        
+        Args:
+            key (str): Request key
+            
+        Returns:
+            bool: True if a new caller would join a running call
+        """
+        with cls._lock:
+            return key in cls._tasks
+    
+    @classmethod
+    async def call_async(cls, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an async call, or wait for the identical one already running
+        
+        Args:
+            key (str): Request key
+            func (Callable[[], Awaitable[Any]]): Makes the call when awaited
+            
+        Returns:
+            Any: What the shared call returned
+            
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with cls._lock:
+            entry = cls._tasks.get(key)
+            if entry is None:
+                task = asyncio.get_running_loop().create_task(func())
+                entry = {"task": task, "waiters": 0}
+                cls._tasks[key] = entry
+                cls._stats["calls"] += 1
+                task.add_done_callback(lambda _: cls._forget_task(key, entry))
+            else:
+                cls._stats["coalesced"] += 1
+            entry["waiters"] += 1
+        
+        try:
+            return await asyncio.shield(entry["task"])
+        except asyncio.CancelledError:
+            with cls._lock:
+                entry["waiters"] -= 1
+                abandoned = entry["waiters"] == 0
+                if abandoned and cls._tasks.get(key) is entry:
+                    del cls._tasks[key]
+            if abandoned:
+                entry["task"].cancel()
+            raise
+    
+    @classmethod
+    def _forget_task(cls, key: str, entry: dict):
+        """Drop a finished async call so the next request starts a new one"""
+        with cls._lock:
+            if cls._tasks.get(key) is entry:
+                del cls._tasks[key]
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, int]:
+        """
+        Get how many calls were made and how many requests joined one
+        
+        Returns:
+            Dict[str, int]: "calls", "coalesced" and "in_flight"
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats["in_flight"] = len(cls._tasks)
+        return stats
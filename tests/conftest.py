@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the ALF Abstractor tests
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """Stand-in for the time module (and asyncio.sleep) that only moves when told to"""
+    
+    def __init__(self, start: float = 1000.0):
+        """
+        Create a stopped clock
+        
+        Args:
+            start (float): Initial reading of both monotonic() and time()
+        """
+        self.now = start
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        """Get the current reading"""
+        return self.now
+    
+    def time(self) -> float:
+        """Get the current reading"""
+        return self.now
+    
+    def advance(self, seconds: float):
+        """Move the clock forward"""
+        self.now += seconds
+    
+    async def sleep(self, seconds: float):
+        """Record the wait and move the clock forward instead of waiting"""
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A stopped clock; install it with monkeypatch.setattr(module, "time", clock)"""
+    return FakeClock()
@@ -0,0 +1,145 @@
+"""
+Tests for services.circuit_breaker
+"""
+
+import contextlib
+import types
+
+import openai
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitOpenError, EndpointCircuitBreaker
+
+CONFIG = {
+    "enabled": True,
+    "window_seconds": 60,
+    "min_calls": 4,
+    "failure_rate_threshold": 0.5,
+    "slow_call_seconds": 10,
+    "slow_call_rate_threshold": 0.75,
+    "open_seconds": 30,
+    "half_open_max_calls": 1
+}
+
+def status_error(status_code: int) -> openai.APIStatusError:
+    """Build an API error without a real HTTP response"""
+    response = types.SimpleNamespace(status_code=status_code, headers={}, request=None)
+    return openai.APIStatusError(f"Error code: {status_code}", response=response, body=None)
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    """Run the breaker on the fake clock"""
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+
+@pytest.fixture
+def breaker() -> EndpointCircuitBreaker:
+    """A closed breaker with the test settings"""
+    return EndpointCircuitBreaker("images.generate", CONFIG)
+
+def call(breaker: EndpointCircuitBreaker, clock, error: Exception = None, seconds: float = 1.0):
+    """Send one call through the breaker that takes seconds and then raises error, if any"""
+    with pytest.raises(type(error)) if error is not None else contextlib.nullcontext():
+        with breaker.guard() as mark_sent:
+            mark_sent()
+            clock.advance(seconds)
+            if error is not None:
+                raise error
+
+def open_circuit(breaker: EndpointCircuitBreaker, clock):
+    """Fail enough calls to open the circuit"""
+    for _ in range(CONFIG["min_calls"]):
+        call(breaker, clock, status_error(503))
+    assert breaker.get_state() == EndpointCircuitBreaker.OPEN
+
+def test_opens_once_the_failure_rate_is_reached(breaker, clock):
+    for error in (None, status_error(500), None):
+        call(breaker, clock, error)
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
+    
+    call(breaker, clock, openai.APIConnectionError(request=None))
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        call(breaker, clock)
+    assert raised.value.retry_in == CONFIG["open_seconds"]
+    assert breaker.get_stats()["rejected"] == 1
+
+def test_rate_limits_and_client_errors_are_not_failures(breaker, clock):
+    for _ in range(CONFIG["min_calls"]):
+        call(breaker, clock, status_error(429))
+    for _ in range(CONFIG["min_calls"]):
+        call(breaker, clock, status_error(400))
+    
+    stats = breaker.get_stats()
+    assert stats["state"] == EndpointCircuitBreaker.CLOSED
+    assert stats["failures"] == 0
+
+def test_old_failures_leave_the_window(breaker, clock):
+    for _ in range(CONFIG["min_calls"] - 1):
+        call(breaker, clock, status_error(503))
+    clock.advance(CONFIG["window_seconds"] + 1)
+    
+    call(breaker, clock, status_error(503))
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
+    assert breaker.get_stats()["window_calls"] == 1
+
+def test_opens_on_slow_calls(breaker, clock):
+    for _ in range(CONFIG["min_calls"]):
+        call(breaker, clock, seconds=CONFIG["slow_call_seconds"] + 1)
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.OPEN
+    assert breaker.get_stats()["slow_calls"] == CONFIG["min_calls"]
+
+def test_time_before_the_call_is_sent_is_not_latency(breaker, clock):
+    for _ in range(CONFIG["min_calls"]):
+        with breaker.guard() as mark_sent:
+            clock.advance(CONFIG["slow_call_seconds"] * 2)
+            mark_sent()
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
+
+def test_successful_probe_closes_the_circuit(breaker, clock):
+    open_circuit(breaker, clock)
+    clock.advance(CONFIG["open_seconds"])
+    assert breaker.get_state() == EndpointCircuitBreaker.HALF_OPEN
+    
+    call(breaker, clock)
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
+    assert breaker.get_stats()["closed"] == 1
+
+def test_failed_probe_reopens_the_circuit(breaker, clock):
+    open_circuit(breaker, clock)
+    clock.advance(CONFIG["open_seconds"])
+    
+    call(breaker, clock, status_error(502))
+    
+    stats = breaker.get_stats()
+    assert stats["state"] == EndpointCircuitBreaker.OPEN
+    assert stats["opened"] == 2
+    assert stats["retry_in_seconds"] == CONFIG["open_seconds"]
+
+def test_only_one_probe_at_a_time(breaker, clock):
+    open_circuit(breaker, clock)
+    clock.advance(CONFIG["open_seconds"])
+    
+    with breaker.guard() as mark_sent:
+        mark_sent()
+        with pytest.raises(CircuitOpenError):
+            call(breaker, clock)
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
+
+def test_probe_never_sent_frees_its_slot(breaker, clock):
+    open_circuit(breaker, clock)
+    clock.advance(CONFIG["open_seconds"])
+    
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+    
+    assert breaker.get_state() == EndpointCircuitBreaker.HALF_OPEN
+    call(breaker, clock)
+    assert breaker.get_state() == EndpointCircuitBreaker.CLOSED
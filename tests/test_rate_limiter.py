@@ -0,0 +1,120 @@
+"""
+Tests for services.rate_limiter
+"""
+
+import asyncio
+
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import APIRateLimiter, KeyRateLimit
+
+API_KEY = "sk-" + "t" * 40
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    """Run the limits on the fake clock, with fresh per-key limits"""
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(APIRateLimiter, "_limits", {})
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Configure the shared limits: 60 images per minute, a burst of 2 and 2 requests at once"""
+    monkeypatch.setitem(rate_limiter.OPENAI_CONFIG, "images_per_minute", 60)
+    monkeypatch.setitem(rate_limiter.OPENAI_CONFIG, "images_burst", 2)
+    monkeypatch.setitem(rate_limiter.OPENAI_CONFIG, "max_concurrent_requests", 2)
+
+def test_reservations_wait_in_arrival_order(clock):
+    limit = KeyRateLimit(60, 2, 4)
+    
+    assert [limit.reserve(1) for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    assert limit.get_stats()["delayed"] == 2
+
+def test_tokens_refill_with_time(clock):
+    limit = KeyRateLimit(60, 2, 4)
+    limit.reserve(2)
+    
+    assert limit.get_wait_estimate(1) == 1.0
+    clock.advance(1.5)
+    assert limit.get_wait_estimate(1) == 0.0
+    clock.advance(60)
+    assert limit.get_stats()["tokens"] == 2
+
+def test_refund_never_exceeds_the_burst(clock):
+    limit = KeyRateLimit(60, 2, 4)
+    limit.reserve(1)
+    limit.refund(5)
+    
+    assert limit.get_stats()["tokens"] == 2
+
+def test_cancelled_wait_refunds_its_tokens(clock, limits):
+    waits = []
+    
+    async def main():
+        async with APIRateLimiter.limit_async(API_KEY, 2):
+            pass
+        # The bucket is empty, so this one waits a real 3s unless cancelled
+        task = asyncio.create_task(_hold(API_KEY, 3, waits.append))
+        await asyncio.sleep(0)
+        assert APIRateLimiter.get_limit(API_KEY).get_stats()["tokens"] == -3
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(main())
+    
+    assert waits == [3.0]
+    assert APIRateLimiter.get_limit(API_KEY).get_stats()["tokens"] == 0
+
+def test_concurrent_requests_are_capped(clock, limits):
+    assert _peak_concurrency(6) == 2
+
+def test_concurrency_cap_applies_without_an_image_rate(clock, limits, monkeypatch):
+    monkeypatch.setitem(rate_limiter.OPENAI_CONFIG, "images_per_minute", 0)
+    
+    assert _peak_concurrency(6) == 2
+    assert APIRateLimiter.get_limit(API_KEY).get_stats()["images"] == 0
+    assert APIRateLimiter.get_wait_estimate(API_KEY, 10) == 0.0
+
+def test_cancelled_slot_waiter_passes_the_slot_on(clock, limits, monkeypatch):
+    monkeypatch.setitem(rate_limiter.OPENAI_CONFIG, "images_per_minute", 0)
+    
+    async def main():
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold(API_KEY, 1, release=release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(API_KEY, 1))
+        last = asyncio.create_task(_hold(API_KEY, 1))
+        await asyncio.sleep(0)
+        assert APIRateLimiter.get_limit(API_KEY).get_stats()["waiting_for_slot"] == 2
+        waiter.cancel()
+        release.set()
+        await asyncio.gather(*holders, last)
+    
+    asyncio.run(main())
+    
+    stats = APIRateLimiter.get_limit(API_KEY).get_stats()
+    assert (stats["active"], stats["waiting_for_slot"]) == (0, 0)
+
+async def _hold(api_key: str, images: int, on_wait=None, release: asyncio.Event = None):
+    """Take a limited slot and keep it until release is set"""
+    async with APIRateLimiter.limit_async(api_key, images, on_wait):
+        if release is not None:
+            await release.wait()
+
+def _peak_concurrency(requests: int) -> int:
+    """Run requests that each hold a slot briefly and return how many ran at once"""
+    running = {"now": 0, "peak": 0}
+    
+    async def request():
+        async with APIRateLimiter.limit_async(API_KEY, 0):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+    
+    async def main():
+        await asyncio.gather(*(request() for _ in range(requests)))
+    
+    asyncio.run(main())
+    return running["peak"]
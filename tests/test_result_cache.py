@@ -0,0 +1,105 @@
+"""
+Tests for services.result_cache
+"""
+
+import os
+
+import pytest
+
+from services import result_cache
+from services.result_cache import GenerationResultCache
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch, clock, tmp_path):
+    """An empty cache in a temporary folder on the fake clock: 100 bytes, kept for 60s"""
+    monkeypatch.setattr(result_cache, "time", clock)
+    monkeypatch.setitem(result_cache.RESULT_CACHE_CONFIG, "enabled", True)
+    monkeypatch.setitem(result_cache.RESULT_CACHE_CONFIG, "folder", str(tmp_path))
+    monkeypatch.setitem(result_cache.RESULT_CACHE_CONFIG, "max_bytes", 100)
+    monkeypatch.setitem(result_cache.RESULT_CACHE_CONFIG, "ttl_seconds", 60)
+    monkeypatch.setattr(GenerationResultCache, "_index", None)
+    monkeypatch.setattr(GenerationResultCache, "_total_bytes", 0)
+    monkeypatch.setattr(GenerationResultCache, "_stats", dict.fromkeys(GenerationResultCache._stats, 0))
+
+def restart():
+    """Forget the in-memory index, as a new process would"""
+    GenerationResultCache._index = None
+
+def test_round_trip_keeps_images_in_order():
+    GenerationResultCache.put("key", [b"first", b"second"], {"output_format": "webp"})
+    
+    assert GenerationResultCache.get("key") == [b"first", b"second"]
+    assert GenerationResultCache.get("other") is None
+    stats = GenerationResultCache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 11)
+
+def test_eviction_respects_max_bytes():
+    for key in ("a", "b", "c"):
+        GenerationResultCache.put(key, [b"x" * 40])
+    stats = GenerationResultCache.get_stats()
+    
+    assert stats["bytes"] <= 100
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+    assert GenerationResultCache.get("a") is None
+    assert GenerationResultCache.get("c") is not None
+
+def test_eviction_removes_the_least_recently_used_entry():
+    GenerationResultCache.put("a", [b"x" * 40])
+    GenerationResultCache.put("b", [b"x" * 40])
+    GenerationResultCache.get("a")
+    
+    GenerationResultCache.put("c", [b"x" * 40])
+    
+    assert GenerationResultCache.contains("a")
+    assert not GenerationResultCache.contains("b")
+
+def test_expired_entries_are_not_served(clock):
+    GenerationResultCache.put("key", [b"image"])
+    clock.advance(61)
+    
+    assert not GenerationResultCache.contains("key")
+    assert GenerationResultCache.get("key") is None
+    assert GenerationResultCache.get_stats()["expired"] == 1
+
+def test_expired_entries_are_deleted_when_storing(clock, tmp_path):
+    GenerationResultCache.put("old", [b"image"])
+    clock.advance(61)
+    
+    GenerationResultCache.put("new", [b"image"])
+    
+    assert GenerationResultCache.get_stats()["expired"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["new.0.png", "new.json"]
+
+def test_index_is_rebuilt_from_the_folder(tmp_path):
+    GenerationResultCache.put("key", [b"first", b"second"], {"output_format": "jpeg"})
+    # A half-written entry has no metadata file and is never indexed
+    (tmp_path / "partial.0.png").write_bytes(b"image")
+    restart()
+    
+    assert GenerationResultCache.get("key") == [b"first", b"second"]
+    stats = GenerationResultCache.get_stats()
+    assert (stats["entries"], stats["bytes"]) == (1, 11)
+
+def test_expired_entries_are_deleted_when_loading_the_folder(clock, tmp_path):
+    GenerationResultCache.put("key", [b"image"])
+    clock.advance(61)
+    restart()
+    
+    assert GenerationResultCache.get_stats()["entries"] == 0
+    assert os.listdir(tmp_path) == []
+
+def test_missing_files_count_as_a_miss(tmp_path):
+    GenerationResultCache.put("key", [b"image"])
+    os.remove(tmp_path / "key.0.png")
+    
+    assert GenerationResultCache.get("key") is None
+    assert not GenerationResultCache.contains("key")
+
+def test_clear_deletes_every_entry(tmp_path):
+    GenerationResultCache.put("a", [b"image"])
+    GenerationResultCache.put("b", [b"image"])
+    
+    GenerationResultCache.clear()
+    
+    assert GenerationResultCache.get_stats()["entries"] == 0
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,105 @@
+"""
+Tests for services.retry_policy
+"""
+
+import asyncio
+import types
+
+import openai
+import pytest
+
+from services import retry_policy
+from services.retry_policy import RetryPolicy
+
+CONFIG = {
+    "max_attempts": 10,
+    "base_delay_seconds": 4.0,
+    "max_delay_seconds": 4.0,
+    "retry_after_cap_seconds": 60.0,
+    "retryable_status_codes": [429, 500, 503],
+    "non_retryable_error_codes": ["insufficient_quota"]
+}
+
+def status_error(status_code: int, headers: dict = None, code: str = None) -> openai.APIStatusError:
+    """Build an API error without a real HTTP response"""
+    response = types.SimpleNamespace(status_code=status_code, headers=headers or {}, request=None)
+    error = openai.APIStatusError(f"Error code: {status_code}", response=response, body=None)
+    error.code = code
+    return error
+
+@pytest.fixture(autouse=True)
+def fake_time(monkeypatch, clock):
+    """Run the policy on the fake clock, with sleeps that only advance it"""
+    monkeypatch.setattr(retry_policy, "time", clock)
+    monkeypatch.setattr(retry_policy, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+
+def failing_call(clock, errors, attempt_seconds: float = 1.0):
+    """Make an async API stand-in that takes attempt_seconds and raises errors in turn, then returns "ok" """
+    calls = []
+    
+    async def call(timeout=None):
+        calls.append({"at": clock.now, "timeout": timeout})
+        clock.advance(attempt_seconds)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+    
+    return call, calls
+
+def test_retries_transient_errors_until_success(clock):
+    call, calls = failing_call(clock, [openai.APIConnectionError(request=None), status_error(503)])
+    attempts = []
+    
+    assert asyncio.run(RetryPolicy(CONFIG, deadline_seconds=100).call_async(call, attempts=attempts)) == "ok"
+    assert len(calls) == 3
+    assert clock.sleeps == [4.0, 4.0]
+    assert [attempt["outcome"] for attempt in attempts] == ["APIConnectionError", "503", "ok"]
+
+def test_retries_stop_at_the_deadline(clock):
+    call, calls = failing_call(clock, [status_error(503)] * 10)
+    started = clock.now
+    
+    with pytest.raises(openai.APIStatusError):
+        asyncio.run(RetryPolicy(CONFIG, deadline_seconds=12).call_async(call))
+    
+    # 1s attempt + 4s backoff per retry: a third backoff would end past the deadline
+    assert len(calls) == 3
+    assert clock.now - started <= 12
+    assert all(call["timeout"] <= 12 - (call["at"] - started) for call in calls)
+
+def test_attempt_timeout_is_cut_short_by_the_deadline(clock, monkeypatch):
+    monkeypatch.setitem(retry_policy.OPENAI_CONFIG, "request_timeout_seconds", 120)
+    call, calls = failing_call(clock, [status_error(503)], attempt_seconds=20)
+    
+    asyncio.run(RetryPolicy(CONFIG, deadline_seconds=30).call_async(call))
+    
+    assert [call["timeout"] for call in calls] == [30, 6]
+
+def test_non_retryable_errors_fail_right_away(clock):
+    for error in (status_error(400), status_error(429, code="insufficient_quota")):
+        call, calls = failing_call(clock, [error])
+        with pytest.raises(openai.APIStatusError):
+            asyncio.run(RetryPolicy(CONFIG, deadline_seconds=100).call_async(call))
+        assert len(calls) == 1
+    assert clock.sleeps == []
+
+def test_retry_after_hint_lengthens_the_backoff(clock):
+    call, calls = failing_call(clock, [status_error(429, {"retry-after": "9"})])
+    
+    asyncio.run(RetryPolicy(CONFIG, deadline_seconds=100).call_async(call))
+    
+    assert clock.sleeps == [9.0]
+
+def test_retry_after_hint_above_the_cap_gives_up(clock):
+    call, calls = failing_call(clock, [status_error(429, {"retry-after-ms": "120000"})])
+    
+    with pytest.raises(openai.APIStatusError):
+        asyncio.run(RetryPolicy(CONFIG, deadline_seconds=1000).call_async(call))
+    assert len(calls) == 1
+
+def test_backoff_stays_within_bounds():
+    policy = RetryPolicy(dict(CONFIG, base_delay_seconds=1.0, max_delay_seconds=20.0))
+    delays = [policy.get_backoff(previous) for previous in (0.0, 1.0, 5.0, 50.0) for _ in range(50)]
+    
+    assert all(1.0 <= delay <= 20.0 for delay in delays)
+    assert max(policy.get_backoff(2.0) for _ in range(50)) <= 6.0
@@ -16,7 +16,15 @@ from .helpers import (
     create_share_text
 )
 from .session_manager import SessionManager
+from .generated_image import GeneratedImage
 from .reference_loader import ReferenceImageLoader
+from .reference_cache import (
+    ReferenceImage,
+    ReferenceImageStore,
+    ReferenceImageCache,
+    ReferencePayloadCache,
+    ReferenceRenditionCache
+)
 
 __all__ = [
     'generate_random_prompt',
@@ -30,5 +38,11 @@ __all__ = [
     'format_error_message',
     'create_share_text',
     'SessionManager',
-    'ReferenceImageLoader'
+    'GeneratedImage',
+    'ReferenceImageLoader',
+    'ReferenceImage',
+    'ReferenceImageStore',
+    'ReferenceImageCache',
+    'ReferencePayloadCache',
+    'ReferenceRenditionCache'
 ]
\ No newline at end of file
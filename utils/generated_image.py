@@ -0,0 +1,95 @@
+"""
+Generated Image Handle for ALF Abstractor
+Keeps generated images as the encoded bytes the image API returned
+"""
+
+import io
+from PIL import Image
+from typing import Optional, Tuple
+
+class GeneratedImage:
+    """Generated image kept exactly as the API encoded it
+    
+    Display and download use the encoded bytes as they are, so a result page
+    never re-encodes a full-size image on a rerun. The pixels are only
+    decoded when something asks for the PIL image, and then kept.
+    """
+    
+    __slots__ = ("data", "mime_type", "_size", "_image", "__weakref__")
+    
+    MIME_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+    EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp"}
+    
+    def __init__(self, data: bytes, mime_type: Optional[str] = None):
+        """
+        Create a handle from encoded image bytes
+        
+        Args:
+            data (bytes): Encoded image as returned by the API
+            mime_type (str, optional): Content type of data. Detected from data if not given.
+        """
+        self.data = data
+        self.mime_type = mime_type or self.detect_mime_type(data)
+        self._size: Optional[Tuple[int, int]] = None
+        self._image: Optional[Image.Image] = None
+    
+    @staticmethod
+    def detect_mime_type(data: bytes) -> str:
+        """
+        Tell the content type of encoded image bytes from their signature
+        
+        Args:
+            data (bytes): Encoded image
+            
+        Returns:
+            str: "image/png", "image/jpeg" or "image/webp" (PNG if unknown)
+        """
+        if data[:3] == b"\xff\xd8\xff":
+            return "image/jpeg"
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            return "image/webp"
+        return "image/png"
+    
+    @classmethod
+    def from_image(cls, image: Image.Image, format: str = "PNG") -> "GeneratedImage":
+        """
+        Encode a PIL image into a handle
+        
+        Args:
+            image (Image.Image): Decoded image
+            format (str): Image format (PNG, JPEG or WEBP)
+            
+        Returns:
+            GeneratedImage: Handle holding the encoded image (and the given image)
+        """
+        buf = io.BytesIO()
+        image.save(buf, format=format)
+        generated = cls(buf.getvalue(), cls.MIME_TYPES.get(format.upper()))
+        generated._image = image
+        return generated
+    
+    @property
+    def extension(self) -> str:
+        """File extension matching the encoded format, without the dot"""
+        return self.EXTENSIONS.get(self.mime_type, "png")
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Image size as (width, height), read from the header without decoding"""
+        if self._size is None:
+            if self._image is not None:
+                self._size = self._image.size
+            else:
+                with Image.open(io.BytesIO(self.data)) as image:
+                    self._size = image.size
+        return self._size
+    
+    @property
+    def image(self) -> Image.Image:
+        """The decoded image, decoded on first use"""
+        if self._image is None:
+            image = Image.open(io.BytesIO(self.data))
+            image.load()
+            self._image = image
+            self._size = image.size
+        return self._image
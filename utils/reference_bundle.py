@@ -0,0 +1,291 @@
+"""
+Packed Reference Bundle for ALF Abstractor
+Compiles the references folder into one memory-mappable file for fast cold starts
+
+Build it with:
+    python -m utils.reference_bundle
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from PIL import Image
+from typing import Dict, Optional
+
+from config import REFERENCE_BUNDLE_CONFIG, REFERENCE_CHARACTERS, REFERENCE_DISPLAY_CONFIG
+from utils.reference_preprocessor import ReferencePreprocessor
+
+class ReferenceBundle:
+    """Read access to a packed reference bundle
+    
+    Layout: an 8 byte magic, a little-endian uint64 header length, a JSON header
+    index and then the data section. Per image the data section holds the
+    upload-ready (preprocessed) PNG bytes, the display renditions and the raw RGBX pixels,
+    each block aligned so pixel data can be mapped straight into PIL images.
+    """
+    
+    MAGIC = b"ALFREFB1"
+    ALIGNMENT = 64
+    
+    _lock = threading.Lock()
+    _default: Optional["ReferenceBundle"] = None
+    _default_loaded = False
+    
+    def __init__(self, path: str):
+        """
+        Memory-map a bundle file and read its header index
+        
+        Args:
+            path (str): Path to the bundle file
+            
+        Raises:
+            ValueError: If the file is not a reference bundle
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._mmap[:len(self.MAGIC)] != self.MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a reference bundle: {path}")
+        
+        header_start = len(self.MAGIC) + 8
+        (header_length,) = struct.unpack("<Q", self._mmap[len(self.MAGIC):header_start])
+        self.header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+        self._data_offset = self._align(header_start + header_length)
+        self._view = memoryview(self._mmap)
+        
+        self._by_file = {(e["folder"], e["filename"]): e for e in self.header["entries"]}
+        self._by_hash = {e["content_hash"]: e for e in self.header["entries"]}
+    
+    @staticmethod
+    def _align(offset: int) -> int:
+        """Round an offset up to the bundle block alignment"""
+        return (offset + ReferenceBundle.ALIGNMENT - 1) // ReferenceBundle.ALIGNMENT * ReferenceBundle.ALIGNMENT
+    
+    @staticmethod
+    def get_default_path() -> str:
+        """
+        Get the configured bundle path
+        
+        Returns:
+            str: Absolute path of the bundle file
+        """
+        path = REFERENCE_BUNDLE_CONFIG["path"]
+        if os.path.isabs(path):
+            return path
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(project_dir, path)
+    
+    @classmethod
+    def get_default(cls) -> Optional["ReferenceBundle"]:
+        """
+        Get the process-wide bundle, opened on first use
+        
+        Returns:
+            Optional[ReferenceBundle]: The bundle, or None if it is disabled, missing or invalid
+        """
+        if cls._default_loaded:
+            return cls._default
+        
+        with cls._lock:
+            if not cls._default_loaded:
+                path = cls.get_default_path()
+                if REFERENCE_BUNDLE_CONFIG["enabled"] and os.path.isfile(path):
+                    try:
+                        cls._default = cls(path)
+                    except (OSError, ValueError):
+                        cls._default = None
+                cls._default_loaded = True
+        
+        return cls._default
+    
+    def _slice(self, block: list) -> memoryview:
+        """Get a zero-copy view of a data block given as [offset, length]"""
+        start = self._data_offset + block[0]
+        return self._view[start:start + block[1]]
+    
+    def find(self, folder: str, filename: str, size: int, mtime_ns: int) -> Optional[dict]:
+        """
+        Find the bundled entry for a reference file if it is still up to date
+        
+        Entries are only used while the bundle was built with the current
+        preprocessing settings, since its pixels are the processed images.
+        
+        Args:
+            folder (str): Character folder relative to the references folder ("" for ALF)
+            filename (str): Image filename
+            size (int): Current file size in bytes
+            mtime_ns (int): Current file modification time
+            
+        Returns:
+            Optional[dict]: Header entry, or None if the file is not bundled or changed since
+        """
+        if not self.is_preprocess_current():
+            return None
+        
+        entry = self._by_file.get((folder, filename))
+        if entry is None or entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+            return None
+        return entry
+    
+    def is_preprocess_current(self) -> bool:
+        """
+        Check whether the bundle was built with the current preprocessing settings
+        
+        Returns:
+            bool: True if its pixels and upload bytes match what preprocessing would produce now
+        """
+        return self.header.get("preprocess") == self.get_preprocess_fingerprint()
+    
+    @staticmethod
+    def get_preprocess_fingerprint() -> Optional[str]:
+        """
+        Get the preprocessing settings bundles are built with
+        
+        Returns:
+            Optional[str]: Settings fingerprint, or None if preprocessing is disabled
+        """
+        return ReferencePreprocessor.get_settings_fingerprint() if ReferencePreprocessor.is_enabled() else None
+    
+    def get_image(self, entry: dict) -> Image.Image:
+        """
+        Build an image that maps the bundled pixels without copying them
+        
+        Args:
+            entry (dict): Header entry
+            
+        Returns:
+            Image.Image: Read-only RGBX image backed by the bundle
+        """
+        image = Image.frombuffer(
+            "RGBX", (entry["width"], entry["height"]), self._slice(entry["pixels"]), "raw", "RGBX", 0, 1
+        )
+        image.info["content_hash"] = entry["content_hash"]
+        return image
+    
+    def get_upload_bytes(self, content_hash: str) -> Optional[bytes]:
+        """
+        Get the pre-encoded upload bytes of a bundled reference
+        
+        Args:
+            content_hash (str): Content hash of the reference
+            
+        Returns:
+            Optional[bytes]: PNG bytes, or None if not bundled with current preprocessing settings
+        """
+        if not self.is_preprocess_current():
+            return None
+        entry = self._by_hash.get(content_hash)
+        return bytes(self._slice(entry["upload"])) if entry else None
+    
+    def get_rendition(self, content_hash: str, size: str) -> Optional[bytes]:
+        """
+        Get a pre-encoded display rendition of a bundled reference
+        
+        Args:
+            content_hash (str): Content hash of the reference
+            size (str): Rendition name from REFERENCE_DISPLAY_CONFIG["sizes"]
+            
+        Returns:
+            Optional[bytes]: Encoded rendition, or None if not bundled with current display settings
+        """
+        if self.header["display"] != REFERENCE_DISPLAY_CONFIG:
+            return None
+        entry = self._by_hash.get(content_hash)
+        if entry is None or size not in entry["renditions"]:
+            return None
+        return bytes(self._slice(entry["renditions"][size]))
+    
+    @staticmethod
+    def build(output_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Compile every character's reference folder into a bundle file
+        
+        Args:
+            output_path (str, optional): Where to write the bundle. Defaults to the configured path.
+            
+        Returns:
+            Dict[str, int]: Number of bundled images per character
+        """
+        from utils.reference_cache import ReferencePayloadCache, ReferenceRenditionCache
+        from utils.reference_loader import ReferenceImageLoader
+        
+        if output_path is None:
+            output_path = ReferenceBundle.get_default_path()
+        
+        results = ReferenceImageLoader.load_character_folders()
+        
+        entries = []
+        blocks = []
+        offset = 0
+        
+        def add_block(data: bytes) -> list:
+            nonlocal offset
+            block = [offset, len(data)]
+            blocks.append(data)
+            padding = ReferenceBundle._align(len(data)) - len(data)
+            if padding:
+                blocks.append(b"\0" * padding)
+            offset += len(data) + padding
+            return block
+        
+        counts = {}
+        for character, result in results.items():
+            folder = REFERENCE_CHARACTERS[character]["folder"]
+            counts[character] = len(result["images"])
+            for image, filename in result["images"]:
+                file_path = os.path.join(result["folder_path"], filename)
+                stat = os.stat(file_path)
+                if ReferencePreprocessor.is_enabled():
+                    upload = ReferencePreprocessor.process_file(file_path)
+                else:
+                    upload = ReferencePayloadCache.encode_upload_bytes(image)
+                entries.append({
+                    "character": character,
+                    "folder": folder,
+                    "filename": filename,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "content_hash": ReferenceImageLoader.get_content_hash(image),
+                    "width": image.width,
+                    "height": image.height,
+                    "upload": add_block(upload),
+                    "renditions": {
+                        size: add_block(ReferenceRenditionCache.encode_rendition(image, max_side))
+                        for size, max_side in REFERENCE_DISPLAY_CONFIG["sizes"].items()
+                    },
+                    "pixels": add_block(image.convert("RGBX").tobytes())
+                })
+        
+        header = json.dumps({
+            "version": 1,
+            "built_at": time.time(),
+            "display": REFERENCE_DISPLAY_CONFIG,
+            "preprocess": ReferenceBundle.get_preprocess_fingerprint(),
+            "entries": entries
+        }).encode('utf-8')
+        
+        # Write next to the target and rename so running servers never map a partial file
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(ReferenceBundle.MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(b"\0" * (ReferenceBundle._align(f.tell()) - f.tell()))
+            for block in blocks:
+                f.write(block)
+        os.replace(temp_path, output_path)
+        
+        return counts
+
+if __name__ == "__main__":
+    bundle_path = sys.argv[1] if len(sys.argv) > 1 else None
+    bundled = ReferenceBundle.build(bundle_path)
+    for character, count in bundled.items():
+        print(f"{REFERENCE_CHARACTERS[character]['emoji']} {REFERENCE_CHARACTERS[character]['name']}: {count} images")
+    print(f"Bundle written to {bundle_path or ReferenceBundle.get_default_path()}")
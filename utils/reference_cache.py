@@ -0,0 +1,763 @@
+"""
+Shared Reference Image Cache for ALF Abstractor
+Keeps one process-wide, memory-budgeted copy of the reference images for all sessions
+"""
+
+import io
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from PIL import Image, features
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import REFERENCE_CHARACTERS, REFERENCE_LOADER_CONFIG, REFERENCE_DISPLAY_CONFIG
+from utils.reference_bundle import ReferenceBundle
+from utils.reference_loader import ReferenceImageLoader
+
+class ReferenceImage:
+    """Lightweight handle to a reference image kept compressed at rest
+    
+    Sessions and the folder index hold these handles instead of decoded images.
+    The pixels are decoded on demand through ReferenceImageStore, which keeps
+    only the most recently used decoded images within a byte budget.
+    """
+    
+    __slots__ = ("content_hash", "filename", "width", "height", "upload_ready", "_data", "_mapped", "__weakref__")
+    
+    def __init__(self, content_hash: str, filename: str, width: int, height: int,
+                 data: Optional[bytes] = None, mapped: Optional[Tuple[ReferenceBundle, dict]] = None,
+                 upload_ready: bool = False):
+        """
+        Create a handle from encoded file contents or a bundle entry
+        
+        Args:
+            content_hash (str): SHA-256 hex digest of the encoded file
+            filename (str): Reference filename
+            width (int): Image width in pixels
+            height (int): Image height in pixels
+            data (bytes, optional): Encoded file contents
+            mapped (Tuple[ReferenceBundle, dict], optional): Bundle and header entry holding the pixels
+            upload_ready (bool): data is the preprocessed PNG and can be uploaded as is
+        """
+        self.content_hash = content_hash
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.upload_ready = upload_ready
+        self._data = data
+        self._mapped = mapped
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Image size as (width, height)"""
+        return (self.width, self.height)
+    
+    @property
+    def is_mapped(self) -> bool:
+        """Whether the pixels live in the memory-mapped bundle rather than on the heap"""
+        return self._mapped is not None
+    
+    @property
+    def compressed_size(self) -> int:
+        """Bytes held at rest by this handle"""
+        return len(self._data) if self._data is not None else 0
+    
+    @property
+    def decoded_size(self) -> int:
+        """Bytes the decoded RGB image takes on the heap"""
+        return self.width * self.height * 3
+    
+    @property
+    def data(self) -> Optional[bytes]:
+        """Encoded image held at rest, None for bundle-backed images"""
+        return self._data
+    
+    @property
+    def image(self) -> Image.Image:
+        """The decoded image, served from ReferenceImageStore"""
+        return ReferenceImageStore.get_image(self)
+    
+    def decode(self) -> Image.Image:
+        """
+        Decode the image, bypassing the store
+        
+        Returns:
+            Image.Image: Decoded image
+        """
+        if self._mapped is not None:
+            bundle, entry = self._mapped
+            return bundle.get_image(entry)
+        return ReferenceImageLoader.decode_image_bytes(self._data, self.content_hash)
+
+class ReferenceImageStore:
+    """Process-wide LRU of decoded reference images bounded by a byte budget
+    
+    Decoded images are keyed by content hash and the least recently used ones
+    are dropped once REFERENCE_LOADER_CONFIG["decoded_budget_bytes"] is
+    exceeded; their handles still hold the compressed bytes and decode again
+    on the next access. Bundle-backed images are mapped, not decoded, so they
+    never enter the LRU.
+    
+    Handles are interned by content hash as well: identical files in several
+    folders share one handle, one set of compressed bytes and one decoded image.
+    """
+    
+    _lock = threading.Lock()
+    _handles: "weakref.WeakValueDictionary[str, ReferenceImage]" = weakref.WeakValueDictionary()
+    _decoded: "OrderedDict[str, Image.Image]" = OrderedDict()
+    _decoded_bytes = 0
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+    
+    @classmethod
+    def _insert(cls, content_hash: str, image: Image.Image, size: int):
+        """Add a decoded image and evict down to the budget; callers hold the lock"""
+        if content_hash in cls._decoded:
+            cls._decoded.move_to_end(content_hash)
+            return
+        
+        cls._decoded[content_hash] = image
+        cls._decoded_bytes += size
+        budget = REFERENCE_LOADER_CONFIG["decoded_budget_bytes"]
+        while cls._decoded_bytes > budget and len(cls._decoded) > 1:
+            _, evicted = cls._decoded.popitem(last=False)
+            cls._decoded_bytes -= evicted.width * evicted.height * len(evicted.getbands())
+            cls._evictions += 1
+    
+    @classmethod
+    def intern(cls, reference: ReferenceImage) -> ReferenceImage:
+        """
+        Get the shared handle for a reference's content, registering it if new
+        
+        Args:
+            reference (ReferenceImage): Freshly created handle
+        
+        Returns:
+            ReferenceImage: The handle every holder of this content hash uses
+        """
+        with cls._lock:
+            existing = cls._handles.get(reference.content_hash)
+            if existing is not None:
+                return existing
+            cls._handles[reference.content_hash] = reference
+            return reference
+    
+    @classmethod
+    def lookup(cls, content_hash: str) -> Optional[ReferenceImage]:
+        """
+        Get the shared handle for a content hash
+        
+        Args:
+            content_hash (str): Content hash of the reference
+        
+        Returns:
+            Optional[ReferenceImage]: The handle, or None if no one holds it anymore
+        """
+        with cls._lock:
+            return cls._handles.get(content_hash)
+    
+    @classmethod
+    def get_interned_hashes(cls) -> set:
+        """
+        Get the content hashes that currently have a shared handle
+        
+        Returns:
+            set: Content hashes
+        """
+        with cls._lock:
+            return set(cls._handles.keys())
+    
+    @classmethod
+    def put(cls, reference: ReferenceImage, image: Image.Image):
+        """
+        Seed the store with an image that was just decoded while loading
+        
+        Args:
+            reference (ReferenceImage): Handle of the image
+            image (Image.Image): Its decoded image
+        """
+        if reference.is_mapped:
+            return
+        with cls._lock:
+            cls._insert(reference.content_hash, image, image.width * image.height * len(image.getbands()))
+    
+    @classmethod
+    def get_image(cls, reference) -> Image.Image:
+        """
+        Get the decoded image of a reference, decoding it if it was evicted
+        
+        Args:
+            reference: ReferenceImage handle, or an already decoded Image.Image
+        
+        Returns:
+            Image.Image: Decoded image
+        """
+        if isinstance(reference, Image.Image):
+            return reference
+        if reference.is_mapped:
+            return reference.decode()
+        
+        with cls._lock:
+            image = cls._decoded.get(reference.content_hash)
+            if image is not None:
+                cls._decoded.move_to_end(reference.content_hash)
+                cls._hits += 1
+                return image
+            cls._misses += 1
+        
+        # Decode outside the lock so other sessions are not held up
+        image = reference.decode()
+        with cls._lock:
+            cls._insert(reference.content_hash, image, image.width * image.height * len(image.getbands()))
+        return image
+    
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Get the store counters
+        
+        Returns:
+            dict: "hits", "misses", "evictions", "entries", "handles", "decoded_bytes" and "budget_bytes"
+        """
+        with cls._lock:
+            return {
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "evictions": cls._evictions,
+                "entries": len(cls._decoded),
+                "handles": len(cls._handles),
+                "decoded_bytes": cls._decoded_bytes,
+                "budget_bytes": REFERENCE_LOADER_CONFIG["decoded_budget_bytes"]
+            }
+    
+    @classmethod
+    def clear(cls):
+        """Drop all decoded images; handles decode again on next access"""
+        with cls._lock:
+            cls._decoded.clear()
+            cls._decoded_bytes = 0
+
+class ReferenceImageCache:
+    """Process-wide, thread-safe incremental index of reference images
+    
+    Each character folder is indexed per file by name, size, modification time
+    and content hash. Rescans only decode files that were added or changed and
+    drop deleted ones, and folders are rescanned automatically once their poll
+    interval has elapsed, so new reference art is picked up without a restart.
+    Every session receives the same ReferenceImage handles instead of its own
+    decoded copies.
+    """
+    
+    _lock = threading.Lock()
+    _folder_locks: Dict[str, threading.Lock] = {}
+    _indexes: Dict[str, dict] = {}
+    
+    @staticmethod
+    def scan_folder(folder_path: str) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Stat the image files of a folder without reading them
+        
+        Args:
+            folder_path (str): Folder to inspect
+        
+        Returns:
+            Optional[Dict[str, Tuple[int, int]]]: (size, mtime_ns) per filename in
+            directory order, or None if the folder is missing or unreadable
+        """
+        if not os.path.isdir(folder_path):
+            return None
+        
+        try:
+            filenames = ReferenceImageLoader.list_image_files(folder_path)
+        except OSError:
+            return None
+        
+        files = {}
+        for filename in filenames:
+            try:
+                stat = os.stat(os.path.join(folder_path, filename))
+            except OSError:
+                continue
+            files[filename] = (stat.st_size, stat.st_mtime_ns)
+        
+        return files
+    
+    @classmethod
+    def _get_folder_lock(cls, folder_path: str) -> threading.Lock:
+        """Get the lock that serializes rescans of a single folder"""
+        with cls._lock:
+            if folder_path not in cls._folder_locks:
+                cls._folder_locks[folder_path] = threading.Lock()
+            return cls._folder_locks[folder_path]
+    
+    @classmethod
+    def _is_due(cls, folder_path: str, now: float) -> bool:
+        """Check whether a folder was never indexed or its poll interval elapsed"""
+        index = cls._indexes.get(folder_path)
+        if index is None:
+            return True
+        return now - index["scanned_at"] >= REFERENCE_LOADER_CONFIG["poll_interval_seconds"]
+    
+    @classmethod
+    def _rescan_folders(cls, folder_paths: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Bring the index of several folders up to date; callers hold their folder locks
+        
+        Args:
+            folder_paths (Dict[str, str]): Folder path per character key
+        
+        Returns:
+            Dict[str, dict]: ReferenceImageLoader-style load results for the
+            characters whose folder was indexed for the first time or changed
+        """
+        scans = {character: cls.scan_folder(path) for character, path in folder_paths.items()}
+        old_indexes = {folder_path: cls._indexes.get(folder_path, {}) for folder_path in folder_paths.values()}
+        
+        # Only files whose size or mtime moved are read, and only those whose
+        # content hash differs from the indexed version are decoded again
+        to_load = {}
+        bundled = {}
+        bundle = ReferenceBundle.get_default()
+        for character, folder_path in folder_paths.items():
+            old_index = cls._indexes.get(folder_path, {})
+            old_files = old_index.get("files", {})
+            old_failed = old_index.get("failed", {})
+            for filename, stat in (scans[character] or {}).items():
+                old = old_files.get(filename)
+                if old is not None and (old["size"], old["mtime_ns"]) == stat:
+                    continue
+                if old_failed.get(filename) == stat:
+                    continue  # Still the same broken file, do not retry on every poll
+                
+                file_path = os.path.join(folder_path, filename)
+                entry = bundle.find(REFERENCE_CHARACTERS[character]["folder"], filename, *stat) if bundle and old is None else None
+                if entry is not None:
+                    # Up-to-date bundled file: map its pixels instead of decoding it
+                    bundled[file_path] = {
+                        "content_hash": entry["content_hash"],
+                        "unchanged": False,
+                        "reference": ReferenceImageStore.intern(ReferenceImage(
+                            entry["content_hash"], filename, entry["width"], entry["height"], mapped=(bundle, entry)
+                        )),
+                        "error": None,
+                        "elapsed": 0.0
+                    }
+                else:
+                    to_load[file_path] = old["content_hash"] if old else None
+        
+        # Content already held by another folder is only hashed, not decoded
+        loaded = ReferenceImageLoader.load_files(to_load, shared_hashes=ReferenceImageStore.get_interned_hashes())
+        ReferenceRenditionCache.build_all(
+            result["image"] for result in loaded.values() if result["image"] is not None
+        )
+        
+        # Keep only the compressed bytes in the index; the decoded images go to
+        # the budgeted store and are dropped from the results
+        for file_path, result in loaded.items():
+            if result["duplicate"]:
+                result["reference"] = ReferenceImageStore.lookup(result["content_hash"])
+                if result["reference"] is None:
+                    # Its last holder went away meanwhile, so load it after all
+                    try:
+                        result.update(ReferenceImageLoader.load_file(file_path))
+                    except Exception as e:
+                        # Reported and retried like a file load_files() failed on
+                        result["error"] = str(e)
+            image = result.pop("image")
+            if image is not None:
+                result["reference"] = ReferenceImageStore.intern(ReferenceImage(
+                    result["content_hash"], os.path.basename(file_path), image.width, image.height,
+                    data=result.pop("data"), upload_ready=result["preprocessed"]
+                ))
+                ReferenceImageStore.put(result["reference"], image)
+        loaded.update(bundled)
+        
+        reports = {}
+        scanned_at = time.monotonic()
+        for character, folder_path in folder_paths.items():
+            old_index = cls._indexes.get(folder_path)
+            old_files = old_index["files"] if old_index else {}
+            scan = scans[character] or {}
+            
+            files = {}
+            failed = {}
+            errors = []
+            elapsed = 0.0
+            changed = False
+            for filename, stat in scan.items():
+                file_path = os.path.join(folder_path, filename)
+                if file_path not in loaded:
+                    if filename in old_files:
+                        files[filename] = old_files[filename]
+                    else:
+                        failed[filename] = stat
+                    continue
+                
+                result = loaded[file_path]
+                elapsed = max(elapsed, result["elapsed"])
+                if result["error"]:
+                    errors.append((filename, result["error"]))
+                    failed[filename] = stat
+                    continue
+                
+                reference = old_files[filename]["reference"] if result["unchanged"] else result["reference"]
+                changed = changed or not result["unchanged"]
+                files[filename] = {
+                    "size": stat[0],
+                    "mtime_ns": stat[1],
+                    "content_hash": result["content_hash"],
+                    "reference": reference
+                }
+            
+            changed = changed or old_index is None or set(old_files) != set(files)
+            version = old_index["version"] if old_index else 0
+            if changed or errors:
+                version += 1
+                reports[character] = {
+                    "folder_path": folder_path,
+                    "folder_exists": scans[character] is not None,
+                    "images": [(entry["reference"], filename) for filename, entry in files.items()],
+                    "errors": errors,
+                    "error": None,
+                    "elapsed": elapsed
+                }
+            
+            index = {
+                "files": files,
+                "failed": failed,
+                "images": tuple((entry["reference"], filename) for filename, entry in files.items()),
+                "version": version,
+                "scanned_at": scanned_at
+            }
+            with cls._lock:
+                cls._indexes[folder_path] = index
+        
+        # Edited or deleted files leave renditions of content nothing shows anymore
+        dropped = {entry["content_hash"] for folder_path in folder_paths.values()
+                   for entry in old_indexes[folder_path].get("files", {}).values()}
+        with cls._lock:
+            for index in cls._indexes.values():
+                dropped.difference_update(entry["content_hash"] for entry in index["files"].values())
+        ReferenceRenditionCache.discard(dropped)
+        
+        return reports
+    
+    @classmethod
+    def get_character_images(cls, characters: Iterable[str], force_rescan: bool = False,
+                             reports: Optional[Dict[str, dict]] = None) -> Dict[str, List[Tuple[ReferenceImage, str]]]:
+        """
+        Get the reference images of several characters
+        
+        Folders that were never indexed, or whose poll interval elapsed, are
+        rescanned incrementally first; all their new or changed files are
+        decoded together in one parallel pass.
+        
+        Args:
+            characters (Iterable[str]): Character keys from REFERENCE_CHARACTERS
+            force_rescan (bool): Rescan the folders even if their poll interval has not elapsed
+            reports (Dict[str, dict], optional): Receives the load result per rescanned character
+                instead of it being shown right away
+        
+        Returns:
+            Dict[str, List[Tuple[ReferenceImage, str]]]: Shared (handle, filename) tuples per character
+        """
+        folder_paths = {c: ReferenceImageLoader.get_character_folder_path(c) for c in characters}
+        
+        now = time.monotonic()
+        due = [c for c, path in folder_paths.items() if force_rescan or cls._is_due(path, now)]
+        
+        if due:
+            # Only one session rescans a folder, the others wait and reuse its result.
+            # Locks are taken in path order so overlapping requests cannot deadlock.
+            with ExitStack() as stack:
+                for folder_path in sorted({folder_paths[c] for c in due}):
+                    stack.enter_context(cls._get_folder_lock(folder_path))
+                
+                if not force_rescan:
+                    now = time.monotonic()
+                    due = [c for c in due if cls._is_due(folder_paths[c], now)]
+                
+                results = cls._rescan_folders({c: folder_paths[c] for c in due}) if due else {}
+            
+            if reports is not None:
+                reports.update(results)
+            else:
+                for character, result in results.items():
+                    ReferenceImageLoader.report_load_result(character, result)
+        
+        return {c: list(cls._indexes[path]["images"]) for c, path in folder_paths.items()}
+    
+    @classmethod
+    def is_indexed(cls, character: str) -> bool:
+        """
+        Check whether a character's folder has been indexed by this process
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+        
+        Returns:
+            bool: True if the folder was scanned at least once
+        """
+        return ReferenceImageLoader.get_character_folder_path(character) in cls._indexes
+    
+    @classmethod
+    def get_folder_version(cls, character: str) -> int:
+        """
+        Get the version of a character's folder index, bumped on every change
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+        
+        Returns:
+            int: Index version, 0 if the folder was never indexed
+        """
+        index = cls._indexes.get(ReferenceImageLoader.get_character_folder_path(character))
+        return index["version"] if index else 0
+    
+    @classmethod
+    def invalidate(cls, folder_path: str = None):
+        """
+        Drop indexed images so they are read again on next access
+        
+        Args:
+            folder_path (str, optional): Folder to drop. Defaults to all folders.
+        """
+        with cls._lock:
+            if folder_path is None:
+                cls._indexes.clear()
+            else:
+                cls._indexes.pop(folder_path, None)
+
+class ReferencePayloadCache:
+    """Process-wide cache of PNG-encoded reference images ready for upload
+    
+    Entries are keyed by content hash, so every reference is encoded once and
+    each generation only hands the API client the already encoded bytes.
+    """
+    
+    _lock = threading.Lock()
+    _payloads: "OrderedDict[str, bytes]" = OrderedDict()
+    
+    @staticmethod
+    def encode_upload_bytes(image: Image.Image) -> bytes:
+        """
+        Encode a reference image as the PNG uploaded to the edit endpoint
+        
+        Args:
+            image (Image.Image): Reference image
+            
+        Returns:
+            bytes: PNG-encoded image
+        """
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGB")
+        
+        buf = io.BytesIO()
+        image.save(buf, format='PNG')
+        return buf.getvalue()
+    
+    @classmethod
+    def get_upload_bytes(cls, image) -> bytes:
+        """
+        Get the PNG bytes uploaded for a reference image
+        
+        Args:
+            image: Reference image or ReferenceImage handle
+        
+        Returns:
+            bytes: PNG-encoded image
+        """
+        content_hash = ReferenceImageLoader.get_content_hash(image)
+        
+        with cls._lock:
+            payload = cls._payloads.get(content_hash)
+            if payload is not None:
+                cls._payloads.move_to_end(content_hash)
+                return payload
+        
+        # Take the bundled or preprocessed bytes if there are any, otherwise
+        # encode outside the lock so other references are not held up
+        bundle = ReferenceBundle.get_default()
+        payload = bundle.get_upload_bytes(content_hash) if bundle else None
+        if payload is None and getattr(image, "upload_ready", False):
+            payload = image.data
+        if payload is None:
+            payload = cls.encode_upload_bytes(ReferenceImageStore.get_image(image))
+        
+        with cls._lock:
+            cls._payloads[content_hash] = payload
+            cls._payloads.move_to_end(content_hash)
+            while len(cls._payloads) > REFERENCE_LOADER_CONFIG["max_cached_payloads"]:
+                cls._payloads.popitem(last=False)
+        
+        return payload
+    
+    @classmethod
+    def get_upload_files(cls, images: Iterable) -> List[Tuple[str, bytes, str]]:
+        """
+        Get upload-ready (filename, bytes, content type) tuples for the edit endpoint
+        
+        Args:
+            images (Iterable): Reference images or ReferenceImage handles
+        
+        Returns:
+            List[Tuple[str, bytes, str]]: Files accepted by the OpenAI client
+        """
+        return [
+            (f"reference_{i}.png", cls.get_upload_bytes(image), "image/png")
+            for i, image in enumerate(images)
+        ]
+    
+    @classmethod
+    def clear(cls):
+        """Drop all cached payloads"""
+        with cls._lock:
+            cls._payloads.clear()
+
+class ReferenceRenditionCache:
+    """Process-wide cache of small encoded renditions of reference images for display
+    
+    Prompt and generation pages show references as column thumbnails, so they get
+    a few hundred KB of WebP/JPEG per rerun instead of the full-size screenshots.
+    At most REFERENCE_LOADER_CONFIG["max_cached_renditions"] are kept, and the
+    renditions of content no reference folder holds anymore are dropped.
+    """
+    
+    _lock = threading.Lock()
+    _renditions: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+    
+    @staticmethod
+    def get_format() -> str:
+        """
+        Get the image format renditions are encoded with
+        
+        Returns:
+            str: Pillow format name
+        """
+        configured = REFERENCE_DISPLAY_CONFIG["format"].upper()
+        if configured == "WEBP" and not features.check("webp"):
+            return "JPEG"
+        return configured
+    
+    @staticmethod
+    def encode_rendition(image: Image.Image, max_side: int) -> bytes:
+        """
+        Encode a downscaled copy of an image
+        
+        Args:
+            image (Image.Image): Source image
+            max_side (int): Longest side of the rendition in pixels
+        
+        Returns:
+            bytes: Encoded rendition
+        """
+        rendition = image.copy()
+        rendition.thumbnail((max_side, max_side), Image.LANCZOS)
+        if rendition.mode not in ("RGB", "L"):
+            rendition = rendition.convert("RGB")
+        
+        buf = io.BytesIO()
+        rendition.save(buf, format=ReferenceRenditionCache.get_format(), quality=REFERENCE_DISPLAY_CONFIG["quality"])
+        return buf.getvalue()
+    
+    @classmethod
+    def _get(cls, key: Tuple[str, str]) -> Optional[bytes]:
+        """Look up a cached rendition and mark it as recently used"""
+        with cls._lock:
+            rendition = cls._renditions.get(key)
+            if rendition is not None:
+                cls._renditions.move_to_end(key)
+            return rendition
+    
+    @classmethod
+    def _put(cls, key: Tuple[str, str], rendition: bytes):
+        """Cache a rendition, dropping the least recently used ones above the limit"""
+        with cls._lock:
+            cls._renditions[key] = rendition
+            cls._renditions.move_to_end(key)
+            while len(cls._renditions) > REFERENCE_LOADER_CONFIG["max_cached_renditions"]:
+                cls._renditions.popitem(last=False)
+    
+    @classmethod
+    def build(cls, image) -> Dict[str, bytes]:
+        """
+        Build every configured rendition of a reference image that is not cached yet
+        
+        Args:
+            image: Reference image or ReferenceImage handle
+        
+        Returns:
+            Dict[str, bytes]: Encoded rendition per name in REFERENCE_DISPLAY_CONFIG["sizes"]
+        """
+        content_hash = ReferenceImageLoader.get_content_hash(image)
+        bundle = ReferenceBundle.get_default()
+        renditions = {}
+        for size_name, max_side in REFERENCE_DISPLAY_CONFIG["sizes"].items():
+            key = (content_hash, size_name)
+            rendition = cls._get(key)
+            if rendition is None:
+                rendition = bundle.get_rendition(content_hash, size_name) if bundle else None
+                if rendition is None:
+                    rendition = cls.encode_rendition(ReferenceImageStore.get_image(image), max_side)
+                cls._put(key, rendition)
+            renditions[size_name] = rendition
+        return renditions
+    
+    @classmethod
+    def build_all(cls, images: Iterable[Image.Image]):
+        """
+        Build the renditions of several reference images on a bounded thread pool
+        
+        Args:
+            images (Iterable[Image.Image]): Reference images
+        """
+        images = list(images)
+        if not images:
+            return
+        
+        max_workers = min(REFERENCE_LOADER_CONFIG["max_workers"], len(images))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(cls.build, images))
+    
+    @classmethod
+    def get_display_bytes(cls, image, size: str = "small") -> bytes:
+        """
+        Get the encoded display rendition of a reference image
+        
+        Args:
+            image: Reference image or ReferenceImage handle
+            size (str): Rendition name from REFERENCE_DISPLAY_CONFIG["sizes"]
+        
+        Returns:
+            bytes: Encoded rendition, suitable for st.image()
+        """
+        rendition = cls._get((ReferenceImageLoader.get_content_hash(image), size))
+        if rendition is None:
+            rendition = cls.build(image)[size]
+        return rendition
+    
+    @classmethod
+    def discard(cls, content_hashes: Iterable[str]):
+        """
+        Drop the renditions of references that are gone
+        
+        Args:
+            content_hashes (Iterable[str]): Content hashes no longer indexed
+        """
+        content_hashes = set(content_hashes)
+        if not content_hashes:
+            return
+        with cls._lock:
+            for key in [key for key in cls._renditions if key[0] in content_hashes]:
+                del cls._renditions[key]
+    
+    @classmethod
+    def clear(cls):
+        """Drop all cached renditions"""
+        with cls._lock:
+            cls._renditions.clear()
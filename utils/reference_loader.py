@@ -1,13 +1,20 @@
 """
 Reference Image Loader for ALF Abstractor
-Handles loading ALF reference images from the references folder
+Handles loading ALF and friends reference images from the references folder
 """
 
+import hashlib
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
-from typing import List, Tuple
+from typing import Container, Dict, Iterable, List, Optional, Tuple
 import streamlit as st
 
+from config import REFERENCE_CHARACTERS, REFERENCE_LOADER_CONFIG
+from utils.reference_preprocessor import ReferencePreprocessor
+
 class ReferenceImageLoader:
     """Loads and manages reference images from the references folder"""
     
@@ -26,1099 +33,361 @@ class ReferenceImageLoader:
         return os.path.join(current_dir, 'references')
     
     @staticmethod
-    def get_polly_references_folder_path() -> str:
+    def get_character_folder_path(character: str) -> str:
         """
-        Get the path to the Polly references folder
+        Get the path to a character's references folder
         
-        Returns:
-            str: Path to the Polly references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'polly')
-    
-    @staticmethod
-    def get_abster_references_folder_path() -> str:
-        """
-        Get the path to the Abster references folder
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS (e.g. "alf", "polly")
         
         Returns:
-            str: Path to the Abster references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'abster')
-    
-    @staticmethod
-    def get_gooner_references_folder_path() -> str:
-        """
-        Get the path to the GOONER references folder
-        
-        Returns:
-            str: Path to the GOONER references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'gooner')
-    
-    @staticmethod
-    def get_retsba_references_folder_path() -> str:
-        """
-        Get the path to the Retsba references folder
-        
-        Returns:
-            str: Path to the Retsba references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'retsba')
-    
-    @staticmethod
-    def get_beary_references_folder_path() -> str:
+            str: Path to the character's references folder
         """
-        Get the path to the Beary references folder
-        
-        Returns:
-            str: Path to the Beary references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'beary')
-    
-    @staticmethod
-    def get_god_references_folder_path() -> str:
-        """
-        Get the path to the GOD references folder
-        
-        Returns:
-            str: Path to the GOD references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'god')
-    
-    @staticmethod
-    def get_pepe_references_folder_path() -> str:
-        """
-        Get the path to the Pepe references folder
-        
-        Returns:
-            str: Path to the Pepe references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'pepe')
+        folder = REFERENCE_CHARACTERS[character]["folder"]
+        references_path = ReferenceImageLoader.get_references_folder_path()
+        return os.path.join(references_path, folder) if folder else references_path
     
     @staticmethod
-    def get_landwolf_references_folder_path() -> str:
+    def get_character_folder_display(character: str) -> str:
         """
-        Get the path to the Landwolf references folder
+        Get the folder of a character as shown to users (e.g. 'references/polly')
         
-        Returns:
-            str: Path to the Landwolf references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'landwolf')
-    
-    @staticmethod
-    def get_andy_references_folder_path() -> str:
-        """
-        Get the path to the Andy references folder
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
         
         Returns:
-            str: Path to the Andy references folder
+            str: Relative folder name
         """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'andy')
+        folder = REFERENCE_CHARACTERS[character]["folder"]
+        return f"references/{folder}" if folder else "references"
     
     @staticmethod
-    def get_brett_references_folder_path() -> str:
+    def list_image_files(folder_path: str) -> List[str]:
         """
-        Get the path to the Brett references folder
+        List the supported image files in a folder
         
-        Returns:
-            str: Path to the Brett references folder
-        """
-        # Get the directory where the current script is located
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        return os.path.join(current_dir, 'references', 'brett')
-    
-    @staticmethod
-    def load_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all reference images from the references folder
+        Args:
+            folder_path (str): Folder to list
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            List[str]: Image filenames in directory order
         """
-        references_path = ReferenceImageLoader.get_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(references_path):
-            st.warning(f"References folder not found at: {references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the references folder
-            files = os.listdir(references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} ALF reference images")
-            else:
-                st.info("ℹ️ No reference images found. Add ALF images to the 'references' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing references folder: {str(e)}")
-        
-        return loaded_images
+        return [
+            f for f in os.listdir(folder_path)
+            if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
+        ]
     
     @staticmethod
-    def load_polly_reference_images() -> List[Tuple[Image.Image, str]]:
+    def decode_image_bytes(data: bytes, content_hash: Optional[str] = None) -> Image.Image:
         """
-        Load all Polly reference images from the references/polly folder
+        Fully decode an encoded reference image as RGB
         
-        Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
-        """
-        polly_references_path = ReferenceImageLoader.get_polly_references_folder_path()
-        loaded_images = []
+        The SHA-256 of the encoded bytes is stored in image.info["content_hash"]
+        so caches can key derived data on it.
         
-        if not os.path.exists(polly_references_path):
-            st.info(f"Polly references folder not found at: {polly_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the polly references folder
-            files = os.listdir(polly_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(polly_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Polly reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Polly reference images")
-            else:
-                st.info("ℹ️ No Polly reference images found. Add Polly images to the 'references/polly' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Polly references folder: {str(e)}")
-        
-        return loaded_images
-    
-    @staticmethod
-    def load_abster_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all Abster reference images from the references/abster folder
+        Args:
+            data (bytes): Encoded image file contents
+            content_hash (str, optional): Precomputed SHA-256 hex digest of data
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            Image.Image: Decoded RGB image
         """
-        abster_references_path = ReferenceImageLoader.get_abster_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(abster_references_path):
-            st.info(f"Abster references folder not found at: {abster_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the abster references folder
-            files = os.listdir(abster_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(abster_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Abster reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Abster reference images")
+        with Image.open(io.BytesIO(data)) as image:
+            # Convert to RGB if necessary; load() forces the decode inside this worker
+            if image.mode != 'RGB':
+                decoded = image.convert('RGB')
             else:
-                st.info("ℹ️ No Abster reference images found. Add Abster images to the 'references/abster' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Abster references folder: {str(e)}")
+                image.load()
+                decoded = image.copy()
         
-        return loaded_images
+        decoded.info["content_hash"] = content_hash or hashlib.sha256(data).hexdigest()
+        return decoded
     
     @staticmethod
-    def load_gooner_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all GOONER reference images from the references/gooner folder
-        
-        Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+    def decode_image(file_path: str) -> Image.Image:
         """
-        gooner_references_path = ReferenceImageLoader.get_gooner_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(gooner_references_path):
-            st.info(f"GOONER references folder not found at: {gooner_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the gooner references folder
-            files = os.listdir(gooner_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(gooner_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load GOONER reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} GOONER reference images")
-            else:
-                st.info("ℹ️ No GOONER reference images found. Add GOONER images to the 'references/gooner' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing GOONER references folder: {str(e)}")
+        Fully decode a single reference image file as RGB
         
-        return loaded_images
-    
-    @staticmethod
-    def load_retsba_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all Retsba reference images from the references/retsba folder
+        Args:
+            file_path (str): Path to the image file
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            Image.Image: Decoded RGB image
         """
-        retsba_references_path = ReferenceImageLoader.get_retsba_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(retsba_references_path):
-            st.info(f"Retsba references folder not found at: {retsba_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the retsba references folder
-            files = os.listdir(retsba_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(retsba_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Retsba reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Retsba reference images")
-            else:
-                st.info("ℹ️ No Retsba reference images found. Add Retsba images to the 'references/retsba' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Retsba references folder: {str(e)}")
-        
-        return loaded_images
+        with open(file_path, 'rb') as f:
+            return ReferenceImageLoader.decode_image_bytes(f.read())
     
     @staticmethod
-    def load_beary_reference_images() -> List[Tuple[Image.Image, str]]:
+    def load_file(file_path: str, known_hash: Optional[str] = None, shared_hashes: Container[str] = ()) -> dict:
         """
-        Load all Beary reference images from the references/beary folder
+        Read a reference image file and decode it unless its content is already known
         
-        Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
-        """
-        beary_references_path = ReferenceImageLoader.get_beary_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(beary_references_path):
-            st.info(f"Beary references folder not found at: {beary_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the beary references folder
-            files = os.listdir(beary_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(beary_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Beary reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Beary reference images")
-            else:
-                st.info("ℹ️ No Beary reference images found. Add Beary images to the 'references/beary' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Beary references folder: {str(e)}")
-        
-        return loaded_images
-    
-    @staticmethod
-    def load_god_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all GOD reference images from the references/god folder
+        Args:
+            file_path (str): Path to the image file
+            known_hash (str, optional): Content hash of the currently cached version
+            shared_hashes (Container[str]): Content hashes already held elsewhere (e.g. in
+                another character's folder) that need not be decoded again
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            dict: "content_hash" (of the original file), "unchanged" (content matches
+            known_hash), "duplicate" (content is in shared_hashes), "preprocessed"
+            (data is the upload-ready processed PNG), "data" (encoded image) and
+            "image" (decoded image), the last two None when unchanged or duplicate
         """
-        god_references_path = ReferenceImageLoader.get_god_references_folder_path()
-        loaded_images = []
+        with open(file_path, 'rb') as f:
+            data = f.read()
         
-        if not os.path.exists(god_references_path):
-            st.info(f"GOD references folder not found at: {god_references_path}")
-            return loaded_images
+        content_hash = hashlib.sha256(data).hexdigest()
+        unchanged = content_hash == known_hash
+        if unchanged or content_hash in shared_hashes:
+            return {
+                "content_hash": content_hash,
+                "unchanged": unchanged,
+                "duplicate": not unchanged,
+                "preprocessed": False,
+                "data": None,
+                "image": None
+            }
         
-        try:
-            # Get all files in the god references folder
-            files = os.listdir(god_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(god_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load GOD reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} GOD reference images")
-            else:
-                st.info("ℹ️ No GOD reference images found. Add GOD images to the 'references/god' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing GOD references folder: {str(e)}")
+        preprocessed = ReferencePreprocessor.is_enabled()
+        if preprocessed:
+            data = ReferencePreprocessor.process_file(file_path, data, content_hash)
         
-        return loaded_images
+        return {
+            "content_hash": content_hash,
+            "unchanged": False,
+            "duplicate": False,
+            "preprocessed": preprocessed,
+            "data": data,
+            "image": ReferenceImageLoader.decode_image_bytes(data, content_hash)
+        }
     
     @staticmethod
-    def load_pepe_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all Pepe reference images from the references/pepe folder
-        
-        Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+    def load_files(file_paths: Dict[str, Optional[str]], max_workers: Optional[int] = None,
+                   shared_hashes: Container[str] = ()) -> Dict[str, dict]:
         """
-        pepe_references_path = ReferenceImageLoader.get_pepe_references_folder_path()
-        loaded_images = []
-        
-        if not os.path.exists(pepe_references_path):
-            st.info(f"Pepe references folder not found at: {pepe_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the pepe references folder
-            files = os.listdir(pepe_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(pepe_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Pepe reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Pepe reference images")
-            else:
-                st.info("ℹ️ No Pepe reference images found. Add Pepe images to the 'references/pepe' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Pepe references folder: {str(e)}")
+        Load several reference image files concurrently on a bounded thread pool
         
-        return loaded_images
-    
-    @staticmethod
-    def load_landwolf_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all Landwolf reference images from the references/landwolf folder
+        Args:
+            file_paths (Dict[str, Optional[str]]): File paths mapped to the content hash
+                of their cached version (None for files never loaded)
+            max_workers (int, optional): Thread pool size. Defaults to REFERENCE_LOADER_CONFIG.
+            shared_hashes (Container[str]): Content hashes that need not be decoded again
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            Dict[str, dict]: Per-file load_file() results plus "error" (None on success)
+            and "elapsed" (seconds from the start of the pass until the file was done)
         """
-        landwolf_references_path = ReferenceImageLoader.get_landwolf_references_folder_path()
-        loaded_images = []
+        if max_workers is None:
+            max_workers = REFERENCE_LOADER_CONFIG["max_workers"]
         
-        if not os.path.exists(landwolf_references_path):
-            st.info(f"Landwolf references folder not found at: {landwolf_references_path}")
-            return loaded_images
+        results = {}
+        if not file_paths:
+            return results
         
-        try:
-            # Get all files in the landwolf references folder
-            files = os.listdir(landwolf_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+            futures = {
+                executor.submit(ReferenceImageLoader.load_file, file_path, known_hash, shared_hashes): file_path
+                for file_path, known_hash in file_paths.items()
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
                 try:
-                    file_path = os.path.join(landwolf_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
+                    result = future.result()
+                    result["error"] = None
                 except Exception as e:
-                    st.warning(f"Could not load Landwolf reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Landwolf reference images")
-            else:
-                st.info("ℹ️ No Landwolf reference images found. Add Landwolf images to the 'references/landwolf' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Landwolf references folder: {str(e)}")
+                    result = {
+                        "content_hash": None,
+                        "unchanged": False,
+                        "duplicate": False,
+                        "preprocessed": False,
+                        "data": None,
+                        "image": None,
+                        "error": str(e)
+                    }
+                result["elapsed"] = time.perf_counter() - start
+                results[file_path] = result
         
-        return loaded_images
+        return results
     
     @staticmethod
-    def load_andy_reference_images() -> List[Tuple[Image.Image, str]]:
+    def get_content_hash(image: Image.Image) -> str:
         """
-        Load all Andy reference images from the references/andy folder
+        Get the content hash of a reference image
         
-        Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
-        """
-        andy_references_path = ReferenceImageLoader.get_andy_references_folder_path()
-        loaded_images = []
+        Images loaded from disk carry the hash of their file. Other images are
+        hashed from their pixels once and the result is remembered on the image.
         
-        if not os.path.exists(andy_references_path):
-            st.info(f"Andy references folder not found at: {andy_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the andy references folder
-            files = os.listdir(andy_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(andy_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Andy reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Andy reference images")
-            else:
-                st.info("ℹ️ No Andy reference images found. Add Andy images to the 'references/andy' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Andy references folder: {str(e)}")
-        
-        return loaded_images
-    
-    @staticmethod
-    def load_brett_reference_images() -> List[Tuple[Image.Image, str]]:
-        """
-        Load all Brett reference images from the references/brett folder
+        Args:
+            image (Image.Image): Reference image or ReferenceImage handle
         
         Returns:
-            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
+            str: Hex digest identifying the image content
         """
-        brett_references_path = ReferenceImageLoader.get_brett_references_folder_path()
-        loaded_images = []
+        if not isinstance(image, Image.Image):
+            return image.content_hash
         
-        if not os.path.exists(brett_references_path):
-            st.info(f"Brett references folder not found at: {brett_references_path}")
-            return loaded_images
-        
-        try:
-            # Get all files in the brett references folder
-            files = os.listdir(brett_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            for filename in image_files:
-                try:
-                    file_path = os.path.join(brett_references_path, filename)
-                    image = Image.open(file_path)
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    loaded_images.append((image, filename))
-                    
-                except Exception as e:
-                    st.warning(f"Could not load Brett reference image {filename}: {str(e)}")
-                    continue
-            
-            if loaded_images:
-                st.success(f"✅ Loaded {len(loaded_images)} Brett reference images")
-            else:
-                st.info("ℹ️ No Brett reference images found. Add Brett images to the 'references/brett' folder to use them for generation.")
-                
-        except Exception as e:
-            st.error(f"Error accessing Brett references folder: {str(e)}")
-        
-        return loaded_images
+        content_hash = image.info.get("content_hash")
+        if content_hash is None:
+            digest = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+            digest.update(image.tobytes())
+            content_hash = digest.hexdigest()
+            image.info["content_hash"] = content_hash
+        return content_hash
     
     @staticmethod
-    def get_reference_images_info() -> dict:
-        """
-        Get information about available reference images
-        
-        Returns:
-            dict: Information about reference images
+    def load_character_folders(characters: Optional[Iterable[str]] = None, max_workers: Optional[int] = None) -> Dict[str, dict]:
         """
-        references_path = ReferenceImageLoader.get_references_folder_path()
+        Load the reference folders of several characters in a single parallel pass
         
-        if not os.path.exists(references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": references_path,
-                "image_count": 0,
-                "image_files": []
-            }
+        Every image of every folder is decoded on one bounded thread pool (PIL
+        releases the GIL while decoding), so the total time is bounded by the
+        slowest images rather than the sum of all folders.
         
-        try:
-            files = os.listdir(references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_polly_reference_images_info() -> dict:
-        """
-        Get information about available Polly reference images
+        Args:
+            characters (Iterable[str], optional): Character keys to load. Defaults to all characters.
+            max_workers (int, optional): Thread pool size. Defaults to REFERENCE_LOADER_CONFIG.
         
         Returns:
-            dict: Information about Polly reference images
+            Dict[str, dict]: Per-character results with "images" ((image, filename) tuples
+            in directory order), "errors", "folder_path", "folder_exists", "error" and
+            "elapsed" (seconds until the character's last image was decoded)
         """
-        polly_references_path = ReferenceImageLoader.get_polly_references_folder_path()
+        if characters is None:
+            characters = REFERENCE_CHARACTERS.keys()
+        if max_workers is None:
+            max_workers = REFERENCE_LOADER_CONFIG["max_workers"]
         
-        if not os.path.exists(polly_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": polly_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
+        results = {}
+        pending = {}
         
-        try:
-            files = os.listdir(polly_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": polly_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
+        for character in characters:
+            folder_path = ReferenceImageLoader.get_character_folder_path(character)
+            result = {
+                "folder_path": folder_path,
+                "folder_exists": os.path.isdir(folder_path),
+                "images": [],
+                "errors": [],
+                "error": None,
+                "elapsed": 0.0
             }
+            results[character] = result
             
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": polly_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_abster_reference_images_info() -> dict:
-        """
-        Get information about available Abster reference images
-        
-        Returns:
-            dict: Information about Abster reference images
-        """
-        abster_references_path = ReferenceImageLoader.get_abster_references_folder_path()
-        
-        if not os.path.exists(abster_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": abster_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
-        
-        try:
-            files = os.listdir(abster_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
+            if not result["folder_exists"]:
+                continue
             
-            return {
-                "folder_exists": True,
-                "folder_path": abster_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": abster_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_gooner_reference_images_info() -> dict:
-        """
-        Get information about available GOONER reference images
+            try:
+                pending[character] = ReferenceImageLoader.list_image_files(folder_path)
+            except Exception as e:
+                result["error"] = str(e)
         
-        Returns:
-            dict: Information about GOONER reference images
-        """
-        gooner_references_path = ReferenceImageLoader.get_gooner_references_folder_path()
+        # Decode every file of every folder in the same pass
+        loaded = ReferenceImageLoader.load_files(
+            {
+                os.path.join(results[character]["folder_path"], filename): None
+                for character, filenames in pending.items()
+                for filename in filenames
+            },
+            max_workers
+        )
         
-        if not os.path.exists(gooner_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": gooner_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
+        for character, filenames in pending.items():
+            result = results[character]
+            for filename in filenames:
+                file_result = loaded[os.path.join(result["folder_path"], filename)]
+                if file_result["error"]:
+                    result["errors"].append((filename, file_result["error"]))
+                else:
+                    result["images"].append((file_result["image"], filename))
+                result["elapsed"] = max(result["elapsed"], file_result["elapsed"])
         
-        try:
-            files = os.listdir(gooner_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": gooner_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": gooner_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
+        return results
     
     @staticmethod
-    def get_retsba_reference_images_info() -> dict:
+    def report_load_result(character: str, result: dict):
         """
-        Get information about available Retsba reference images
+        Show the outcome of loading a character's references in the Streamlit UI
         
-        Returns:
-            dict: Information about Retsba reference images
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+            result (dict): Result entry returned by load_character_folders()
         """
-        retsba_references_path = ReferenceImageLoader.get_retsba_references_folder_path()
-        
-        if not os.path.exists(retsba_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": retsba_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
+        name = REFERENCE_CHARACTERS[character]["name"]
+        is_alf = character == "alf"
         
-        try:
-            files = os.listdir(retsba_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": retsba_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": retsba_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_beary_reference_images_info() -> dict:
-        """
-        Get information about available Beary reference images
+        if not result["folder_exists"]:
+            if is_alf:
+                st.warning(f"References folder not found at: {result['folder_path']}")
+            else:
+                st.info(f"{name} references folder not found at: {result['folder_path']}")
+            return
         
-        Returns:
-            dict: Information about Beary reference images
-        """
-        beary_references_path = ReferenceImageLoader.get_beary_references_folder_path()
+        if result["error"]:
+            folder_label = "references" if is_alf else f"{name} references"
+            st.error(f"Error accessing {folder_label} folder: {result['error']}")
+            return
         
-        if not os.path.exists(beary_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": beary_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
+        for filename, error in result["errors"]:
+            st.warning(f"Could not load reference image {filename}: {error}")
         
-        try:
-            files = os.listdir(beary_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": beary_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": beary_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
+        if result["images"]:
+            st.success(f"✅ Loaded {len(result['images'])} {name} reference images")
+        else:
+            label = "" if is_alf else f"{name} "
+            folder = ReferenceImageLoader.get_character_folder_display(character)
+            st.info(f"ℹ️ No {label}reference images found. Add {name} images to the '{folder}' folder to use them for generation.")
     
     @staticmethod
-    def get_god_reference_images_info() -> dict:
+    def load_character_reference_images(character: str) -> List[Tuple[Image.Image, str]]:
         """
-        Get information about available GOD reference images
+        Load all reference images of one character
         
-        Returns:
-            dict: Information about GOD reference images
-        """
-        god_references_path = ReferenceImageLoader.get_god_references_folder_path()
-        
-        if not os.path.exists(god_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": god_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
-        
-        try:
-            files = os.listdir(god_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": god_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": god_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_pepe_reference_images_info() -> dict:
-        """
-        Get information about available Pepe reference images
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
         
         Returns:
-            dict: Information about Pepe reference images
+            List[Tuple[Image.Image, str]]: List of (image, filename) tuples
         """
-        pepe_references_path = ReferenceImageLoader.get_pepe_references_folder_path()
-        
-        if not os.path.exists(pepe_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": pepe_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
-        
-        try:
-            files = os.listdir(pepe_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": pepe_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": pepe_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
+        result = ReferenceImageLoader.load_character_folders([character])[character]
+        ReferenceImageLoader.report_load_result(character, result)
+        return result["images"]
     
     @staticmethod
-    def get_landwolf_reference_images_info() -> dict:
+    def get_character_reference_images_info(character: str) -> dict:
         """
-        Get information about available Landwolf reference images
+        Get information about available reference images of a character
         
-        Returns:
-            dict: Information about Landwolf reference images
-        """
-        landwolf_references_path = ReferenceImageLoader.get_landwolf_references_folder_path()
-        
-        if not os.path.exists(landwolf_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": landwolf_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
-        
-        try:
-            files = os.listdir(landwolf_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": landwolf_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": landwolf_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_andy_reference_images_info() -> dict:
-        """
-        Get information about available Andy reference images
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
         
         Returns:
-            dict: Information about Andy reference images
+            dict: Information about reference images
         """
-        andy_references_path = ReferenceImageLoader.get_andy_references_folder_path()
+        folder_path = ReferenceImageLoader.get_character_folder_path(character)
         
-        if not os.path.exists(andy_references_path):
+        if not os.path.exists(folder_path):
             return {
                 "folder_exists": False,
-                "folder_path": andy_references_path,
+                "folder_path": folder_path,
                 "image_count": 0,
                 "image_files": []
             }
         
         try:
-            files = os.listdir(andy_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
+            image_files = ReferenceImageLoader.list_image_files(folder_path)
             
             return {
                 "folder_exists": True,
-                "folder_path": andy_references_path,
+                "folder_path": folder_path,
                 "image_count": len(image_files),
                 "image_files": image_files
             }
-            
-        except Exception as e:
-            return {
-                "folder_exists": True,
-                "folder_path": andy_references_path,
-                "image_count": 0,
-                "image_files": [],
-                "error": str(e)
-            }
-    
-    @staticmethod
-    def get_brett_reference_images_info() -> dict:
-        """
-        Get information about available Brett reference images
-        
-        Returns:
-            dict: Information about Brett reference images
-        """
-        brett_references_path = ReferenceImageLoader.get_brett_references_folder_path()
         
-        if not os.path.exists(brett_references_path):
-            return {
-                "folder_exists": False,
-                "folder_path": brett_references_path,
-                "image_count": 0,
-                "image_files": []
-            }
-        
-        try:
-            files = os.listdir(brett_references_path)
-            image_files = [
-                f for f in files 
-                if os.path.splitext(f.lower())[1] in ReferenceImageLoader.SUPPORTED_EXTENSIONS
-            ]
-            
-            return {
-                "folder_exists": True,
-                "folder_path": brett_references_path,
-                "image_count": len(image_files),
-                "image_files": image_files
-            }
-            
         except Exception as e:
             return {
                 "folder_exists": True,
-                "folder_path": brett_references_path,
+                "folder_path": folder_path,
                 "image_count": 0,
                 "image_files": [],
                 "error": str(e)
@@ -1133,4 +402,4 @@ class ReferenceImageLoader:
             bool: True if folder is valid and accessible
         """
         references_path = ReferenceImageLoader.get_references_folder_path()
-        return os.path.exists(references_path) and os.path.isdir(references_path)
\ No newline at end of file
+        return os.path.exists(references_path) and os.path.isdir(references_path)
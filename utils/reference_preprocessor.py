@@ -0,0 +1,290 @@
+"""
+Reference Preprocessor for ALF Abstractor
+Shrinks reference screenshots into compact, upload-ready PNGs
+
+Process every reference folder ahead of time with:
+    python -m utils.reference_preprocessor [--force]
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+from PIL import Image, ImageChops, PngImagePlugin
+from typing import Dict, Optional
+
+from config import REFERENCE_CHARACTERS, REFERENCE_PREPROCESS_CONFIG
+
+class ReferencePreprocessor:
+    """Flattens, crops, downsizes and optimizes reference images
+    
+    Processed images are written as PNG into a subfolder next to their
+    originals. Each one records the content hash of its source and the
+    settings it was made with, so it is regenerated only when either changes.
+    """
+    
+    SOURCE_HASH_KEY = "alf-source-hash"
+    SETTINGS_KEY = "alf-preprocess"
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check whether references are preprocessed before use
+        
+        Returns:
+            bool: True if preprocessing is enabled
+        """
+        return REFERENCE_PREPROCESS_CONFIG["enabled"]
+    
+    @staticmethod
+    def get_settings_fingerprint() -> str:
+        """
+        Get a stable string describing the current preprocessing settings
+        
+        Returns:
+            str: JSON encoded settings
+        """
+        return json.dumps(
+            {key: REFERENCE_PREPROCESS_CONFIG[key] for key in ("max_side", "max_short_side", "crop_threshold", "background")},
+            sort_keys=True
+        )
+    
+    @staticmethod
+    def get_processed_path(file_path: str) -> str:
+        """
+        Get where the processed version of a reference file is stored
+        
+        Args:
+            file_path (str): Path to the original image file
+            
+        Returns:
+            str: Path to the processed PNG
+        """
+        folder_path, filename = os.path.split(file_path)
+        return os.path.join(folder_path, REFERENCE_PREPROCESS_CONFIG["folder"], f"{filename}.png")
+    
+    @staticmethod
+    def crop_to_content(image: Image.Image) -> Image.Image:
+        """
+        Crop away borders that match the color of the top-left corner
+        
+        Args:
+            image (Image.Image): RGB source image
+            
+        Returns:
+            Image.Image: Cropped image, or the source if there is nothing to crop
+        """
+        background = Image.new("RGB", image.size, image.getpixel((0, 0)))
+        threshold = REFERENCE_PREPROCESS_CONFIG["crop_threshold"]
+        difference = ImageChops.difference(image, background).convert("L")
+        bbox = difference.point(lambda v: 255 if v > threshold else 0).getbbox()
+        
+        if bbox is None or bbox == (0, 0) + image.size:
+            return image
+        return image.crop(bbox)
+    
+    @staticmethod
+    def flatten_alpha(image: Image.Image) -> Image.Image:
+        """
+        Composite an image onto the configured background color
+        
+        Args:
+            image (Image.Image): Source image
+            
+        Returns:
+            Image.Image: RGB image
+        """
+        if image.mode not in ("RGBA", "LA"):
+            return image.convert("RGB")
+        
+        flattened = Image.new("RGB", image.size, tuple(REFERENCE_PREPROCESS_CONFIG["background"]))
+        flattened.paste(image.convert("RGBA"), mask=image.getchannel("A"))
+        return flattened
+    
+    @staticmethod
+    def preprocess_image(image: Image.Image) -> Image.Image:
+        """
+        Flatten, crop and downsize a reference image
+        
+        Transparent areas are flattened first, so transparent borders are
+        cropped the same way as solid ones.
+        
+        Args:
+            image (Image.Image): Source image
+            
+        Returns:
+            Image.Image: Processed RGB image
+        """
+        if image.mode == "P" or "transparency" in image.info:
+            image = image.convert("RGBA")
+        
+        image = ReferencePreprocessor.flatten_alpha(image)
+        image = ReferencePreprocessor.crop_to_content(image)
+        
+        scale = min(
+            1.0,
+            REFERENCE_PREPROCESS_CONFIG["max_side"] / max(image.size),
+            REFERENCE_PREPROCESS_CONFIG["max_short_side"] / min(image.size)
+        )
+        if scale < 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS)
+        return image
+    
+    @staticmethod
+    def to_palette_if_lossless(image: Image.Image) -> Image.Image:
+        """
+        Convert an RGB image to palette mode when it has at most 256 colors
+        
+        Args:
+            image (Image.Image): RGB image
+        
+        Returns:
+            Image.Image: Palette image with exactly the same pixels, or the source image
+        """
+        colors = image.getcolors(256)
+        if colors is None:
+            return image
+        
+        palette = Image.new("P", (1, 1))
+        palette.putpalette([channel for _, color in colors for channel in color])
+        return image.quantize(palette=palette, dither=Image.Dither.NONE)
+    
+    @staticmethod
+    def preprocess_bytes(data: bytes, content_hash: Optional[str] = None) -> bytes:
+        """
+        Preprocess an encoded reference image into an optimized PNG
+        
+        Args:
+            data (bytes): Encoded source image
+            content_hash (str, optional): Precomputed SHA-256 hex digest of data
+            
+        Returns:
+            bytes: Processed PNG (palette mode when lossless), tagged with its source hash and settings
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            processed = ReferencePreprocessor.preprocess_image(image)
+        processed = ReferencePreprocessor.to_palette_if_lossless(processed)
+        
+        pnginfo = PngImagePlugin.PngInfo()
+        pnginfo.add_text(ReferencePreprocessor.SOURCE_HASH_KEY, content_hash or hashlib.sha256(data).hexdigest())
+        pnginfo.add_text(ReferencePreprocessor.SETTINGS_KEY, ReferencePreprocessor.get_settings_fingerprint())
+        
+        buf = io.BytesIO()
+        processed.save(buf, format='PNG', optimize=True, pnginfo=pnginfo)
+        return buf.getvalue()
+    
+    @staticmethod
+    def read_processed(file_path: str, content_hash: str) -> Optional[bytes]:
+        """
+        Read the stored processed version of a reference file if it is current
+        
+        Args:
+            file_path (str): Path to the original image file
+            content_hash (str): Content hash of the original file
+            
+        Returns:
+            Optional[bytes]: Processed PNG, or None if missing or made from other content or settings
+        """
+        processed_path = ReferencePreprocessor.get_processed_path(file_path)
+        try:
+            with open(processed_path, 'rb') as f:
+                data = f.read()
+            with Image.open(io.BytesIO(data)) as image:
+                text = getattr(image, "text", {})
+        except (OSError, Image.UnidentifiedImageError):
+            return None
+        
+        if (text.get(ReferencePreprocessor.SOURCE_HASH_KEY) != content_hash or
+                text.get(ReferencePreprocessor.SETTINGS_KEY) != ReferencePreprocessor.get_settings_fingerprint()):
+            return None
+        return data
+    
+    @staticmethod
+    def process_file(file_path: str, data: Optional[bytes] = None, content_hash: Optional[str] = None,
+                     force: bool = False) -> bytes:
+        """
+        Get the processed version of a reference file, creating it if needed
+        
+        A processed file that cannot be written (e.g. read-only references
+        folder) is still returned, it is just recreated next time.
+        
+        Args:
+            file_path (str): Path to the original image file
+            data (bytes, optional): Contents of the original file if already read
+            content_hash (str, optional): Content hash of data if already computed
+            force (bool): Recreate the processed file even if it is current
+            
+        Returns:
+            bytes: Processed PNG
+        """
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        if content_hash is None:
+            content_hash = hashlib.sha256(data).hexdigest()
+        
+        if not force:
+            processed = ReferencePreprocessor.read_processed(file_path, content_hash)
+            if processed is not None:
+                return processed
+        
+        processed = ReferencePreprocessor.preprocess_bytes(data, content_hash)
+        
+        processed_path = ReferencePreprocessor.get_processed_path(file_path)
+        temp_path = f"{processed_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(processed_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(processed)
+            os.replace(temp_path, processed_path)
+        except OSError:
+            pass
+        
+        return processed
+    
+    @staticmethod
+    def process_character_folders(force: bool = False) -> Dict[str, dict]:
+        """
+        Preprocess every character's reference folder
+        
+        Args:
+            force (bool): Recreate processed files even if they are current
+            
+        Returns:
+            Dict[str, dict]: Per-character "files", "original_bytes", "processed_bytes" and "errors"
+        """
+        from utils.reference_loader import ReferenceImageLoader
+        
+        results = {}
+        for character in REFERENCE_CHARACTERS:
+            folder_path = ReferenceImageLoader.get_character_folder_path(character)
+            result = {"files": 0, "original_bytes": 0, "processed_bytes": 0, "errors": []}
+            results[character] = result
+            
+            if not os.path.isdir(folder_path):
+                continue
+            
+            for filename in ReferenceImageLoader.list_image_files(folder_path):
+                file_path = os.path.join(folder_path, filename)
+                try:
+                    processed = ReferencePreprocessor.process_file(file_path, force=force)
+                except Exception as e:
+                    result["errors"].append((filename, str(e)))
+                    continue
+                result["files"] += 1
+                result["original_bytes"] += os.path.getsize(file_path)
+                result["processed_bytes"] += len(processed)
+        
+        return results
+
+if __name__ == "__main__":
+    processed_folders = ReferencePreprocessor.process_character_folders(force="--force" in sys.argv[1:])
+    for character, summary in processed_folders.items():
+        label = f"{REFERENCE_CHARACTERS[character]['emoji']} {REFERENCE_CHARACTERS[character]['name']}"
+        print(f"{label}: {summary['files']} images, "
+              f"{summary['original_bytes'] / 1024:.0f} KB -> {summary['processed_bytes'] / 1024:.0f} KB")
+        for filename, error in summary["errors"]:
+            print(f"  Could not process {filename}: {error}")
@@ -4,10 +4,12 @@ Handles Streamlit session state management and navigation
 """
 
 import streamlit as st
-from typing import Any, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional
 from PIL import Image
 
-from config import SESSION_KEYS, PAGES
+from config import SESSION_KEYS, PAGES, REFERENCE_CHARACTERS
+from utils.generated_image import GeneratedImage
 
 class SessionManager:
     """Manages Streamlit session state for the ALF Abstractor application"""
@@ -22,6 +24,12 @@ class SessionManager:
         # Image data
         if SESSION_KEYS["GENERATED_IMAGE"] not in st.session_state:
             st.session_state[SESSION_KEYS["GENERATED_IMAGE"]] = None
+        if SESSION_KEYS["GENERATED_VARIANTS"] not in st.session_state:
+            st.session_state[SESSION_KEYS["GENERATED_VARIANTS"]] = []
+        if SESSION_KEYS["GENERATED_FROM_CACHE"] not in st.session_state:
+            st.session_state[SESSION_KEYS["GENERATED_FROM_CACHE"]] = False
+        if SESSION_KEYS["GENERATED_DRAFT"] not in st.session_state:
+            st.session_state[SESSION_KEYS["GENERATED_DRAFT"]] = None
         
         # Prompt data
         if SESSION_KEYS["CURRENT_PROMPT"] not in st.session_state:
@@ -74,6 +82,18 @@ class SessionManager:
         # Reference images for Brett
         if SESSION_KEYS["BRETT_REFERENCE_IMAGES"] not in st.session_state:
             st.session_state[SESSION_KEYS["BRETT_REFERENCE_IMAGES"]] = []
+        
+        # Reference index version per character loaded lazily into this session
+        if SESSION_KEYS["LOADED_REFERENCE_VERSIONS"] not in st.session_state:
+            st.session_state[SESSION_KEYS["LOADED_REFERENCE_VERSIONS"]] = {}
+        
+        # Reference load results kept to be shown after a rerun
+        if SESSION_KEYS["REFERENCE_LOAD_REPORTS"] not in st.session_state:
+            st.session_state[SESSION_KEYS["REFERENCE_LOAD_REPORTS"]] = {}
+        
+        # Generation jobs queued by this session (the jobs themselves live in GenerationJobQueue)
+        if SESSION_KEYS["GENERATION_JOBS"] not in st.session_state:
+            st.session_state[SESSION_KEYS["GENERATION_JOBS"]] = []
     
     @staticmethod
     def get_current_page() -> str:
@@ -99,25 +119,98 @@ class SessionManager:
             raise ValueError(f"Invalid page: {page}")
     
     @staticmethod
-    def get_generated_image() -> Optional[Image.Image]:
+    def get_generated_image() -> Optional[GeneratedImage]:
         """
         Get the currently generated image from session state
         
         Returns:
-            Optional[Image.Image]: Generated image or None
+            Optional[GeneratedImage]: Generated image or None
         """
         return st.session_state.get(SESSION_KEYS["GENERATED_IMAGE"])
     
     @staticmethod
-    def set_generated_image(image: Optional[Image.Image]):
+    def set_generated_image(image: Optional[GeneratedImage]):
         """
         Set the generated image in session state
         
         Args:
-            image (Optional[Image.Image]): Image to store
+            image (Optional[GeneratedImage]): Image to store
         """
         st.session_state[SESSION_KEYS["GENERATED_IMAGE"]] = image
     
+    @staticmethod
+    def get_generated_variants() -> List[GeneratedImage]:
+        """
+        Get all variants of the latest generation
+        
+        Returns:
+            List[GeneratedImage]: Generated variants (empty if none)
+        """
+        return st.session_state.get(SESSION_KEYS["GENERATED_VARIANTS"], [])
+    
+    @staticmethod
+    def set_generated_variants(images: List[GeneratedImage]):
+        """
+        Set the variants of the latest generation in session state
+        
+        Args:
+            images (List[GeneratedImage]): Generated variants
+        """
+        st.session_state[SESSION_KEYS["GENERATED_VARIANTS"]] = list(images)
+    
+    @staticmethod
+    def is_generated_from_cache() -> bool:
+        """
+        Check whether the latest generation was served from the result cache
+        
+        Returns:
+            bool: True if its images came from GenerationResultCache
+        """
+        return st.session_state.get(SESSION_KEYS["GENERATED_FROM_CACHE"], False)
+    
+    @staticmethod
+    def get_generated_draft():
+        """
+        Get the draft job behind the latest generation
+        
+        Returns:
+            Optional[GenerationJob]: The finished draft-tier job, or None if the
+                latest generation was not a draft (or its final was requested)
+        """
+        return st.session_state.get(SESSION_KEYS["GENERATED_DRAFT"])
+    
+    @staticmethod
+    def set_generated_draft(job):
+        """
+        Set the draft job behind the latest generation
+        
+        Args:
+            job (Optional[GenerationJob]): Finished draft-tier job, or None
+        """
+        st.session_state[SESSION_KEYS["GENERATED_DRAFT"]] = job
+    
+    @staticmethod
+    def pick_variant(index: int):
+        """
+        Make one variant of the latest generation the generated image
+        
+        The latest history entry is updated too, so the history keeps the
+        variant that was picked.
+        
+        Args:
+            index (int): Position of the variant in get_generated_variants()
+        """
+        variants = SessionManager.get_generated_variants()
+        if not 0 <= index < len(variants):
+            return
+        
+        image = variants[index]
+        SessionManager.set_generated_image(image)
+        
+        history = SessionManager.get_history()
+        if history and history[-1].get("variants") is variants:
+            history[-1]["image"] = image
+    
     @staticmethod
     def get_current_prompt() -> str:
         """
@@ -149,18 +242,20 @@ class SessionManager:
         return st.session_state.get("api_key", "")
     
     @staticmethod
-    def add_to_history(prompt: str, image: Image.Image):
+    def add_to_history(prompt: str, image: GeneratedImage, variants: Optional[List[GeneratedImage]] = None):
         """
         Add a generated image and prompt to the session history
         
         Args:
             prompt (str): The prompt used
-            image (Image.Image): The generated image
+            image (GeneratedImage): The generated image
+            variants (List[GeneratedImage], optional): All variants generated alongside image
         """
         history = st.session_state.get(SESSION_KEYS["IMAGE_HISTORY"], [])
         history.append({
             "prompt": prompt,
             "image": image,
+            "variants": variants if variants is not None else [image],
             "timestamp": st.session_state.get("generation_timestamp", 0)
         })
         
@@ -170,6 +265,67 @@ class SessionManager:
         
         st.session_state[SESSION_KEYS["IMAGE_HISTORY"]] = history
     
+    @staticmethod
+    def get_generation_job_ids() -> list:
+        """
+        Get the IDs of this session's generation jobs
+        
+        Returns:
+            list: Job IDs in submission order
+        """
+        return st.session_state.get(SESSION_KEYS["GENERATION_JOBS"], [])
+    
+    @staticmethod
+    def add_generation_job(job_id: str):
+        """
+        Remember a generation job queued by this session
+        
+        Args:
+            job_id (str): Job ID from GenerationJobQueue
+        """
+        job_ids = st.session_state.get(SESSION_KEYS["GENERATION_JOBS"], [])
+        st.session_state[SESSION_KEYS["GENERATION_JOBS"]] = job_ids + [job_id]
+    
+    @staticmethod
+    def remove_generation_jobs(job_ids: Iterable[str]):
+        """
+        Forget generation jobs that were picked up, dismissed or expired
+        
+        Args:
+            job_ids (Iterable[str]): Job IDs to forget
+        """
+        removed = set(job_ids)
+        st.session_state[SESSION_KEYS["GENERATION_JOBS"]] = [
+            job_id for job_id in SessionManager.get_generation_job_ids() if job_id not in removed
+        ]
+    
+    @staticmethod
+    def complete_generation(prompt: str, images: List[GeneratedImage], result_page: str, from_cache: bool = False,
+                            draft=None):
+        """
+        Store a finished generation and navigate to its result page
+        
+        The first variant becomes the generated image until another one is picked.
+        
+        Args:
+            prompt (str): The user prompt that was generated
+            images (List[GeneratedImage]): The generated variants
+            result_page (str): Page showing the result
+            from_cache (bool): Whether the images came from the result cache
+            draft (GenerationJob, optional): The job, if it was a draft that can be rendered final
+        """
+        SessionManager.set_generated_variants(images)
+        st.session_state[SESSION_KEYS["GENERATED_FROM_CACHE"]] = from_cache
+        SessionManager.set_generated_draft(draft)
+        variants = SessionManager.get_generated_variants()
+        SessionManager.set_generated_image(variants[0])
+        
+        # Store generation timestamp
+        st.session_state["generation_timestamp"] = time.time()
+        SessionManager.add_to_history(prompt, variants[0], variants)
+        
+        SessionManager.set_page(result_page)
+    
     @staticmethod
     def get_history() -> list:
         """
@@ -400,6 +556,173 @@ class SessionManager:
         """
         return bool(SessionManager.get_api_key().strip())
     
+    @staticmethod
+    def _store_reference_images(loaded: Dict[str, list]) -> Dict[str, int]:
+        """
+        Store shared reference images in session state together with their index version
+        
+        Args:
+            loaded (Dict[str, list]): (ReferenceImage, filename) tuples per character
+        
+        Returns:
+            Dict[str, int]: Number of images stored per character
+        """
+        from utils.reference_cache import ReferenceImageCache
+        
+        loaded_versions = st.session_state.setdefault(SESSION_KEYS["LOADED_REFERENCE_VERSIONS"], {})
+        
+        counts = {}
+        for character, loaded_images in loaded.items():
+            # Extract just the handles (not the filenames); they are shared and decode on demand
+            images = [img for img, filename in loaded_images]
+            
+            # Store in session state
+            session_key = SESSION_KEYS[REFERENCE_CHARACTERS[character]["session_key"]]
+            st.session_state[session_key] = images
+            loaded_versions[character] = ReferenceImageCache.get_folder_version(character)
+            counts[character] = len(images)
+        
+        return counts
+    
+    @staticmethod
+    def load_reference_images_from_folders(characters: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Rescan reference folders of several characters and load them into session state
+        
+        Only files added or changed since the last scan are decoded.
+        
+        Args:
+            characters (Iterable[str], optional): Character keys to load. Defaults to all characters.
+        
+        Returns:
+            Dict[str, int]: Number of images loaded per character
+        """
+        from utils.reference_cache import ReferenceImageCache
+        
+        if characters is None:
+            characters = list(REFERENCE_CHARACTERS.keys())
+        
+        loaded = ReferenceImageCache.get_character_images(characters, force_rescan=True)
+        return SessionManager._store_reference_images(loaded)
+    
+    @staticmethod
+    def load_character_reference_images_from_folder(character: str) -> int:
+        """
+        Load one character's reference images into session state
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+        
+        Returns:
+            int: Number of images loaded
+        """
+        return SessionManager.load_reference_images_from_folders([character])[character]
+    
+    @staticmethod
+    def ensure_reference_images(*characters: str, defer_reports: bool = False):
+        """
+        Make sure this session holds the current reference images of the given characters
+        
+        Images are loaded on first use and replaced whenever the shared index
+        picked up added, changed or deleted files in a character's folder.
+        
+        Args:
+            *characters (str): Character keys from REFERENCE_CHARACTERS
+            defer_reports (bool): Keep the load results for show_reference_load_reports()
+                instead of showing them now, for callers that rerun right after
+        """
+        from utils.reference_cache import ReferenceImageCache
+        
+        reports = st.session_state.setdefault(SESSION_KEYS["REFERENCE_LOAD_REPORTS"], {}) if defer_reports else None
+        
+        cold = [c for c in characters if not ReferenceImageCache.is_indexed(c)]
+        if cold:
+            names = " & ".join(REFERENCE_CHARACTERS[c]["name"] for c in cold)
+            emoji = REFERENCE_CHARACTERS[cold[-1]]["emoji"]
+            with st.spinner(f"{emoji} Loading {names} reference images..."):
+                ReferenceImageCache.get_character_images(cold, reports=reports)
+        
+        # Cheap unless a folder's poll interval elapsed
+        loaded = ReferenceImageCache.get_character_images(characters, reports=reports)
+        
+        loaded_versions = st.session_state.get(SESSION_KEYS["LOADED_REFERENCE_VERSIONS"], {})
+        stale = {
+            c: images for c, images in loaded.items()
+            if loaded_versions.get(c) != ReferenceImageCache.get_folder_version(c)
+        }
+        if stale:
+            SessionManager._store_reference_images(stale)
+    
+    @staticmethod
+    def show_reference_load_reports():
+        """Show the reference load results deferred by ensure_reference_images() once, then forget them"""
+        from utils.reference_loader import ReferenceImageLoader
+        
+        reports = st.session_state.get(SESSION_KEYS["REFERENCE_LOAD_REPORTS"])
+        if not reports:
+            return
+        st.session_state[SESSION_KEYS["REFERENCE_LOAD_REPORTS"]] = {}
+        for character, result in reports.items():
+            ReferenceImageLoader.report_load_result(character, result)
+    
+    @staticmethod
+    def get_character_reference_images(character: str) -> list:
+        """
+        Get a character's reference images, loading them on first use
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+        
+        Returns:
+            list: List of the character's reference images
+        """
+        SessionManager.ensure_reference_images(character)
+        session_key = SESSION_KEYS[REFERENCE_CHARACTERS[character]["session_key"]]
+        return st.session_state.get(session_key, [])
+    
+    @staticmethod
+    def get_combined_reference_images(*characters: str) -> list:
+        """
+        Assemble the reference images of several characters for one generation
+        
+        Images are identified by content hash, so a reference that appears in
+        more than one character's folder (or twice in one) is sent only once.
+        
+        Args:
+            *characters (str): Character keys from REFERENCE_CHARACTERS, in upload order
+        
+        Returns:
+            list: Distinct reference images of all characters
+        """
+        from utils.reference_loader import ReferenceImageLoader
+        
+        SessionManager.ensure_reference_images(*characters)
+        
+        combined = []
+        seen = set()
+        for character in characters:
+            for image in SessionManager.get_character_reference_images(character):
+                content_hash = ReferenceImageLoader.get_content_hash(image)
+                if content_hash not in seen:
+                    seen.add(content_hash)
+                    combined.append(image)
+        
+        return combined
+    
+    @staticmethod
+    def get_character_reference_images_info(character: str) -> dict:
+        """
+        Get information about a character's reference images
+        
+        Args:
+            character (str): Character key from REFERENCE_CHARACTERS
+        
+        Returns:
+            dict: Information about the character's reference images
+        """
+        from utils.reference_loader import ReferenceImageLoader
+        return ReferenceImageLoader.get_character_reference_images_info(character)
+    
     @staticmethod
     def get_reference_images() -> list:
         """
@@ -408,7 +731,7 @@ class SessionManager:
         Returns:
             list: List of reference images
         """
-        return st.session_state.get(SESSION_KEYS["REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("alf")
     
     @staticmethod
     def add_reference_image(image: Image.Image):
@@ -424,7 +747,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -445,18 +768,7 @@ class SessionManager:
     @staticmethod
     def load_reference_images_from_folder():
         """Load reference images from the references folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the references folder
-        loaded_images = ReferenceImageLoader.load_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("alf")
     
     @staticmethod
     def get_reference_images_info() -> dict:
@@ -466,8 +778,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_reference_images_info()
+        return SessionManager.get_character_reference_images_info("alf")
     
     @staticmethod
     def get_polly_reference_images() -> list:
@@ -477,7 +788,7 @@ class SessionManager:
         Returns:
             list: List of Polly reference images
         """
-        return st.session_state.get(SESSION_KEYS["POLLY_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("polly")
     
     @staticmethod
     def add_polly_reference_image(image: Image.Image):
@@ -493,7 +804,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["POLLY_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -514,18 +825,7 @@ class SessionManager:
     @staticmethod
     def load_polly_reference_images_from_folder():
         """Load Polly reference images from the references/polly folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the polly references folder
-        loaded_images = ReferenceImageLoader.load_polly_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["POLLY_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("polly")
     
     @staticmethod
     def get_polly_reference_images_info() -> dict:
@@ -535,8 +835,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Polly reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_polly_reference_images_info()
+        return SessionManager.get_character_reference_images_info("polly")
     
     @staticmethod
     def get_abster_reference_images() -> list:
@@ -546,7 +845,7 @@ class SessionManager:
         Returns:
             list: List of Abster reference images
         """
-        return st.session_state.get(SESSION_KEYS["ABSTER_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("abster")
     
     @staticmethod
     def add_abster_reference_image(image: Image.Image):
@@ -562,7 +861,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["ABSTER_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -583,18 +882,7 @@ class SessionManager:
     @staticmethod
     def load_abster_reference_images_from_folder():
         """Load Abster reference images from the references/abster folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the abster references folder
-        loaded_images = ReferenceImageLoader.load_abster_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["ABSTER_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("abster")
     
     @staticmethod
     def get_abster_reference_images_info() -> dict:
@@ -604,8 +892,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Abster reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_abster_reference_images_info()
+        return SessionManager.get_character_reference_images_info("abster")
     
     @staticmethod
     def get_gooner_reference_images() -> list:
@@ -615,7 +902,7 @@ class SessionManager:
         Returns:
             list: List of GOONER reference images
         """
-        return st.session_state.get(SESSION_KEYS["GOONER_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("gooner")
     
     @staticmethod
     def add_gooner_reference_image(image: Image.Image):
@@ -631,7 +918,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["GOONER_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -652,18 +939,7 @@ class SessionManager:
     @staticmethod
     def load_gooner_reference_images_from_folder():
         """Load GOONER reference images from the references/gooner folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the gooner references folder
-        loaded_images = ReferenceImageLoader.load_gooner_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["GOONER_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("gooner")
     
     @staticmethod
     def get_gooner_reference_images_info() -> dict:
@@ -673,8 +949,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded GOONER reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_gooner_reference_images_info()
+        return SessionManager.get_character_reference_images_info("gooner")
     
     @staticmethod
     def get_retsba_reference_images() -> list:
@@ -684,7 +959,7 @@ class SessionManager:
         Returns:
             list: List of Retsba reference images
         """
-        return st.session_state.get(SESSION_KEYS["RETSBA_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("retsba")
     
     @staticmethod
     def add_retsba_reference_image(image: Image.Image):
@@ -700,7 +975,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["RETSBA_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -721,18 +996,7 @@ class SessionManager:
     @staticmethod
     def load_retsba_reference_images_from_folder():
         """Load Retsba reference images from the references/retsba folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the retsba references folder
-        loaded_images = ReferenceImageLoader.load_retsba_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["RETSBA_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("retsba")
     
     @staticmethod
     def get_retsba_reference_images_info() -> dict:
@@ -742,8 +1006,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Retsba reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_retsba_reference_images_info()
+        return SessionManager.get_character_reference_images_info("retsba")
     
     @staticmethod
     def get_beary_reference_images() -> list:
@@ -753,7 +1016,7 @@ class SessionManager:
         Returns:
             list: List of Beary reference images
         """
-        return st.session_state.get(SESSION_KEYS["BEARY_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("beary")
     
     @staticmethod
     def add_beary_reference_image(image: Image.Image):
@@ -769,7 +1032,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["BEARY_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -790,18 +1053,7 @@ class SessionManager:
     @staticmethod
     def load_beary_reference_images_from_folder():
         """Load Beary reference images from the references/beary folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the beary references folder
-        loaded_images = ReferenceImageLoader.load_beary_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["BEARY_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("beary")
     
     @staticmethod
     def get_beary_reference_images_info() -> dict:
@@ -811,8 +1063,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Beary reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_beary_reference_images_info()
+        return SessionManager.get_character_reference_images_info("beary")
     
     @staticmethod
     def get_god_reference_images() -> list:
@@ -822,7 +1073,7 @@ class SessionManager:
         Returns:
             list: List of GOD reference images
         """
-        return st.session_state.get(SESSION_KEYS["GOD_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("god")
     
     @staticmethod
     def add_god_reference_image(image: Image.Image):
@@ -838,7 +1089,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["GOD_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -859,18 +1110,7 @@ class SessionManager:
     @staticmethod
     def load_god_reference_images_from_folder():
         """Load GOD reference images from the references/god folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the god references folder
-        loaded_images = ReferenceImageLoader.load_god_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["GOD_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("god")
     
     @staticmethod
     def get_god_reference_images_info() -> dict:
@@ -880,8 +1120,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded GOD reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_god_reference_images_info()
+        return SessionManager.get_character_reference_images_info("god")
     
     @staticmethod
     def get_pepe_reference_images() -> list:
@@ -891,7 +1130,7 @@ class SessionManager:
         Returns:
             list: List of Pepe reference images
         """
-        return st.session_state.get(SESSION_KEYS["PEPE_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("pepe")
     
     @staticmethod
     def add_pepe_reference_image(image: Image.Image):
@@ -907,7 +1146,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["PEPE_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -928,18 +1167,7 @@ class SessionManager:
     @staticmethod
     def load_pepe_reference_images_from_folder():
         """Load Pepe reference images from the references/pepe folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the pepe references folder
-        loaded_images = ReferenceImageLoader.load_pepe_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["PEPE_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("pepe")
     
     @staticmethod
     def get_pepe_reference_images_info() -> dict:
@@ -949,8 +1177,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Pepe reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_pepe_reference_images_info()
+        return SessionManager.get_character_reference_images_info("pepe")
     
     @staticmethod
     def get_landwolf_reference_images() -> list:
@@ -960,7 +1187,7 @@ class SessionManager:
         Returns:
             list: List of Landwolf reference images
         """
-        return st.session_state.get(SESSION_KEYS["LANDWOLF_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("landwolf")
     
     @staticmethod
     def add_landwolf_reference_image(image: Image.Image):
@@ -976,7 +1203,7 @@ class SessionManager:
         # Keep only last 5 reference images to prevent memory issues
         if len(ref_images) > 5:
             ref_images = ref_images[-5:]
-            
+        
         st.session_state[SESSION_KEYS["LANDWOLF_REFERENCE_IMAGES"]] = ref_images
     
     @staticmethod
@@ -997,18 +1224,7 @@ class SessionManager:
     @staticmethod
     def load_landwolf_reference_images_from_folder():
         """Load Landwolf reference images from the references/landwolf folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the landwolf references folder
-        loaded_images = ReferenceImageLoader.load_landwolf_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["LANDWOLF_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("landwolf")
     
     @staticmethod
     def get_landwolf_reference_images_info() -> dict:
@@ -1018,8 +1234,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Landwolf reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_landwolf_reference_images_info()
+        return SessionManager.get_character_reference_images_info("landwolf")
     
     @staticmethod
     def get_andy_reference_images() -> list:
@@ -1029,7 +1244,7 @@ class SessionManager:
         Returns:
             list: List of Andy reference images
         """
-        return st.session_state.get(SESSION_KEYS["ANDY_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("andy")
     
     @staticmethod
     def add_andy_reference_image(image: Image.Image):
@@ -1061,18 +1276,7 @@ class SessionManager:
     @staticmethod
     def load_andy_reference_images_from_folder():
         """Load Andy reference images from the references/andy folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the andy references folder
-        loaded_images = ReferenceImageLoader.load_andy_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["ANDY_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("andy")
     
     @staticmethod
     def get_andy_reference_images_info() -> dict:
@@ -1082,8 +1286,7 @@ class SessionManager:
         Returns:
             dict: Information about loaded Andy reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_andy_reference_images_info()
+        return SessionManager.get_character_reference_images_info("andy")
     
     @staticmethod
     def get_brett_reference_images() -> list:
@@ -1093,7 +1296,7 @@ class SessionManager:
         Returns:
             list: List of Brett reference images
         """
-        return st.session_state.get(SESSION_KEYS["BRETT_REFERENCE_IMAGES"], [])
+        return SessionManager.get_character_reference_images("brett")
     
     @staticmethod
     def add_brett_reference_image(image: Image.Image):
@@ -1125,18 +1328,7 @@ class SessionManager:
     @staticmethod
     def load_brett_reference_images_from_folder():
         """Load Brett reference images from the references/brett folder into session state"""
-        from utils.reference_loader import ReferenceImageLoader
-        
-        # Load images from the brett references folder
-        loaded_images = ReferenceImageLoader.load_brett_reference_images()
-        
-        # Extract just the images (not the filenames) for session storage
-        images = [img for img, filename in loaded_images]
-        
-        # Store in session state
-        st.session_state[SESSION_KEYS["BRETT_REFERENCE_IMAGES"]] = images
-        
-        return len(images)
+        return SessionManager.load_character_reference_images_from_folder("brett")
     
     @staticmethod
     def get_brett_reference_images_info() -> dict:
@@ -1146,5 +1338,4 @@ class SessionManager:
         Returns:
             dict: Information about loaded Brett reference images
         """
-        from utils.reference_loader import ReferenceImageLoader
-        return ReferenceImageLoader.get_brett_reference_images_info()
\ No newline at end of file
+        return SessionManager.get_character_reference_images_info("brett")
\ No newline at end of file